@@ -9,10 +9,19 @@ bl_info = {
     "category": "Object",
 }
 
+import logging
+
 # Keep a reference to the addon name so other modules can access
 # preferences without guessing the package string.
 ADDON_NAME = __name__
 
+# Every module logs through a child of this logger (logging.getLogger(__name__)),
+# so one level setting controls the whole addon.
+log = logging.getLogger(ADDON_NAME)
+log.setLevel(logging.WARNING)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(name)s: %(levelname)s: %(message)s"))
+
 try:
     import bpy
 except Exception:  # pragma: no cover - allow running tests without bpy
@@ -20,13 +29,17 @@ except Exception:  # pragma: no cover - allow running tests without bpy
 
 if bpy and __package__:
     import importlib
-    from . import tree, sockets, nodes, operators, ui, menu
-    modules = [tree, sockets, nodes, operators, ui, menu]
+    from . import uuid_manager, cow_engine, scheduler, tree, sockets, nodes, operators, ui, menu
+    modules = [uuid_manager, cow_engine, scheduler, tree, sockets, nodes, operators, ui, menu]
     addon_keymaps = []
 else:  # Running outside Blender or without a package context
     modules = []
 
 
+def _update_log_level(self, context):
+    log.setLevel(getattr(logging, self.log_level, logging.WARNING))
+
+
 if bpy and getattr(getattr(bpy, 'types', None), 'AddonPreferences', None):
     class FileNodesPreferences(bpy.types.AddonPreferences):
         bl_idname = ADDON_NAME
@@ -37,12 +50,60 @@ if bpy and getattr(getattr(bpy, 'types', None), 'AddonPreferences', None):
             default=False,
         )
 
+        auto_evaluate_delay: bpy.props.FloatProperty(
+            name="Auto Evaluate Delay",
+            description="Seconds without further changes before an automatic evaluation runs; "
+                        "0 evaluates on every change",
+            default=0.25,
+            min=0.0,
+            soft_max=2.0,
+            subtype='TIME_ABSOLUTE',
+            unit='TIME_ABSOLUTE',
+        )
+
+        incremental_evaluate: bpy.props.BoolProperty(
+            name="Incremental Evaluation",
+            description="Only re-run nodes whose inputs or settings changed since the last evaluation",
+            default=False,
+        )
+
+        profile_evaluation: bpy.props.BoolProperty(
+            name="Profile Evaluation",
+            description="Record per-node timings and copy-on-write copies during evaluation",
+            default=False,
+        )
+
+        log_level: bpy.props.EnumProperty(
+            name="Log Level",
+            description="Minimum severity of messages printed to the console",
+            items=[
+                ('DEBUG', "Debug", "Trace every node, socket and datablock operation"),
+                ('INFO', "Info", "Report evaluation summaries"),
+                ('WARNING', "Warning", "Only report problems"),
+                ('ERROR', "Error", "Only report failures"),
+            ],
+            default='WARNING',
+            update=_update_log_level,
+        )
+
         def draw(self, context):
             layout = self.layout
             layout.prop(self, "auto_evaluate")
+            row = layout.row()
+            row.active = self.auto_evaluate
+            row.prop(self, "auto_evaluate_delay")
+            layout.prop(self, "incremental_evaluate")
+            layout.prop(self, "profile_evaluation")
+            layout.prop(self, "log_level")
 
     def register():
         bpy.utils.register_class(FileNodesPreferences)
+        if _log_handler not in log.handlers:
+            log.addHandler(_log_handler)
+        addons = getattr(getattr(bpy.context, "preferences", None), "addons", None)
+        addon = addons.get(ADDON_NAME) if addons else None
+        if addon:
+            _update_log_level(addon.preferences, bpy.context)
         for m in modules:
             importlib.reload(m)
             if hasattr(m, "register"):
@@ -69,6 +130,7 @@ if bpy and getattr(getattr(bpy, 'types', None), 'AddonPreferences', None):
             if hasattr(m, "unregister"):
                 m.unregister()
         bpy.utils.unregister_class(FileNodesPreferences)
+        log.removeHandler(_log_handler)
 else:  # pragma: no cover - noop if bpy is unavailable
     def register():
         pass
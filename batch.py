@@ -0,0 +1,243 @@
+"""Headless evaluation entry point for render farms and CI.
+
+Run from a background Blender with the addon enabled::
+
+    blender -b scene.blend --python-expr "import file_nodes.batch as b; b.main()" -- --job job.json
+
+(replace ``file_nodes`` with the package name the addon is installed under).
+
+A job file holds one job object or a list of them::
+
+    {
+        "blend": "/path/to/shot.blend",
+        "trees": ["Lighting"],
+        "inputs": {"Lighting": {"Frame": 12, "Camera": "CAM_main"}},
+        "output": "/path/to/shot_out.blend"
+    }
+
+``blend`` is opened before evaluating, ``trees`` limits evaluation to the
+named trees (all enabled trees otherwise), ``inputs`` overrides tree input
+values and ``output`` saves a copy of the result. Without ``output``, a true
+``save`` saves the result over the opened file, and ``name`` labels the job
+in the log. Every key is optional.
+Without ``--job``, the command line ``--tree``/``--set``/``--output``/``--save``
+options describe a single job that runs against the file Blender was started
+with; they cannot be combined with ``--job``.
+
+The process exits with 0 when every job succeeded, 1 when any job failed
+and 2 on invalid arguments, so many jobs can share one Blender start-up.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+import bpy
+
+from . import operators, scheduler
+
+log = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+# Input socket type -> bpy.data collection used to resolve names.
+_POINTER_COLLECTIONS = {
+    'FNSocketScene': 'scenes',
+    'FNSocketObject': 'objects',
+    'FNSocketCollection': 'collections',
+    'FNSocketWorld': 'worlds',
+    'FNSocketCamera': 'cameras',
+    'FNSocketImage': 'images',
+    'FNSocketLight': 'lights',
+    'FNSocketMaterial': 'materials',
+    'FNSocketMesh': 'meshes',
+    'FNSocketNodeTree': 'node_groups',
+    'FNSocketText': 'texts',
+    'FNSocketWorkSpace': 'workspaces',
+}
+
+
+class BatchError(Exception):
+    """Raised when a job cannot be run as described."""
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _parse_override(text):
+    tree_name, sep, rest = text.partition(":")
+    input_name, eq, value = rest.partition("=")
+    if not sep or not eq or not tree_name or not input_name:
+        raise argparse.ArgumentTypeError(f"expected TREE:INPUT=VALUE, got {text!r}")
+    return tree_name, input_name, _parse_value(value)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="file_nodes.batch",
+        description="Evaluate File Nodes trees without the UI.",
+    )
+    parser.add_argument("--job", action="append", default=[], metavar="FILE",
+                        help="JSON job file; may be given several times")
+    parser.add_argument("--tree", action="append", default=[], metavar="NAME",
+                        help="only evaluate this tree; may be given several times")
+    parser.add_argument("--set", action="append", default=[], type=_parse_override,
+                        dest="overrides", metavar="TREE:INPUT=VALUE",
+                        help="override a tree input, VALUE is parsed as JSON when possible")
+    parser.add_argument("--output", metavar="PATH",
+                        help="save a copy of the evaluated file to PATH")
+    parser.add_argument("--save", action="store_true",
+                        help="save the evaluated file over the opened one")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reuse cached results of unchanged nodes instead of running every node")
+    return parser
+
+
+def _script_args(argv):
+    if argv is not None:
+        return list(argv)
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return []
+
+
+def load_jobs(path):
+    """Return the list of job dicts stored in the JSON file at ``path``."""
+    with open(path, "r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    jobs = data if isinstance(data, list) else [data]
+    for job in jobs:
+        if not isinstance(job, dict):
+            raise BatchError(f"{path}: a job must be an object, got {type(job).__name__}")
+    return jobs
+
+
+def _resolve_trees(names):
+    if not names:
+        return None
+    trees = []
+    for name in names:
+        tree = bpy.data.node_groups.get(name)
+        if tree is None or getattr(tree, "bl_idname", "") != "FileNodesTreeType":
+            raise BatchError(f"File Nodes tree '{name}' not found")
+        trees.append(tree)
+    return trees
+
+
+def _coerce(inp, value):
+    collection = _POINTER_COLLECTIONS.get(inp.socket_type)
+    if collection is None or value is None or not isinstance(value, str):
+        return value
+    datablock = getattr(bpy.data, collection).get(value)
+    if datablock is None:
+        raise BatchError(f"{collection} has no datablock named '{value}'")
+    return datablock
+
+
+def apply_inputs(overrides):
+    """Write ``{tree: {input: value}}`` onto the trees' input properties."""
+    for tree_name, values in overrides.items():
+        tree = bpy.data.node_groups.get(tree_name)
+        if tree is None or getattr(tree, "bl_idname", "") != "FileNodesTreeType":
+            raise BatchError(f"File Nodes tree '{tree_name}' not found")
+        ctx = tree.fn_inputs
+        ctx.sync_inputs(tree)
+        for input_name, value in values.items():
+            inp = next((i for i in ctx.inputs if i.name == input_name), None)
+            prop = inp.prop_name() if inp is not None else None
+            if prop is None:
+                raise BatchError(f"Tree '{tree_name}' has no input '{input_name}'")
+            try:
+                setattr(inp, prop, _coerce(inp, value))
+            except (TypeError, ValueError) as exc:
+                raise BatchError(f"Invalid value for '{tree_name}:{input_name}': {exc}") from exc
+
+
+def run_job(job, incremental=False):
+    """Run one job dict and return the number of trees evaluated."""
+    started = time.perf_counter()
+    blend = job.get("blend")
+    if blend:
+        bpy.ops.wm.open_mainfile(filepath=blend)
+
+    apply_inputs(job.get("inputs") or {})
+    # The evaluation below covers anything auto-evaluate queued for the overrides.
+    scheduler.cancel()
+    trees = _resolve_trees(job.get("trees"))
+    names = [t.name for t in trees] if trees is not None else [
+        t.name for t in bpy.data.node_groups
+        if getattr(t, "bl_idname", "") == "FileNodesTreeType" and getattr(t, "fn_enabled", True)
+    ]
+
+    count = 0
+    for name in names:
+        tree_started = time.perf_counter()
+        evaluated, _kept = operators.evaluate_tree(
+            bpy.context, incremental=incremental, trees=[bpy.data.node_groups[name]],
+            dependents=False,
+        )
+        count += evaluated
+        log.info("%s: %.3fs", name, time.perf_counter() - tree_started)
+
+    output = job.get("output")
+    if output:
+        bpy.ops.wm.save_as_mainfile(filepath=output, copy=True)
+    elif job.get("save"):
+        bpy.ops.wm.save_mainfile()
+
+    log.info("Job %s: %d tree(s) in %.3fs", job.get("name") or blend or bpy.data.filepath,
+             count, time.perf_counter() - started)
+    return count
+
+
+def main(argv=None, exit=True):
+    """Parse arguments after ``--`` and run every job they describe."""
+    parser = build_parser()
+    try:
+        args = parser.parse_args(_script_args(argv))
+        if args.job and (args.tree or args.overrides or args.output or args.save):
+            parser.error("--tree, --set, --output and --save cannot be combined with --job")
+    except SystemExit as exc:
+        code = EXIT_OK if exc.code in (0, None) else EXIT_USAGE
+        if exit:
+            sys.exit(code)
+        return code
+
+    try:
+        jobs = []
+        for path in args.job:
+            jobs.extend(load_jobs(path))
+    except (OSError, ValueError, BatchError) as exc:
+        log.error("Could not read job file: %s", exc)
+        code = EXIT_USAGE
+    else:
+        if not args.job:
+            inline = {}
+            for tree_name, input_name, value in args.overrides:
+                inline.setdefault(tree_name, {})[input_name] = value
+            jobs.append({
+                "trees": args.tree or None,
+                "inputs": inline,
+                "output": args.output,
+                "save": args.save,
+            })
+
+        code = EXIT_OK
+        for job in jobs:
+            try:
+                run_job(job, incremental=args.incremental)
+            except Exception:
+                log.exception("File Nodes job failed: %s", job.get("name") or job.get("blend") or "<inline>")
+                code = EXIT_FAILED
+
+    if exit:
+        sys.exit(code)
+    return code
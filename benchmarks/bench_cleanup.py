@@ -0,0 +1,72 @@
+"""Benchmark DataManager.cleanup with batched versus one-by-one removal.
+
+Needs Blender: ``blender -b --factory-startup --python benchmarks/bench_cleanup.py -- [count]``.
+Each run registers ``count`` mesh copies as owned by a DataManager and
+times their cleanup, once through ``bpy.data.batch_remove`` and once with
+the previous per-datablock ``bpy.data.meshes.remove`` calls.
+"""
+
+import importlib
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PKG_NAME = "fn_bench"
+
+
+def _load_data_manager():
+    pkg = types.ModuleType(PKG_NAME)
+    pkg.__path__ = [ROOT]
+    pkg.ADDON_NAME = PKG_NAME
+    sys.modules[PKG_NAME] = pkg
+    return importlib.import_module(f"{PKG_NAME}.data_manager")
+
+
+def _manager_with_copies(dm, bpy, count):
+    manager = dm.DataManager()
+    for i in range(count):
+        mesh = bpy.data.meshes.new(f"fn_bench_{i}")
+        data_id = manager.register_data(mesh)
+        manager._owned_copies.add(data_id)
+    return manager
+
+
+def _time_cleanup(manager):
+    start = time.perf_counter()
+    manager.cleanup()
+    return time.perf_counter() - start
+
+
+def main(count=10_000):
+    try:
+        import bpy
+    except ImportError:
+        print("bench_cleanup.py must run inside Blender (blender -b --python ...)")
+        return
+    dm = _load_data_manager()
+
+    batched = _time_cleanup(_manager_with_copies(dm, bpy, count))
+
+    # Force the one-by-one path the way cleanup worked before batching.
+    original = dm.remove_datablocks
+    dm.remove_datablocks = dm._remove_each
+    try:
+        single = _time_cleanup(_manager_with_copies(dm, bpy, count))
+    finally:
+        dm.remove_datablocks = original
+
+    print(f"batch_remove: {count} copies in {batched:.3f}s")
+    print(f"one by one:   {count} copies in {single:.3f}s")
+    print(f"speedup: {single / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    if "--" in sys.argv:
+        args = sys.argv[sys.argv.index("--") + 1:]
+    elif os.path.basename(sys.argv[0]) == os.path.basename(__file__):
+        args = sys.argv[1:]
+    else:
+        args = []
+    main(int(args[0]) if args else 10_000)
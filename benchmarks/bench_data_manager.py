@@ -0,0 +1,83 @@
+"""Benchmark DataManager.register_data against the previous linear scan.
+
+Run standalone with ``python benchmarks/bench_data_manager.py [count]`` or
+inside Blender with ``blender -b --python benchmarks/bench_data_manager.py``.
+"""
+
+import importlib
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PKG_NAME = "fn_bench"
+
+# The linear reference is quadratic; cap it so the run finishes quickly.
+LINEAR_LIMIT = 10_000
+
+
+def _load_data_manager():
+    try:
+        import bpy  # noqa: F401
+    except ImportError:
+        sys.modules["bpy"] = types.ModuleType("bpy")
+    pkg = types.ModuleType(PKG_NAME)
+    pkg.__path__ = [ROOT]
+    sys.modules[PKG_NAME] = pkg
+    return importlib.import_module(f"{PKG_NAME}.data_manager")
+
+
+def _linear_register(manager, data, initial_refcount=1):
+    """register_data as it was before the identity index."""
+    for existing_id, existing_data in manager._data_store.items():
+        if existing_data is data:
+            manager._ref_counts[existing_id] = initial_refcount
+            return existing_id
+    new_id = str(len(manager._data_store))
+    manager._data_store[new_id] = data
+    manager._ref_counts[new_id] = initial_refcount
+    return new_id
+
+
+def _time(register, values):
+    start = time.perf_counter()
+    for value in values:
+        register(value)
+    # Re-register everything once, as evaluation does for pass-through nodes.
+    for value in values:
+        register(value)
+    return time.perf_counter() - start
+
+
+def main(count=100_000):
+    dm = _load_data_manager()
+    values = [object() for _ in range(count)]
+    linear_count = min(count, LINEAR_LIMIT)
+
+    indexed = dm.DataManager()
+    indexed_time = _time(indexed.register_data, values)
+    linear = dm.DataManager()
+    linear_time = _time(lambda v: _linear_register(linear, v), values[:linear_count])
+
+    print(f"indexed: {count} values in {indexed_time:.3f}s "
+          f"({indexed_time / (2 * count) * 1e6:.2f} us/op)")
+    print(f"linear:  {linear_count} values in {linear_time:.3f}s "
+          f"({linear_time / (2 * linear_count) * 1e6:.2f} us/op)")
+    if linear_count < count:
+        # Linear cost grows with the store size, so scale quadratically.
+        projected = linear_time * (count / linear_count) ** 2
+        print(f"linear projected for {count} values: {projected:.1f}s "
+              f"(~{projected / indexed_time:.0f}x slower)")
+    else:
+        print(f"speedup: {linear_time / indexed_time:.0f}x")
+
+
+if __name__ == "__main__":
+    if "--" in sys.argv:
+        args = sys.argv[sys.argv.index("--") + 1:]
+    elif os.path.basename(sys.argv[0]) == os.path.basename(__file__):
+        args = sys.argv[1:]
+    else:
+        args = []
+    main(int(args[0]) if args else 100_000)
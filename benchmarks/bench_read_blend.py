@@ -0,0 +1,66 @@
+"""Benchmark Read Blend linking with and without preloading dependencies.
+
+Needs Blender: ``blender -b --factory-startup --python benchmarks/bench_read_blend.py -- FILE [runs]``.
+Each run forgets the library cache, removes the libraries linked so far and
+times ``link_library`` on ``FILE`` for every category, once with
+``preload=False`` and once with ``preload=True``. The files are read once
+before timing, so both modes see a warm OS file cache; drop the cache
+between runs to measure cold reads.
+"""
+
+import importlib
+import os
+import statistics
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PKG_NAME = "fn_bench"
+
+
+def _load_read_blend():
+    pkg = types.ModuleType(PKG_NAME)
+    pkg.__path__ = [ROOT]
+    pkg.ADDON_NAME = PKG_NAME
+    sys.modules[PKG_NAME] = pkg
+    return importlib.import_module(f"{PKG_NAME}.nodes.read_blend")
+
+
+def _time_link(read_blend, bpy, path, preload):
+    read_blend.invalidate()
+    for library in list(bpy.data.libraries):
+        bpy.data.libraries.remove(library)
+    start = time.perf_counter()
+    read_blend.link_library(path, read_blend._CATEGORIES, preload=preload)
+    return time.perf_counter() - start
+
+
+def main(path, runs=5):
+    try:
+        import bpy
+    except ImportError:
+        print("bench_read_blend.py must run inside Blender (blender -b --python ...)")
+        return
+    read_blend = _load_read_blend()
+    path = os.path.abspath(path)
+
+    _time_link(read_blend, bpy, path, True)
+    plain = [_time_link(read_blend, bpy, path, False) for _ in range(runs)]
+    preloaded = [_time_link(read_blend, bpy, path, True) for _ in range(runs)]
+
+    print(f"link_library:            median {statistics.median(plain):.3f}s over {runs} runs")
+    print(f"link_library + preload:  median {statistics.median(preloaded):.3f}s over {runs} runs")
+
+
+if __name__ == "__main__":
+    if "--" in sys.argv:
+        args = sys.argv[sys.argv.index("--") + 1:]
+    elif os.path.basename(sys.argv[0]) == os.path.basename(__file__):
+        args = sys.argv[1:]
+    else:
+        args = []
+    if not args:
+        print("usage: bench_read_blend.py FILE [runs]")
+    else:
+        main(args[0], int(args[1]) if len(args) > 1 else 5)
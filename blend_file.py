@@ -0,0 +1,504 @@
+"""Read .blend file headers, block tables and ID names without Blender.
+
+Nothing here imports ``bpy``, so the functions can run in worker threads
+or processes while the main thread keeps the UI responsive. Files saved
+with compression are read through ``gzip`` or, when available, ``zstd``
+(``compression.zstd`` on Python 3.14+, or the ``zstandard`` package).
+
+ID names are found through the file's own SDNA (the ``DNA1`` block), so
+the offset of ``ID.name`` is right for whichever Blender wrote the file.
+"""
+
+import contextlib
+import gzip
+import io
+import os
+import re
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from compression import zstd as _zstd
+except ImportError:
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Two-letter block codes of ID types -> bpy.data collection name.
+ID_CODES = {
+    "SC": "scenes",
+    "OB": "objects",
+    "GR": "collections",
+    "WO": "worlds",
+    "CA": "cameras",
+    "IM": "images",
+    "LA": "lights",
+    "MA": "materials",
+    "ME": "meshes",
+    "NT": "node_groups",
+    "TX": "texts",
+    "WS": "workspaces",
+    "LI": "libraries",
+}
+
+
+class BlendFileError(Exception):
+    """The file is not a .blend file or cannot be decoded here."""
+
+
+class UnsupportedCompression(BlendFileError):
+    """The file is compressed with a codec that is not available here."""
+
+
+class IncompleteScan(BlendFileError):
+    """The file ended before its ``ENDB`` block, so counts would be partial."""
+
+
+class BlendHeader:
+    """File header: Blender version, pointer size, byte order and layout."""
+
+    __slots__ = ("version", "pointer_size", "endian", "compression", "large_bhead")
+
+    def __init__(self, version, pointer_size, endian, compression, large_bhead):
+        self.version = version
+        self.pointer_size = pointer_size
+        # struct byte order prefix, "<" or ">".
+        self.endian = endian
+        # "NONE", "GZIP" or "ZSTD"
+        self.compression = compression
+        # Files written by Blender 5.0+ use 64-bit block lengths.
+        self.large_bhead = large_bhead
+
+
+class BHead:
+    """Header of one file block."""
+
+    __slots__ = ("code", "length", "old", "sdna_index", "count")
+
+    def __init__(self, code, length, old, sdna_index, count):
+        self.code = code
+        self.length = length
+        self.old = old
+        self.sdna_index = sdna_index
+        self.count = count
+
+
+class BlendSummary:
+    """What a header pre-scan found in one file."""
+
+    __slots__ = ("path", "header", "id_counts", "id_names", "libraries")
+
+    def __init__(self, path, header, id_counts, id_names=None, libraries=None):
+        self.path = path
+        self.header = header
+        # Two-letter ID code ("OB") -> number of local IDs of that type.
+        self.id_counts = id_counts
+        # Two-letter ID code -> ID names without the code prefix, in file
+        # order. None unless the scan was asked for names.
+        self.id_names = id_names
+        # Absolute paths of the libraries this file links from, also only
+        # filled by a scan with names.
+        self.libraries = libraries
+
+    def count(self, collection):
+        """Number of IDs for a bpy.data collection name such as "objects"."""
+        return sum(n for code, n in self.id_counts.items() if ID_CODES.get(code) == collection)
+
+    def names(self, collection):
+        """ID names for a bpy.data collection name such as "objects"."""
+        return [n for code, names in self.id_names.items() if ID_CODES.get(code) == collection for n in names]
+
+
+class SDNA:
+    """Struct layouts stored in a file's ``DNA1`` block."""
+
+    __slots__ = ("lengths", "structs", "pointer_size")
+
+    def __init__(self, lengths, structs, pointer_size):
+        # Type name -> size in bytes.
+        self.lengths = lengths
+        # Struct type name -> [(field type name, field name)]
+        self.structs = structs
+        self.pointer_size = pointer_size
+
+    def field(self, struct_name, field_name):
+        """Return ``(offset, size)`` of ``field_name`` in ``struct_name``.
+
+        ``field_name`` is matched without pointer or array decorations, so
+        "name" finds ``char name[66]``. Returns None if it is not there.
+        """
+        offset = 0
+        for type_name, name in self.structs.get(struct_name, ()):
+            size = self._field_size(type_name, name)
+            if _bare_name(name) == field_name:
+                return offset, size
+            offset += size
+        return None
+
+    def _field_size(self, type_name, name):
+        count = 1
+        for dim in re.findall(r"\[(\d+)\]", name):
+            count *= int(dim)
+        if name.startswith("*") or name.startswith("(*"):
+            return self.pointer_size * count
+        return self.lengths[type_name] * count
+
+
+def _bare_name(name):
+    return re.sub(r"[\[(].*$", "", name.lstrip("(*")).rstrip(")")
+
+
+def parse_sdna(data, endian, pointer_size):
+    """Parse the payload of a ``DNA1`` block."""
+    try:
+        return _parse_sdna(data, endian, pointer_size)
+    except (struct.error, ValueError, IndexError):
+        raise BlendFileError("corrupt DNA1 block")
+
+
+def _parse_sdna(data, endian, pointer_size):
+    pos = 0
+
+    def expect(tag):
+        nonlocal pos
+        pos = (pos + 3) & ~3
+        if data[pos:pos + 4] != tag:
+            raise BlendFileError(f"corrupt DNA1 block, expected {tag!r}")
+        pos += 4
+
+    def read_int(fmt):
+        nonlocal pos
+        value = struct.unpack_from(endian + fmt, data, pos)[0]
+        pos += struct.calcsize(fmt)
+        return value
+
+    def read_strings():
+        nonlocal pos
+        count = read_int("i")
+        strings = []
+        for _ in range(count):
+            end = data.index(b"\0", pos)
+            strings.append(data[pos:end].decode("ascii", "replace"))
+            pos = end + 1
+        return strings
+
+    if data[:4] != b"SDNA":
+        raise BlendFileError("corrupt DNA1 block")
+    pos = 4
+    expect(b"NAME")
+    names = read_strings()
+    expect(b"TYPE")
+    types = read_strings()
+    expect(b"TLEN")
+    lengths = struct.unpack_from(f"{endian}{len(types)}H", data, pos)
+    pos += 2 * len(types)
+    expect(b"STRC")
+    structs = {}
+    for _ in range(read_int("i")):
+        type_index, field_count = struct.unpack_from(endian + "hh", data, pos)
+        pos += 4
+        fields = struct.unpack_from(f"{endian}{2 * field_count}h", data, pos)
+        pos += 4 * field_count
+        structs[types[type_index]] = [
+            (types[fields[i]], names[fields[i + 1]]) for i in range(0, len(fields), 2)
+        ]
+    return SDNA(dict(zip(types, lengths)), structs, pointer_size)
+
+
+def _c_string(data):
+    return data.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+
+@contextlib.contextmanager
+def open_blend(path):
+    """Open ``path`` as an uncompressed binary stream.
+
+    Yields ``(stream, compression)``.
+    """
+    with contextlib.ExitStack() as stack:
+        raw = stack.enter_context(open(path, "rb"))
+        magic = raw.read(4)
+        raw.seek(0)
+        if magic[:2] == _GZIP_MAGIC:
+            yield stack.enter_context(gzip.GzipFile(fileobj=raw)), "GZIP"
+        elif magic == _ZSTD_MAGIC:
+            if _zstd is None:
+                raise UnsupportedCompression(f"{path} is zstd-compressed and no zstd module is available")
+            if hasattr(_zstd, "ZstdFile"):
+                stream = _zstd.ZstdFile(raw)
+            else:
+                # Blender writes many frames plus a seek table, so the
+                # reader must not stop at the end of the first frame.
+                stream = _zstd.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            yield stack.enter_context(stream), "ZSTD"
+        else:
+            yield raw, "NONE"
+
+
+def read_header(stream, compression="NONE"):
+    data = stream.read(12)
+    if len(data) < 12 or not data.startswith(b"BLENDER"):
+        raise BlendFileError("not a .blend file")
+    marker = data[7:8]
+    if marker in (b"_", b"-"):
+        # BLENDER_v405: pointer size, byte order, 3-digit version.
+        pointer_size = 4 if marker == b"_" else 8
+        endian = "<" if data[8:9] == b"v" else ">"
+        try:
+            version = int(data[9:12])
+        except ValueError:
+            raise BlendFileError("invalid version in header")
+        return BlendHeader(version, pointer_size, endian, compression, False)
+    # BLENDER17-01v0500: header size, format version, byte order, version.
+    try:
+        size = int(data[7:9])
+    except ValueError:
+        raise BlendFileError("unknown header layout")
+    data += stream.read(size - 12)
+    try:
+        format_version = int(data[10:12])
+        version = int(data[13:size])
+    except ValueError:
+        raise BlendFileError("invalid version in header")
+    if format_version != 1:
+        raise BlendFileError(f"unsupported header format {format_version}")
+    endian = "<" if data[12:13] == b"v" else ">"
+    return BlendHeader(version, 8, endian, compression, True)
+
+
+def _bhead_struct(header):
+    if header.large_bhead:
+        # code, SDNAnr, old, len, nr
+        return struct.Struct(header.endian + "4siQqq"), (0, 3, 2, 1, 4)
+    pointer = "I" if header.pointer_size == 4 else "Q"
+    # code, len, old, SDNAnr, nr
+    return struct.Struct(header.endian + "4si" + pointer + "ii"), (0, 1, 2, 3, 4)
+
+
+def _read_exact(stream, count):
+    # Decompressing readers may return less than asked at frame boundaries.
+    data = stream.read(count)
+    while len(data) < count:
+        chunk = stream.read(count - len(data))
+        if not chunk:
+            raise IncompleteScan("file ends before ENDB")
+        data += chunk
+    return data
+
+
+def _skip(stream, count):
+    try:
+        stream.seek(count, io.SEEK_CUR)
+    except (OSError, io.UnsupportedOperation):
+        while count > 0:
+            chunk = stream.read(min(count, 1 << 20))
+            if not chunk:
+                raise IncompleteScan("file ends before ENDB")
+            count -= len(chunk)
+
+
+def iter_blocks(stream, header, read_data=None):
+    """Yield ``(bhead, data)`` for each block up to ``ENDB``.
+
+    ``data`` is the block's bytes when ``read_data(bhead)`` is true and
+    None otherwise; unread blocks are skipped. Raises IncompleteScan if
+    the file ends before ``ENDB``, so a truncated read is never taken for
+    the whole file.
+    """
+    layout, order = _bhead_struct(header)
+    while True:
+        raw = _read_exact(stream, layout.size)
+        fields = layout.unpack(raw)
+        bhead = BHead(*(fields[i] for i in order))
+        if bhead.code == b"ENDB":
+            return
+        if bhead.length < 0:
+            raise BlendFileError("corrupt block header")
+        if read_data is not None and read_data(bhead):
+            data = _read_exact(stream, bhead.length)
+        else:
+            data = None
+            _skip(stream, bhead.length)
+        yield bhead, data
+
+
+def id_code(bhead):
+    """Two-letter ID code of ``bhead``, or None for non-ID blocks."""
+    code = bhead.code
+    if code[2:] != b"\0\0" or code[:2] == b"ID":
+        # "ID" blocks are placeholders for IDs linked from other files.
+        return None
+    return code[:2].decode("ascii", "replace")
+
+
+def scan(path, names=False):
+    """Read the header and block table of ``path`` into a BlendSummary.
+
+    With ``names`` the ID blocks and the SDNA are read as well to list the
+    name of every local ID.
+    """
+    ids = []
+    sdna_data = None
+
+    def wanted(bhead):
+        return bhead.code == b"DNA1" or id_code(bhead) is not None
+
+    with open_blend(path) as (stream, compression):
+        header = read_header(stream, compression)
+        counts = {}
+        for bhead, data in iter_blocks(stream, header, wanted if names else None):
+            if bhead.code == b"DNA1":
+                sdna_data = data
+                continue
+            code = id_code(bhead)
+            if code is not None:
+                counts[code] = counts.get(code, 0) + 1
+                if names:
+                    ids.append((code, data))
+    if not names:
+        return BlendSummary(path, header, counts)
+
+    if sdna_data is None:
+        raise BlendFileError("no DNA1 block")
+    sdna = parse_sdna(sdna_data, header.endian, header.pointer_size)
+    name_field = sdna.field("ID", "name")
+    if name_field is None:
+        raise BlendFileError("ID.name not found in SDNA")
+    offset, size = name_field
+    # Stored as "name" in files written before it was renamed to "filepath".
+    path_field = sdna.field("Library", "filepath") or sdna.field("Library", "name")
+    id_names = {}
+    libraries = []
+    for code, data in ids:
+        # ID.name starts with the two-letter code, e.g. "OBCube".
+        id_names.setdefault(code, []).append(_c_string(data[offset:offset + size])[2:])
+        if code == "LI" and path_field is not None:
+            lib_offset, lib_size = path_field
+            lib_path = _c_string(data[lib_offset:lib_offset + lib_size])
+            if lib_path:
+                libraries.append(resolve_library_path(path, lib_path))
+    return BlendSummary(path, header, counts, id_names, libraries)
+
+
+def resolve_library_path(owner, filepath):
+    """Absolute path of ``filepath`` as stored in the file ``owner``."""
+    if filepath.startswith("//"):
+        filepath = os.path.join(os.path.dirname(owner), filepath[2:])
+    return os.path.normpath(filepath.replace("\\", os.sep).replace("/", os.sep))
+
+
+def list_names(path):
+    """Return ``{bpy.data collection: [ID names]}`` for the file at ``path``."""
+    summary = scan(path, names=True)
+    return {attr: summary.names(attr) for attr in ID_CODES.values()}
+
+
+def _scan_or_error(path, names=False):
+    try:
+        return scan(path, names)
+    except (OSError, EOFError, zlib.error, BlendFileError, struct.error) as e:
+        return e
+
+
+def scan_many(paths, max_workers=None, names=False):
+    """Scan ``paths`` in a thread pool.
+
+    Returns ``{path: BlendSummary or exception}`` in the order of ``paths``.
+    """
+    paths = list(paths)
+    if not paths:
+        return {}
+    workers = max_workers or min(8, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(_scan_or_error, paths, [names] * len(paths))))
+
+
+class LibraryNode:
+    """One file in a library dependency graph."""
+
+    __slots__ = ("path", "dependencies", "read_time", "error")
+
+    def __init__(self, path, dependencies, read_time, error=None):
+        self.path = path
+        # Absolute paths of the libraries this file links from.
+        self.dependencies = dependencies
+        # Seconds spent reading the file's block index.
+        self.read_time = read_time
+        self.error = error
+
+
+def _read_library(path):
+    started = time.perf_counter()
+    result = _scan_or_error(path, True)
+    elapsed = time.perf_counter() - started
+    if isinstance(result, Exception):
+        return LibraryNode(path, [], elapsed, result)
+    return LibraryNode(path, result.libraries, elapsed)
+
+
+def dependency_graph(roots, max_workers=None):
+    """Return ``{path: LibraryNode}`` for ``roots`` and everything they link.
+
+    Each level of the graph is read in one thread-pool batch, so the whole
+    transitive closure is read (and in the OS file cache) before Blender
+    resolves the indirect libraries one by one.
+    """
+    graph = {}
+    pending = [os.path.normpath(p) for p in roots]
+    while pending:
+        batch = list(dict.fromkeys(p for p in pending if p not in graph))
+        if not batch:
+            break
+        workers = max_workers or min(8, len(batch))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for node in pool.map(_read_library, batch):
+                graph[node.path] = node
+        pending = [dep for path in batch for dep in graph[path].dependencies]
+    return graph
+
+
+def dependency_order(graph, root):
+    """Paths reachable from ``root``, every library before its users."""
+    order = []
+    seen = set()
+    stack = [(os.path.normpath(root), False)]
+    while stack:
+        path, expanded = stack.pop()
+        if expanded:
+            order.append(path)
+            continue
+        if path in seen:
+            continue
+        seen.add(path)
+        stack.append((path, True))
+        node = graph.get(path)
+        for dep in reversed(node.dependencies if node else []):
+            stack.append((dep, False))
+    return order
+
+
+def format_tree(graph, root):
+    """Indented lines describing the dependency tree below ``root``."""
+    lines = []
+    stack = [(os.path.normpath(root), 0, ())]
+    while stack:
+        path, depth, parents = stack.pop()
+        node = graph.get(path)
+        label = os.path.basename(path)
+        if path in parents:
+            lines.append(f"{'  ' * depth}{label} (cycle)")
+            continue
+        if node is None:
+            lines.append(f"{'  ' * depth}{label}")
+            continue
+        status = f"error: {node.error}" if node.error else f"{node.read_time * 1000:.1f} ms"
+        lines.append(f"{'  ' * depth}{label} ({status})")
+        for dep in reversed(node.dependencies):
+            stack.append((dep, depth + 1, parents + (path,)))
+    return lines
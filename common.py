@@ -1,5 +1,7 @@
 """Common utilities and shared constants for the File Nodes addon."""
 
+import bpy
+
 LIST_TO_SINGLE = {
     "FNSocketSceneList": "FNSocketScene",
     "FNSocketObjectList": "FNSocketObject",
@@ -16,3 +18,29 @@ LIST_TO_SINGLE = {
     "FNSocketWorkSpaceList": "FNSocketWorkSpace",
     "FNSocketViewLayerList": "FNSocketViewLayer",
 }
+
+# Handlers fired when Blender replaces bpy.data (file loads) or restores
+# it (undo, redo). Either frees the structs module caches point to.
+RESET_HANDLERS = ("load_post", "undo_post", "redo_post")
+
+
+def persistent_handler(func):
+    """Keep ``func`` registered across file loads (bpy.app.handlers.persistent)."""
+    handlers = getattr(getattr(bpy, "app", None), "handlers", None)
+    return handlers.persistent(func) if handlers else func
+
+
+def add_handler(func, names=RESET_HANDLERS):
+    """Append ``func`` to each of the ``bpy.app.handlers`` lists ``names``."""
+    for name in names:
+        handlers = getattr(bpy.app.handlers, name)
+        if func not in handlers:
+            handlers.append(func)
+
+
+def remove_handler(func, names=RESET_HANDLERS):
+    """Remove ``func`` from each of the ``bpy.app.handlers`` lists ``names``."""
+    for name in names:
+        handlers = getattr(bpy.app.handlers, name)
+        if func in handlers:
+            handlers.remove(func)
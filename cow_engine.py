@@ -1,6 +1,337 @@
+import logging
+import time
+from collections import OrderedDict
+
 import bpy
-from .common import LIST_TO_SINGLE
+from . import uuid_manager
+from .common import LIST_TO_SINGLE, add_handler, persistent_handler, remove_handler
 from .data_manager import DataManager
+from .lazy_copy import LazyCopy, unwrap
+
+log = logging.getLogger(__name__)
+
+# Per-tree cache of node results used by incremental evaluation, keyed by
+# the tree pointer. Each entry maps a node name to a NodeCacheEntry. Trees
+# evaluated by group nodes are keyed per group node instance instead (see
+# evaluate_group), so instances do not overwrite each other's results.
+_eval_cache = {}
+# (tree_key, node_name) -> _dirty_serial when a property update callback
+# flagged the node. Cached results made before that are stale. A serial
+# rather than a flag that is cleared on use lets every cache holding
+# results of the node (one per group instance) notice it.
+_dirty_nodes = {}
+_dirty_serial = 0
+# (cache key, incremental) of the evaluations in progress, innermost last.
+_evaluating = []
+# Monotonic counter stamped on every process() call. Outputs that hold
+# datablocks carry the stamp in their signature because a re-run may have
+# mutated the datablock even when the same pointer is returned.
+_run_serial = 0
+# Compiled plans per tree pointer, validated by a topology fingerprint.
+_plan_cache = {}
+# Outputs of pure nodes keyed by (tree_key, node name, input key), most
+# recently used last. Unlike _eval_cache it keeps older input combinations,
+# so toggling a Switch back and forth hits the memo.
+_memo = OrderedDict()
+MEMO_SIZE = 1024
+# Datablock pointer -> change counter. Input keys include the counter, so a
+# datablock changed in place no longer matches memo entries made before.
+_change_counters = {}
+# Datablock key (pointer or File Nodes UUID) -> {(tree_key, node name)} of
+# the nodes that read it on their last run, and the keys each node read.
+_consumers = {}
+_node_reads = {}
+# Pointers of datablocks written by evaluation since the last depsgraph
+# update; their updates come from File Nodes itself and are ignored.
+_own_writes = set()
+
+# Node types that are evaluated on every pass regardless of cache state.
+_output_types = {
+    "FNOutputScenesNode",
+    "FNRenderScenesNode",
+    "NodeGroupOutput",
+    "FNOutlinerNode",
+}
+
+
+class NodeCacheEntry:
+    """Result of a node evaluation kept between incremental passes."""
+
+    __slots__ = ("signature", "outputs", "output_signatures", "shared", "tracked", "serial")
+
+    def __init__(self, signature, outputs, output_signatures, shared=(), tracked=True):
+        self.signature = signature
+        self.outputs = outputs
+        self.output_signatures = output_signatures
+        # Identifiers of outputs passing an upstream datablock through
+        # (unwritten lazy copies); reuse shares them instead of registering.
+        self.shared = frozenset(shared)
+        # False when made by a full pass, which does not record reads.
+        self.tracked = tracked
+        # _dirty_serial when the entry was made.
+        self.serial = _dirty_serial
+
+
+def _tree_key(tree):
+    as_pointer = getattr(tree, "as_pointer", None)
+    return as_pointer() if as_pointer else id(tree)
+
+
+def mark_dirty(owner):
+    """Flag the node owning ``owner`` (a node or socket) for re-evaluation."""
+    node = getattr(owner, "node", None) or owner
+    if not hasattr(node, "inputs") or not hasattr(node, "outputs"):
+        return
+    tree = getattr(node, "id_data", None)
+    name = getattr(node, "name", None)
+    if tree is None or name is None:
+        return
+    _mark_node_dirty(_tree_key(tree), name)
+
+
+def _mark_node_dirty(key, name):
+    global _dirty_serial
+    _dirty_serial += 1
+    _dirty_nodes[(key, name)] = _dirty_serial
+    # Node settings are not part of the memo key.
+    for memo_key in [k for k in _memo if k[0] == key and k[1] == name]:
+        del _memo[memo_key]
+
+
+def note_changed(datablock):
+    """Record that ``datablock`` changed, invalidating memo entries using it."""
+    as_pointer = getattr(datablock, "as_pointer", None)
+    if as_pointer is None:
+        return
+    try:
+        _bump_pointer(as_pointer())
+    except ReferenceError:
+        pass
+
+
+def _bump_pointer(pointer):
+    _change_counters[pointer] = _change_counters.get(pointer, 0) + 1
+
+
+def _datablocks(value):
+    """Yield the datablocks in ``value`` (also inside lists)."""
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _datablocks(item)
+    elif hasattr(value, "as_pointer"):
+        yield value
+
+
+def _datablock_keys(data):
+    try:
+        keys = [data.as_pointer()]
+        data_uuid = uuid_manager.get_uuid(data)
+    except ReferenceError:
+        return []
+    if data_uuid:
+        keys.append(data_uuid)
+    return keys
+
+
+def _pointers(value):
+    pointers = set()
+    for data in _datablocks(value):
+        try:
+            pointers.add(data.as_pointer())
+        except ReferenceError:
+            pass
+    return pointers
+
+
+def _note_outputs_changed(outputs, inputs):
+    """Bump the change counters of a non-pure node's output datablocks.
+
+    The node may have changed them in place. Only outputs it did not get as
+    inputs, i.e. created, are taken as File Nodes' own writes: passing a
+    datablock through is not a write, and writes to inputs are reported by
+    the DataManager.
+    """
+    received = _pointers(unwrap(inputs))
+    for pointer in _pointers(outputs):
+        _bump_pointer(pointer)
+        if pointer not in received:
+            _own_writes.add(pointer)
+
+
+def _record_reads(key, name, values):
+    """Remember which datablocks node ``name`` read on this run."""
+    node = (key, name)
+    reads = set()
+    for data in _datablocks(values):
+        reads.update(_datablock_keys(unwrap(data)))
+    previous = _node_reads.get(node, set())
+    for data_key in previous - reads:
+        nodes = _consumers.get(data_key)
+        if nodes is not None:
+            nodes.discard(node)
+            if not nodes:
+                del _consumers[data_key]
+    for data_key in reads - previous:
+        _consumers.setdefault(data_key, set()).add(node)
+    if reads:
+        _node_reads[node] = reads
+    else:
+        _node_reads.pop(node, None)
+
+
+def _forget_reads(key=None):
+    for node in [n for n in _node_reads if key is None or n[0] == key]:
+        _record_reads(node[0], node[1], ())
+
+
+def mark_consumers_dirty(datablocks):
+    """Flag the nodes that read any of ``datablocks`` for re-evaluation.
+
+    Changes File Nodes made itself during evaluation are skipped. Returns
+    the number of nodes flagged.
+    """
+    return len(_flag_consumers(datablocks))
+
+
+def _flag_consumers(datablocks):
+    # mark_consumers_dirty, returning the (tree_key, name) pairs flagged.
+    flagged = set()
+    for data in datablocks:
+        data = getattr(data, "original", None) or data
+        keys = _datablock_keys(data)
+        if not keys or keys[0] in _own_writes:
+            continue
+        note_changed(data)
+        for data_key in keys:
+            flagged.update(_consumers.get(data_key, ()))
+    for key, name in flagged:
+        _mark_node_dirty(key, name)
+    if flagged:
+        log.debug("Datablock updates flagged %d nodes", len(flagged))
+    return flagged
+
+
+def _cache_key_involves(cache_key, key):
+    """True if ``cache_key`` is the tree ``key``'s cache or one nested in it.
+
+    Group instance caches are keyed (group tree, outer cache key, node
+    name), so the chain names the group's tree and every enclosing tree.
+    """
+    while type(cache_key) is tuple:
+        if cache_key[0] == key:
+            return True
+        cache_key = cache_key[1]
+    return cache_key == key
+
+
+def invalidate(tree=None):
+    """Drop cached node results and plans for ``tree`` or for every tree.
+
+    The caches of group instances of ``tree``, and of groups evaluated
+    within it, go as well.
+    """
+    if tree is None:
+        _eval_cache.clear()
+        _dirty_nodes.clear()
+        _plan_cache.clear()
+        _memo.clear()
+        _change_counters.clear()
+        _consumers.clear()
+        _node_reads.clear()
+        _own_writes.clear()
+        return
+    key = _tree_key(tree)
+    for cache_key in [k for k in _eval_cache if _cache_key_involves(k, key)]:
+        del _eval_cache[cache_key]
+    _plan_cache.pop(key, None)
+    for item in [d for d in _dirty_nodes if d[0] == key]:
+        del _dirty_nodes[item]
+    for memo_key in [k for k in _memo if k[0] == key]:
+        del _memo[memo_key]
+    _forget_reads(key)
+
+
+def _value_signature(value):
+    """Return a hashable fingerprint of a socket value."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_value_signature(v) for v in value)
+    as_pointer = getattr(value, "as_pointer", None)
+    if as_pointer is not None:
+        try:
+            return ("ID", as_pointer())
+        except ReferenceError:
+            return ("ID", None)
+    try:
+        return tuple(value)
+    except TypeError:
+        return ("OBJ", id(value))
+
+
+class _NotMemoizable(Exception):
+    pass
+
+
+def _memo_value_key(value):
+    """Hashable content key of a resolved input value.
+
+    Datablocks are keyed by pointer plus change counter; values that cannot
+    be keyed safely raise _NotMemoizable.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(_memo_value_key(v) for v in value)
+    as_pointer = getattr(value, "as_pointer", None)
+    if as_pointer is not None:
+        try:
+            pointer = as_pointer()
+        except ReferenceError:
+            raise _NotMemoizable()
+        return ("ID", pointer, _change_counters.get(pointer, 0))
+    # Vectors, colors and bpy_prop_array values from vector sockets are
+    # fixed-length numeric sequences; key them by a snapshot of their items.
+    try:
+        items = tuple(value)
+    except TypeError:
+        raise _NotMemoizable()
+    if items and all(isinstance(v, (bool, int, float)) for v in items):
+        return (type(value).__name__,) + items
+    raise _NotMemoizable()
+
+
+def _memo_key(tree_key, name, inputs):
+    try:
+        return (tree_key, name, tuple((k, _memo_value_key(v)) for k, v in sorted(inputs.items())))
+    except _NotMemoizable:
+        return None
+
+
+def _memo_store(key, outputs):
+    _memo[key] = dict(outputs)
+    _memo.move_to_end(key)
+    while len(_memo) > MEMO_SIZE:
+        _memo.popitem(last=False)
+
+
+def _contains_id(value):
+    if isinstance(value, (list, tuple)):
+        return any(_contains_id(v) for v in value)
+    return hasattr(value, "as_pointer")
+
+
+def _is_alive(value):
+    """Return False if ``value`` holds a datablock that has been removed."""
+    if isinstance(value, (list, tuple)):
+        return all(_is_alive(v) for v in value)
+    if hasattr(value, "as_pointer"):
+        try:
+            value.name
+        except ReferenceError:
+            return False
+    return True
+
 
 def _consumer_counts(tree):
     counts = {}
@@ -19,240 +350,610 @@ def _consumer_counts(tree):
     return counts
 
 
-def evaluate_tree(tree, context, manager=None):
-    if manager is None:
-        manager = DataManager()
-    resolved = {}
-    evaluating = set()
-
-    # Calculate consumer counts for all output sockets in the tree
-    socket_consumer_counts = _consumer_counts(tree)
-
-    output_types = {
-        "FNOutputScenesNode",
-        "FNRenderScenesNode",
-        "NodeGroupOutput",
-        "FNOutlinerNode",
-    }
-
-    def resolve_id(data_id):
-        if isinstance(data_id, list):
-            return [resolve_id(d) for d in data_id]
-        return manager.get_data(data_id)
-
-    def get_value_from_socket(sock):
-        """Helper to get the raw value from a socket that is not linked."""
-        if hasattr(sock, "value"):
-            return sock.value
-        return None
+class InputBinding:
+    """How one input socket of a planned node receives its value."""
+
+    __slots__ = ("name", "socket", "sources", "multi", "mutable")
+
+    def __init__(self, name, socket, sources, multi, mutable):
+        self.name = name
+        self.socket = socket
+        # (from_node, from_name, from_identifier, promote) per usable link.
+        # None for unlinked sockets, which read their own value.
+        self.sources = sources
+        self.multi = multi
+        self.mutable = mutable
+
+
+class PlanStep:
+    """A node of the execution plan with its resolved bindings."""
+
+    __slots__ = ("node", "name", "kind", "inputs", "outputs")
+
+    def __init__(self, node, kind, inputs, outputs):
+        self.node = node
+        self.name = node.name
+        self.kind = kind
+        self.inputs = inputs
+        # (identifier, name, consumer_count) per output socket.
+        self.outputs = outputs
+
+
+class EvaluationPlan:
+    """Topologically sorted steps needed to evaluate a tree's outputs."""
+
+    __slots__ = ("steps", "group_output")
+
+    def __init__(self, steps, group_output):
+        self.steps = steps
+        self.group_output = group_output
 
-    def eval_socket(sock):
-        print(f"eval_socket: Evaluating socket {sock.name} on node {sock.node.name}")
+
+def _topological_order(tree):
+    """Return the nodes upstream of output nodes, dependencies first.
+
+    Uses an explicit stack so deep chains do not hit the recursion limit.
+    A link that closes a cycle points at a node that is still on the stack;
+    that node finishes later, so it ends up *after* its consumer in the
+    order and the planner drops the link.
+    """
+    order = []
+    done = set()
+    on_stack = set()
+    for root in getattr(tree, "nodes", []):
+        if root.bl_idname not in _output_types or root in done:
+            continue
+        stack = [(root, iter(_upstream_nodes(root)))]
+        on_stack.add(root)
+        while stack:
+            node, upstream = stack[-1]
+            for dep in upstream:
+                if dep not in done and dep not in on_stack:
+                    on_stack.add(dep)
+                    stack.append((dep, iter(_upstream_nodes(dep))))
+                    break
+            else:
+                stack.pop()
+                on_stack.discard(node)
+                done.add(node)
+                order.append(node)
+    return order
+
+
+def _upstream_nodes(node):
+    for sock in node.inputs:
         if sock.is_linked and sock.links:
-            single = LIST_TO_SINGLE.get(sock.bl_idname)
-            
-            if getattr(sock, "is_multi_input", False):
-                # --- Multi-Input Socket ---
-                values = []
+            for link in sock.links:
+                yield link.from_node
+
+
+def compile_plan(tree):
+    """Compile ``tree`` into an :class:`EvaluationPlan`."""
+    order = _topological_order(tree)
+    position = {node: index for index, node in enumerate(order)}
+    counts = _consumer_counts(tree)
+
+    steps = []
+    group_output = None
+    for node in order:
+        bl_idname = getattr(node, "bl_idname", "")
+        if bl_idname == "NodeGroupInput":
+            kind = "GROUP_INPUT"
+        elif bl_idname == "NodeGroupOutput":
+            kind = "GROUP_OUTPUT"
+        else:
+            kind = "NODE"
+
+        inputs = []
+        for sock in node.inputs:
+            sources = None
+            if sock.is_linked and sock.links:
+                single = LIST_TO_SINGLE.get(sock.bl_idname)
+                sources = []
                 for link in sock.links:
+                    from_node = link.from_node
+                    if position.get(from_node, len(order)) >= position[node]:
+                        log.warning("Circular dependency at %s.%s, ignoring link", node.name, sock.name)
+                        continue
                     from_sock = link.from_socket
-                    print(f"eval_socket: Multi-input link from {from_sock.node.name}.{from_sock.name}")
-                    outputs = eval_node(from_sock.node)
-                    
-                    # Get the data ID from the producing node's output
-                    data_id = outputs.get(from_sock.name)
-                    if data_id is None:
-                        ident = getattr(from_sock, "identifier", from_sock.name)
-                        data_id = outputs.get(ident)
-
-                    if data_id is not None:
-                        # Request a mutable version (CoW happens here)
-                        mutable_id = manager.request_mutable_data(data_id)
-                        # Only decrement if no copy was made (i.e., original ID was returned)
-                        if mutable_id == data_id:
-                            manager.decrement_ref_count(data_id)
-                        values.append(mutable_id)
-                
-                # For multi-input, we return a list of IDs
-                print(f"eval_socket: Multi-input returning IDs: {values}")
-                return values
-            else:
-                # --- Single-Input Socket ---
-                link = sock.links[0]
-                from_sock = link.from_socket
-                print(f"eval_socket: Single-input link from {from_sock.node.name}.{from_sock.name}")
-                outputs = eval_node(from_sock.node)
-
-                data_id = outputs.get(from_sock.name)
-                if data_id is None:
                     ident = getattr(from_sock, "identifier", from_sock.name)
-                    data_id = outputs.get(ident)
+                    promote = bool(single) and from_sock.bl_idname == single
+                    sources.append((from_node, from_sock.name, ident, promote))
+            inputs.append(InputBinding(
+                sock.name,
+                sock,
+                sources,
+                getattr(sock, "is_multi_input", False),
+                getattr(sock, "is_mutable", True),
+            ))
 
-                if data_id is not None:
-                    # Request a mutable version for the next node
-                    if sock.is_mutable:
-                        mutable_id = manager.request_mutable_data(data_id)
-                        # Only decrement if the original data was not shared and no copy was made.
-                        if mutable_id == data_id:
-                            manager.decrement_ref_count(data_id)
-                    else:
-                        # For immutable sockets, we just pass the ID through without changing the ref count.
-                        mutable_id = data_id
-                    
-                    # Handle list promotion (e.g., single item to list socket)
-                    if single and from_sock.bl_idname == single:
-                         print(f"eval_socket: Single-input returning list with ID: {[mutable_id]}")
-                         return [mutable_id]
-                    print(f"eval_socket: Single-input returning ID: {mutable_id}")
-                    return mutable_id
-                print("eval_socket: Single-input returning None")
+        outputs = []
+        for sock in node.outputs:
+            ident = getattr(sock, "identifier", sock.name)
+            outputs.append((ident, sock.name, counts.get((node.name, sock.name), 1)))
+
+        step = PlanStep(node, kind, inputs, outputs)
+        if kind == "GROUP_OUTPUT" and group_output is None:
+            group_output = step
+        steps.append(step)
+    return EvaluationPlan(steps, group_output)
+
+
+class PlanCacheEntry:
+    """A compiled plan and the topology it was compiled from."""
+
+    __slots__ = ("fingerprint", "plan", "stale")
+
+    def __init__(self, fingerprint, plan):
+        self.fingerprint = fingerprint
+        self.plan = plan
+        self.stale = False
+
+
+def _pointer(struct):
+    as_pointer = getattr(struct, "as_pointer", None)
+    return as_pointer() if as_pointer else id(struct)
+
+
+def topology_fingerprint(tree):
+    """Return a hashable description of the nodes, sockets and links of ``tree``.
+
+    Pointers are included so a plan never outlives the nodes and sockets it
+    references, even if they are recreated with the same names.
+    """
+    nodes = []
+    links = []
+    for node in getattr(tree, "nodes", []):
+        inputs = []
+        for sock in node.inputs:
+            inputs.append((
+                _pointer(sock),
+                getattr(sock, "identifier", sock.name),
+                sock.name,
+                sock.bl_idname,
+                getattr(sock, "is_mutable", True),
+                getattr(sock, "is_multi_input", False),
+            ))
+            if sock.is_linked and sock.links:
+                for link in sock.links:
+                    links.append((_pointer(link.from_node), _pointer(link.from_socket), _pointer(sock)))
+        outputs = tuple(
+            (_pointer(sock), getattr(sock, "identifier", sock.name), sock.name, sock.bl_idname)
+            for sock in node.outputs
+        )
+        nodes.append((_pointer(node), node.name, node.bl_idname, tuple(inputs), outputs))
+    return tuple(nodes), tuple(links)
+
+
+def get_plan(tree):
+    """Return the compiled plan for ``tree``, compiling it only when needed.
+
+    A cached plan is reused as-is until :func:`invalidate_plan` marks it
+    stale. A stale plan is kept if the topology fingerprint did not change.
+    """
+    key = _tree_key(tree)
+    entry = _plan_cache.get(key)
+    if entry is not None and not entry.stale:
+        return entry.plan
+    fingerprint = topology_fingerprint(tree)
+    if entry is not None and entry.fingerprint == fingerprint:
+        entry.stale = False
+        return entry.plan
+    log.debug("Compiling plan for tree %s", getattr(tree, "name", key))
+    plan = compile_plan(tree)
+    _plan_cache[key] = PlanCacheEntry(fingerprint, plan)
+    return plan
+
+
+def invalidate_plan(tree):
+    """Mark the cached plan of ``tree`` for re-validation."""
+    entry = _plan_cache.get(_tree_key(tree))
+    if entry is not None:
+        entry.stale = True
+
+
+def _group_cache_key(tree, node):
+    outer_key = _evaluating[-1][0] if _evaluating else None
+    return (_tree_key(tree), outer_key, getattr(node, "name", ""))
+
+
+def evaluate_group(tree, context, manager, node):
+    """Evaluate ``tree`` for the group node ``node`` of the running evaluation.
+
+    The caller's incremental mode is passed on, and results are cached per
+    group node instance: under the caller's cache key plus the node name.
+    Instances of one group and standalone runs of its tree thus keep
+    separate caches.
+    """
+    incremental = _evaluating[-1][1] if _evaluating else False
+    return evaluate_tree(tree, context, manager, incremental, _group_cache_key(tree, node))
+
+
+def group_state(tree, node, inputs):
+    """external_state of the group node ``node`` evaluating ``tree``.
+
+    Fingerprints what the group's results depend on besides its inputs:
+    the tree's topology and, per inner node, its dirty flag, unlinked
+    socket values and own external_state, fed from the instance's cached
+    results. While an inner node has no usable cached result or must run
+    on every pass, a value equal to no other is returned so the group runs.
+    """
+    cache_key = _group_cache_key(tree, node)
+    cache = _eval_cache.get(cache_key)
+    if cache is None:
+        return object()
+    plan = get_plan(tree)
+    key = _tree_key(tree)
+    state = [_plan_cache[key].fingerprint]
+
+    def cached_inputs(step):
+        values = {}
+        for binding in step.inputs:
+            if binding.sources is None:
+                values[binding.name] = getattr(binding.socket, "value", None)
+                continue
+            items = []
+            for from_node, from_name, from_ident, _promote in binding.sources:
+                if from_node.bl_idname == "NodeGroupInput":
+                    items.append(inputs.get(from_name))
+                    continue
+                entry = cache.get(from_node.name)
+                outputs = entry.outputs if entry is not None else {}
+                items.append(outputs.get(from_ident, outputs.get(from_name)))
+            values[binding.name] = items if binding.multi else (items[0] if items else None)
+        return values
+
+    _evaluating.append((cache_key, True))
+    try:
+        for step in plan.steps:
+            state.append(tuple(
+                _value_signature(getattr(b.socket, "value", None))
+                for b in step.inputs if b.sources is None
+            ))
+            if step.kind != "NODE":
+                continue
+            inner = step.node
+            entry = cache.get(step.name)
+            if (entry is None
+                    or inner.bl_idname in _output_types
+                    or getattr(inner, "always_evaluate", False)
+                    or not _is_alive(list(entry.outputs.values()))):
+                return object()
+            state.append(_dirty_nodes.get((key, step.name), 0))
+            external_state = getattr(inner, "external_state", None)
+            if external_state is not None:
+                state.append(external_state(cached_inputs(step)))
+    finally:
+        _evaluating.pop()
+    return tuple(state)
+
+
+def evaluate_tree(tree, context, manager=None, incremental=False, cache_key=None):
+    """Evaluate ``tree`` from its output nodes.
+
+    The tree is compiled into a topologically sorted plan and run as a flat
+    loop. With ``incremental`` enabled, nodes whose inputs, links and
+    upstream outputs are unchanged since the previous pass (and that were
+    not flagged through :func:`mark_dirty`) reuse their cached outputs
+    instead of running ``process()`` again. Results are recorded in either
+    mode so a full pass seeds the cache for later incremental ones, but the
+    reads, writes and memo entries used for invalidation are only tracked
+    in incremental mode.
+
+    The evaluation runs in a frame of ``manager``; copies are only cleaned
+    up when the outermost frame closes, so a group node evaluating its tree
+    with the caller's manager leaves the caller's data intact. Returns the
+    data IDs bound to the tree's Group Output node, keyed by socket
+    identifier and name. ``cache_key`` selects the result cache and
+    defaults to the tree's own.
+    """
+    global _run_serial
+    if manager is None:
+        manager = DataManager()
+    # Wrapped (ID) outputs and output signatures per evaluated node.
+    resolved = {}
+    signatures = {}
+
+    tree_key = _tree_key(tree)
+    if cache_key is None:
+        cache_key = tree_key
+    previous_cache = _eval_cache.get(cache_key, {})
+    new_cache = {}
+    profile = manager.profile
+    tree_name = getattr(tree, "name", "")
+    if profile is not None:
+        profile.record_tree(tree_name)
+
+    resolve_id = manager.resolve
+
+    def source_data_id(source):
+        from_node, from_name, from_ident, _promote = source
+        outputs = resolved.get(from_node, {})
+        data_id = outputs.get(from_name)
+        if data_id is None:
+            data_id = outputs.get(from_ident)
+        return data_id
+
+    def source_id(step, binding, source, mutable, lazy=False):
+        data_id = source_data_id(source)
+        if data_id is None:
+            return None
+        if mutable:
+            # Request a mutable version (CoW happens here)
+            consumer = (tree_name, step.name, binding.name) if lazy else None
+            mutable_id = manager.request_mutable_data(data_id, lazy=lazy, consumer=consumer)
+            # Only decrement if no copy was made (i.e., original ID was returned)
+            if mutable_id == data_id:
+                manager.decrement_ref_count(data_id)
+            elif profile is not None and not lazy:
+                # Lazy copies are recorded when they materialize.
+                profile.record_copy(tree_name, step.name, binding.name, manager.get_data(mutable_id))
+            data_id = mutable_id
+        return data_id
+
+    def bind_input(step, binding):
+        sources = binding.sources
+        if sources is None:
+            # --- Unlinked Socket ---
+            # Register the default value; assume a consumer count of 1.
+            val = getattr(binding.socket, "value", None)
+            if val is None:
                 return None
-        
-        # --- Unlinked Socket ---
-        # Get the default value and register it with the manager to get an ID
-        val = get_value_from_socket(sock)
-        if val is not None:
-            # For unlinked sockets, assume a consumer count of 1
-            data_id = manager.register_data(val, initial_refcount=1)
-            print(f"eval_socket: Unlinked socket returning ID: {data_id} for value {val}")
-            return data_id
-        print("eval_socket: Unlinked socket returning None")
-        return None
+            return manager.register_data(val, initial_refcount=1)
+        if binding.multi:
+            # --- Multi-Input Socket --- always takes a mutable reference
+            values = []
+            for source in sources:
+                data_id = source_id(step, binding, source, True)
+                if data_id is not None:
+                    values.append(data_id)
+            return values
+        # --- Single-Input Socket ---
+        if not sources:
+            return None
+        data_id = source_id(step, binding, sources[0], binding.mutable,
+                            binding.mutable and getattr(step.node, "lazy_copy", False))
+        if data_id is not None and sources[0][3]:
+            # Handle list promotion (e.g., single item to list socket)
+            return [data_id]
+        return data_id
+
+    def input_signature(binding):
+        """Fingerprint the value feeding ``binding`` for cache validation."""
+        if binding.sources is None:
+            return _value_signature(getattr(binding.socket, "value", None))
+        return tuple(
+            (from_node.name, ident, signatures.get(from_node, {}).get(ident))
+            for from_node, _name, ident, _promote in binding.sources
+        )
+
+    def peek_inputs(step):
+        """Values feeding ``step`` by socket name, without taking references."""
+        values = {}
+        for binding in step.inputs:
+            if binding.sources is None:
+                values[binding.name] = getattr(binding.socket, "value", None)
+                continue
+            items = [resolve_id(source_data_id(source)) for source in binding.sources]
+            values[binding.name] = items if binding.multi else (items[0] if items else None)
+        return values
+
+    def release_inputs(step):
+        """Drop the references ``step`` holds without binding its inputs."""
+        for binding in step.inputs:
+            if not binding.sources or not (binding.multi or binding.mutable):
+                continue
+            for source in binding.sources if binding.multi else binding.sources[:1]:
+                data_id = source_data_id(source)
+                if data_id is not None:
+                    manager.decrement_ref_count(data_id)
 
-    def eval_node(node):
-        print(f"eval_node: Evaluating node {node.name} ({node.bl_idname})")
-        if node in resolved:
-            print(f"eval_node: Node {node.name} already resolved. Returning {resolved[node]}")
-            return resolved[node]
-        if node in evaluating:
-            # Circular dependency detected
-            print(f"eval_node: Circular dependency detected for node {node.name}")
-            return {s.name: None for s in node.outputs}
-
-        evaluating.add(node)
-        print(f"eval_node: Added {node.name} to evaluating set.")
-
-        # Special handling for Group Inputs
-        if getattr(node, "bl_idname", "") == "NodeGroupInput":
-            print(f"eval_node: Processing NodeGroupInput {node.name}")
-            outputs = {}
-            ctx = getattr(node.id_data, "fn_inputs", None)
-            for s in node.outputs:
-                key = getattr(s, "identifier", s.name)
-                val = ctx.get_input_value(s.name) if ctx else None
-                # Register the input value to get an ID with its consumer count
-                count = socket_consumer_counts.get((node.name, s.name), 1) # Use stable key
-                data_id = manager.register_data(val, initial_refcount=count)
-                outputs[key] = data_id
-                if key != s.name:
-                    outputs.setdefault(s.name, data_id)
-            resolved[node] = outputs
-            evaluating.discard(node)
-            print(f"eval_node: NodeGroupInput {node.name} resolved. Returning {outputs}")
-            return outputs
-
-        # Special handling for NodeGroupOutput (the output node of a group)
-        if getattr(node, "bl_idname", "") == "NodeGroupOutput":
-            print(f"eval_node: Processing NodeGroupOutput {node.name}")
-            outputs = {}
-            for s in node.inputs: # Iterate over inputs of NodeGroupOutput
-                key = getattr(s, "identifier", s.name)
-                val_id = eval_socket(s) # Evaluate the socket connected to this input
-                outputs[key] = val_id
-                if key != s.name:
-                    outputs.setdefault(s.name, val_id)
-            resolved[node] = outputs
-            evaluating.discard(node)
-            print(f"eval_node: NodeGroupOutput {node.name} resolved. Returning {outputs}")
-            return outputs
-
-        raw_inputs = {s.name: eval_socket(s) for s in node.inputs}
-        proc_inputs = {k: resolve_id(v) for k, v in raw_inputs.items()}
-        print(f"eval_node: Inputs for {node.name} (Data): {proc_inputs}")
-        
-        # 3. Process the data
-        outputs_data = {}
-        if hasattr(node, "process"):
-            print(f"eval_node: Calling process for {node.name}")
-            outputs_data = node.process(context, proc_inputs, manager) or {}
-            print(f"eval_node: Processed outputs for {node.name} (Data): {outputs_data}")
-
-        # 4. Register the output data with the manager
-        # This is the "wrapping" step
-        wrapped_outputs = {}
-        for s in node.outputs:
-            key = getattr(s, "identifier", s.name)
-            val = outputs_data.get(key)
-            
-            # Register the data and get a new ID
-            count = socket_consumer_counts.get((node.name, s.name), 1) # Use stable key
-            data_id = manager.register_data(val, initial_refcount=count)
-            wrapped_outputs[key] = data_id
-            
-            # Also handle the 'name' key if identifier is different
-            if key != s.name:
-                wrapped_outputs.setdefault(s.name, data_id)
-        resolved[node] = wrapped_outputs
-        evaluating.discard(node)
-        print(f"eval_node: Node {node.name} resolved. Returning IDs: {wrapped_outputs}")
-        return wrapped_outputs
+    def node_signature(step, inputs_signature):
+        state = getattr(step.node, "external_state", None)
+        if state is None:
+            return inputs_signature
+        return inputs_signature + (("STATE", state(peek_inputs(step))),)
+
+    def wrap_outputs(step, outputs_data, shared=()):
+        wrapped = {}
+        for ident, name, count in step.outputs:
+            value = outputs_data.get(ident)
+            if ident in shared:
+                data_id = manager.share_data(value, count)
+            else:
+                data_id = manager.register_data(value, initial_refcount=count)
+            wrapped[ident] = data_id
+            if ident != name:
+                wrapped.setdefault(name, data_id)
+        return wrapped
 
     # --- Main Evaluation Logic ---
+    group_outputs = {}
+    manager.begin_frame()
+    _evaluating.append((cache_key, incremental))
     try:
-        print("evaluate_tree: Starting main evaluation logic.")
-        # Traverse the tree from output nodes
-        visited = set()
-        def traverse(node):
-            if node in visited:
-                return
-            visited.add(node)
-            print(f"traverse: Visiting node {node.name}")
-            # Ensure dependencies are evaluated first
-            for sock in node.inputs:
-                if sock.is_linked and sock.links:
-                    for link in sock.links:
-                        traverse(link.from_node)
-            eval_node(node)
-
-        for node in tree.nodes:
-            if node.bl_idname in output_types:
-                print(f"evaluate_tree: Found output node {node.name}")
-                traverse(node)
+        plan = get_plan(tree)
+        log.debug("Running plan with %d steps", len(plan.steps))
+        for step in plan.steps:
+            node = step.node
+
+            if step.kind == "GROUP_INPUT":
+                ctx = getattr(node.id_data, "fn_inputs", None)
+                values = {}
+                for ident, name, _count in step.outputs:
+                    values[ident] = ctx.get_input_value(name) if ctx else None
+                resolved[node] = wrap_outputs(step, values)
+                signatures[node] = {k: _value_signature(v) for k, v in values.items()}
+                continue
+
+            if step.kind == "GROUP_OUTPUT":
+                outputs = {}
+                for binding in step.inputs:
+                    key = getattr(binding.socket, "identifier", binding.name)
+                    val_id = bind_input(step, binding)
+                    outputs[key] = val_id
+                    if key != binding.name:
+                        outputs.setdefault(binding.name, val_id)
+                resolved[node] = outputs
+                continue
+
+            if profile is not None:
+                started = time.perf_counter()
+            inputs_signature = tuple(input_signature(b) for b in step.inputs)
+            signature = node_signature(step, inputs_signature)
+            cached = previous_cache.get(step.name)
+            dirty = cached is not None and _dirty_nodes.get((tree_key, step.name), 0) > cached.serial
+            reuse = (
+                incremental
+                and cached is not None
+                and cached.signature == signature
+                and not dirty
+                and node.bl_idname not in _output_types
+                and not getattr(node, "always_evaluate", False)
+                and _is_alive(list(cached.outputs.values()))
+            )
+
+            shared = set()
+            if reuse:
+                log.debug("Reusing cached outputs for %s", step.name)
+                outputs_data = cached.outputs
+                output_signatures = cached.output_signatures
+                shared = cached.shared
+                if not cached.tracked:
+                    _record_reads(tree_key, step.name, list(peek_inputs(step).values()))
+            else:
+                pure = getattr(node, "pure", False)
+                memo_key = memo = None
+                if pure and incremental:
+                    # Key the memo on the values as they are upstream: a hit
+                    # must not bind the inputs, which may copy them.
+                    peeked = peek_inputs(step)
+                    memo_key = _memo_key(tree_key, step.name, peeked)
+                if memo_key is not None and not dirty:
+                    memo = _memo.get(memo_key)
+                    if memo is not None and not _is_alive(list(memo.values())):
+                        memo = None
+                if memo is not None:
+                    log.debug("Using memoized outputs for %s", step.name)
+                    _memo.move_to_end(memo_key)
+                    release_inputs(step)
+                    _record_reads(tree_key, step.name, list(peeked.values()))
+                    outputs_data = dict(memo)
+                    reuse = True
+                else:
+                    proc_inputs = {b.name: resolve_id(bind_input(step, b)) for b in step.inputs}
+                    # Change tracking only serves incremental passes.
+                    if incremental:
+                        _record_reads(tree_key, step.name, list(proc_inputs.values()))
+                    log.debug("Calling process for %s with %s", step.name, proc_inputs)
+                    outputs_data = {}
+                    if hasattr(node, "process"):
+                        outputs_data = node.process(context, proc_inputs, manager) or {}
+                for key, val in outputs_data.items():
+                    if type(val) is LazyCopy and not val.written:
+                        # Passed through unwritten: the shared datablock
+                        # keeps the references of its other consumers.
+                        shared.add(key)
+                    outputs_data[key] = unwrap(val)
+                if memo is None:
+                    if memo_key is not None:
+                        _memo_store(memo_key, outputs_data)
+                    elif not pure and incremental:
+                        _note_outputs_changed(list(outputs_data.values()), list(proc_inputs.values()))
+                _run_serial += 1
+                output_signatures = {}
+                for ident, _name, _count in step.outputs:
+                    val = outputs_data.get(ident)
+                    sig = _value_signature(val)
+                    if _contains_id(val):
+                        sig = (_run_serial, sig)
+                    output_signatures[ident] = sig
+                if memo is None:
+                    # Store the state as of after the run; a group's state
+                    # is read from the inner caches the run refreshed.
+                    signature = node_signature(step, inputs_signature)
+
+            resolved[node] = wrap_outputs(step, outputs_data, shared)
+            signatures[node] = output_signatures
+            new_cache[step.name] = NodeCacheEntry(
+                signature, outputs_data, output_signatures, shared, incremental)
+            if profile is not None:
+                profile.record_node(tree_name, node, time.perf_counter() - started, cached=reuse)
 
         # Handle final outputs for scenes to keep
         ctx = getattr(tree, "fn_inputs", None)
-        if ctx:
-            print("evaluate_tree: Processing fn_inputs context.")
-            # ctx.scenes_to_keep is now a CollectionProperty, so we don't need to check for None
-            for node in tree.nodes:
-                if getattr(node, "bl_idname", "") == "NodeGroupOutput":
-                    print(f"evaluate_tree: Processing NodeGroupOutput {node.name}")
-                    for sock in getattr(node, "inputs", []):
-                        stype = getattr(sock, "bl_idname", "")
-                        if stype not in {"FNSocketScene", "FNSocketSceneList"}:
-                            continue
-                        
-                        value_id = eval_socket(sock)
-                        if value_id is None:
-                            print(f"evaluate_tree: NodeGroupOutput socket {sock.name} has no value ID.")
-                            continue
-
-                        # Resolve the final data
-                        value_data = manager.get_data(value_id)
-                        print(f"evaluate_tree: NodeGroupOutput socket {sock.name} resolved to data: {value_data}")
-                        
-                        if stype in LIST_TO_SINGLE:
-                            scenes = value_data or []
-                        else:
-                            scenes = [value_data] if value_data is not None else []
-                        
-                        for sc_data in scenes:
-                            if sc_data:
-                                # Add scene to the collection
-                                new_ref = ctx.scenes_to_keep.add()
-                                new_ref.scene = sc_data
-                                print(f"evaluate_tree: Added scene {sc_data.name} to scenes_to_keep.")
+        group_output = plan.group_output
+        if group_output is not None:
+            group_outputs = resolved.get(group_output.node, {})
+        if ctx and group_output is not None:
+            outputs = group_outputs
+            for binding in group_output.inputs:
+                stype = getattr(binding.socket, "bl_idname", "")
+                if stype not in {"FNSocketScene", "FNSocketSceneList"}:
+                    continue
+
+                value_id = outputs.get(binding.name)
+                if value_id is None:
+                    continue
+
+                # Resolve the final data
+                value_data = resolve_id(value_id)
+                if isinstance(value_data, list):
+                    scenes = value_data
+                else:
+                    scenes = [value_data] if value_data is not None else []
+
+                for sc_data in scenes:
+                    if sc_data:
+                        # Add scene to the collection
+                        new_ref = ctx.scenes_to_keep.add()
+                        new_ref.scene = sc_data
+                        log.debug("Added scene %s to scenes_to_keep", sc_data.name)
     finally:
-        # Crucial step: Clean up all the created copies
-        
-        manager.cleanup()
\ No newline at end of file
+        _evaluating.pop()
+        _eval_cache[cache_key] = new_cache
+        if incremental:
+            _own_writes.update(manager.written)
+        else:
+            # Change counters were not bumped, so memo entries may be stale.
+            _memo.clear()
+        # Crucial step: clean up the created copies once the outermost
+        # evaluation finishes
+        if manager.end_frame():
+            for pointer in manager.last_removed:
+                _bump_pointer(pointer)
+                _consumers.pop(pointer, None)
+    return group_outputs
+
+
+@persistent_handler
+def _reset_caches(*_args):
+    # Undo and file loads free the structs cached plans and results point to.
+    invalidate()
+
+
+@persistent_handler
+def _depsgraph_update(_scene, depsgraph=None):
+    # Edits made outside File Nodes (viewport, properties editor) only
+    # invalidate the nodes reading the edited datablocks, then queue an
+    # auto-evaluation of the trees owning them.
+    flagged = ()
+    if _consumers and depsgraph is not None:
+        flagged = _flag_consumers(update.id for update in depsgraph.updates)
+    _own_writes.clear()
+    if flagged:
+        keys = {key for key, _name in flagged}
+        trees = [t for t in bpy.data.node_groups if _tree_key(t) in keys]
+        from .operators import schedule_auto_evaluate  # operators imports this module
+        schedule_auto_evaluate(trees)
+
+
+def register():
+    add_handler(_reset_caches)
+    add_handler(_depsgraph_update, ("depsgraph_update_post",))
+
+
+def unregister():
+    remove_handler(_depsgraph_update, ("depsgraph_update_post",))
+    remove_handler(_reset_caches)
+    invalidate()
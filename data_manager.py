@@ -1,6 +1,74 @@
+import logging
+
 import bpy
 import uuid
 from . import uuid_manager
+from .lazy_copy import LazyCopy, unwrap
+
+log = logging.getLogger(__name__)
+
+# bpy.types name -> bpy.data collection for every ID type a socket can carry.
+# Used to remove copies one by one when bpy.data.batch_remove is unavailable
+# or rejects the batch.
+_ID_COLLECTIONS = (
+    ("Scene", "scenes"),
+    ("Object", "objects"),
+    ("Collection", "collections"),
+    ("World", "worlds"),
+    ("Camera", "cameras"),
+    ("Image", "images"),
+    ("Light", "lights"),
+    ("Material", "materials"),
+    ("Mesh", "meshes"),
+    ("NodeTree", "node_groups"),
+    ("Text", "texts"),
+    ("WorkSpace", "workspaces"),
+)
+
+# Python type -> collection name (None when not removable), filled on demand
+# so subclasses such as custom node trees resolve through isinstance once.
+_collection_by_type = {}
+
+
+def _collection_for(data):
+    cls = type(data)
+    try:
+        return _collection_by_type[cls]
+    except KeyError:
+        pass
+    name = None
+    for type_name, collection in _ID_COLLECTIONS:
+        id_type = getattr(bpy.types, type_name, None)
+        if id_type is not None and isinstance(data, id_type):
+            name = collection
+            break
+    _collection_by_type[cls] = name
+    return name
+
+
+def _remove_each(orphans):
+    for collection, data in orphans:
+        data_name = getattr(data, "name", data)
+        try:
+            getattr(bpy.data, collection).remove(data)
+            log.debug("Removed %s", data_name)
+        except (ReferenceError, RuntimeError, TypeError) as e:
+            log.warning("Error removing %s: %s", data_name, e)
+
+
+def remove_datablocks(orphans):
+    """Delete ``(collection, datablock)`` pairs, in one batch when possible."""
+    if not orphans:
+        return
+    batch_remove = getattr(bpy.data, "batch_remove", None)
+    if batch_remove is not None:
+        try:
+            batch_remove([data for _collection, data in orphans])
+            log.debug("Batch removed %d datablocks", len(orphans))
+            return
+        except (ReferenceError, RuntimeError, TypeError) as e:
+            log.debug("Batch removal failed (%s), removing one by one", e)
+    _remove_each(orphans)
 
 class DataManager:
     """
@@ -15,7 +83,61 @@ class DataManager:
         self._ref_counts = {}
         # A set to track which IDs correspond to copies created by the manager.
         self._owned_copies = set()
-        print("DataManager: Initialized")
+        # Optional profiler.EvaluationProfile shared by nested evaluations.
+        self.profile = None
+        # Maps id() of registered data to its ID. The store keeps a reference
+        # to every registered object, so an id() cannot be recycled while its
+        # entry is alive; the identity check below guards stale entries.
+        self._identity_index = {}
+        # Number of open evaluation frames. Group nodes evaluate their tree
+        # inside the caller's frame, so only the outermost frame cleans up.
+        self._frame_depth = 0
+        # Lazy copy-on-write statistics, kept across cleanups so they cover
+        # a whole evaluation run.
+        self.copies_deferred = 0
+        self.copies_materialized = 0
+        # consumer (tree, node, socket) -> True once it wrote to its proxy.
+        self.lazy_consumers = {}
+        self._lazy_copies = []
+        # Property writes made and skipped as no-ops by property nodes.
+        self.writes_made = 0
+        self.writes_skipped = 0
+        # Pointers of the datablocks removed by the last cleanup; Blender may
+        # reuse them for new datablocks.
+        self.last_removed = []
+        # (collection, datablock) pairs handed back by nodes via release().
+        self._released = []
+        # Pointers of the datablocks evaluation copied or wrote properties
+        # on. The engine ignores depsgraph updates for them as its own.
+        self.written = set()
+
+    def begin_frame(self):
+        """Open an evaluation frame; frames nest for group evaluations."""
+        self._frame_depth += 1
+
+    def end_frame(self):
+        """Close a frame, running :meth:`cleanup` when it was the outermost one.
+
+        Returns True if cleanup ran.
+        """
+        if self._frame_depth <= 0:
+            log.warning("end_frame called without a matching begin_frame")
+            self._frame_depth = 0
+        else:
+            self._frame_depth -= 1
+        if self._frame_depth:
+            return False
+        self.cleanup()
+        return True
+
+    @property
+    def frame_depth(self):
+        return self._frame_depth
+
+    @property
+    def copies_avoided(self):
+        """Lazy copies whose consumer never wrote, so no copy() was made."""
+        return self.copies_deferred - self.copies_materialized
 
     def register_data(self, data, initial_refcount=1):
         """
@@ -23,56 +145,115 @@ class DataManager:
         'initial_refcount' specifies the initial number of consumers for this data.
         """
         # Check if this exact data object is already managed
-        for existing_id, existing_data in self._data_store.items():
-            if existing_data is data: # Use 'is' for identity check
-                # If already managed, SET its refcount to the new initial_refcount
-                # This handles cases where a datablock is modified in-place and then re-outputted.
-                self._ref_counts[existing_id] = initial_refcount
-                print(f"DataManager: Re-registered existing data {data} with ID {existing_id}. Set refcount to: {self._ref_counts[existing_id]}")
-                return existing_id
+        existing_id = self._identity_index.get(id(data))
+        if existing_id is not None and self._data_store.get(existing_id) is data:
+            # If already managed, SET its refcount to the new initial_refcount
+            # This handles cases where a datablock is modified in-place and then re-outputted.
+            self._ref_counts[existing_id] = initial_refcount
+            log.debug("Re-registered existing data %s with ID %s, refcount set to %d", data, existing_id, initial_refcount)
+            return existing_id
 
         new_id = str(uuid.uuid4())
         self._data_store[new_id] = data
         self._ref_counts[new_id] = initial_refcount
-        print(f"DataManager: Registered new data {data} with ID {new_id} (initial refcount: {initial_refcount})")
+        self._identity_index[id(data)] = new_id
+        log.debug("Registered new data %s with ID %s (initial refcount: %d)", data, new_id, initial_refcount)
         return new_id
 
     def get_data(self, data_id):
         """Retrieves the datablock associated with a given ID."""
-        data = self._data_store.get(data_id)
-        print(f"DataManager: Retrieved data for ID {data_id}: {data}")
-        return data
+        return self._data_store.get(data_id)
+
+    def resolve(self, data_id):
+        """Like get_data, but also resolves (nested) lists of IDs."""
+        if isinstance(data_id, list):
+            return [self.resolve(d) for d in data_id]
+        return self._data_store.get(data_id)
 
     def decrement_ref_count(self, data_id):
         """Decrements the reference count for a given data ID."""
         if data_id in self._ref_counts:
             self._ref_counts[data_id] -= 1
-            print(f"DataManager: Decremented refcount for ID {data_id} to {self._ref_counts[data_id]}")
+            log.debug("Decremented refcount for ID %s to %d", data_id, self._ref_counts[data_id])
             if self._ref_counts[data_id] < 0:
-                print(f"DataManager: WARNING: Refcount for ID {data_id} went negative!")
+                log.warning("Refcount for ID %s went negative", data_id)
+
+    def record_writes(self, written, skipped, target=None):
+        """Count property writes reported by nodes.base.assign_properties.
+
+        ``target`` is the struct the writes went to; its datablock is added
+        to :attr:`written`.
+        """
+        self.writes_made += written
+        self.writes_skipped += skipped
+        if written and target is not None:
+            self._note_written(unwrap(target))
+        if self.profile is not None:
+            self.profile.record_writes(written, skipped)
+
+    def _note_written(self, data):
+        # Nested structs report the datablock they belong to.
+        data = getattr(data, "id_data", None) or data
+        try:
+            self.written.add(data.as_pointer())
+        except (AttributeError, ReferenceError):
+            pass
 
-    def request_mutable_data(self, data_id):
+    def release(self, orphans):
+        """Queue ``(collection, datablock)`` pairs a node no longer outputs.
+
+        Unlike copies, they are removed by the next :meth:`cleanup` whatever
+        their user count, and their pointers are reported in ``last_removed``.
+        """
+        self._released.extend(orphans)
+
+    def share_data(self, data, consumers):
+        """Add ``consumers`` references to ``data``, registering it if needed.
+
+        Unlike register_data, which resets the count, this keeps the
+        references other consumers still hold, e.g. when a node passes an
+        unwritten lazy copy's shared datablock downstream.
+        """
+        existing_id = self._identity_index.get(id(data))
+        if existing_id is not None and self._data_store.get(existing_id) is data:
+            self._ref_counts[existing_id] += consumers
+            return existing_id
+        return self.register_data(data, initial_refcount=consumers)
+
+    def request_mutable_data(self, data_id, lazy=False, consumer=None):
         """
         Requests a mutable version of a datablock.
         If the data is shared (ref_count > 1), it creates a copy and returns
         a new ID for the copy. Otherwise, it returns the original ID.
+        With ``lazy`` the new ID holds a LazyCopy that only copies the
+        datablock when ``consumer`` first writes to it.
         """
         if data_id not in self._ref_counts:
-            print(f"DataManager: ID {data_id} not managed. Returning original.")
+            log.debug("ID %s not managed, returning original", data_id)
             return data_id # Not a managed datablock
 
         if self._ref_counts[data_id] > 1:
             # It's shared, so we need to copy it.
             original_data = self._data_store[data_id]
-            print(f"DataManager: Requesting mutable copy for ID {data_id} (refcount: {self._ref_counts[data_id]}). Original data: {original_data}")
+            if lazy and hasattr(original_data, "copy") and hasattr(original_data, "as_pointer"):
+                proxy = LazyCopy(self, original_data, consumer)
+                self._lazy_copies.append(proxy)
+                self.copies_deferred += 1
+                self.lazy_consumers.setdefault(consumer, False)
+                new_id = self.register_data(proxy, initial_refcount=1)
+                self.decrement_ref_count(data_id)
+                log.debug("Deferred copy of %s for %s", original_data, consumer)
+                return new_id
+
+            log.debug("Copying shared data %s for ID %s (refcount: %d)", original_data, data_id, self._ref_counts[data_id])
             
             # Attempt to copy the datablock
             try:
                 new_data = original_data.copy()
-                print(f"DataManager: Created copy: {new_data}")
+                log.debug("Created copy: %s", new_data)
             except AttributeError: # Not a Blender datablock, maybe a list or other type
                 new_data = original_data
-                print(f"DataManager: Data is not copyable, using original: {new_data}")
+                log.debug("Data is not copyable, using original: %s", new_data)
             
             # Register the new copy with an initial refcount of 1 (it's a new, unique instance)
             new_id = self.register_data(new_data, initial_refcount=1)
@@ -80,7 +261,8 @@ class DataManager:
             # Mark it as a copy owned by the manager for later cleanup
             if hasattr(new_data, "as_pointer"):
                 self._owned_copies.add(new_id)
-                print(f"DataManager: Marked new ID {new_id} as owned copy.")
+                self._note_written(new_data)
+                log.debug("Marked new ID %s as owned copy", new_id)
 
             # Decrement the ref count of the original data, as one consumer is now using the copy
             self.decrement_ref_count(data_id)
@@ -88,69 +270,88 @@ class DataManager:
             return new_id
         
         # Not shared, safe to mutate directly.
-        print(f"DataManager: ID {data_id} is unique (refcount: {self._ref_counts[data_id]}). Returning original ID.")
+        log.debug("ID %s is unique (refcount: %d), returning original", data_id, self._ref_counts[data_id])
         return data_id
 
+    def _materialize(self, proxy):
+        """Make the real copy behind ``proxy``; called on its first write."""
+        new_data = proxy.source.copy()
+        new_id = self.register_data(new_data, initial_refcount=1)
+        self._owned_copies.add(new_id)
+        self._note_written(new_data)
+        self.copies_materialized += 1
+        self.lazy_consumers[proxy.consumer] = True
+        log.debug("Materialized lazy copy %s for %s", new_data, proxy.consumer)
+        if self.profile is not None and proxy.consumer is not None:
+            self.profile.record_copy(*proxy.consumer, new_data)
+        return new_data
+
     def cleanup(self):
         """
         Removes all datablock copies created by the manager during evaluation.
         This is the explicit garbage collection step.
         """
-        print("DataManager: Starting cleanup...")
-
-        # Import FileNodesTree here to avoid circular dependency
-        from .tree import FileNodesTree
+        log.debug("Starting cleanup")
 
-        # Collect all UUIDs that are currently managed by active node trees
-        active_uuids = set()
-        for node_tree in bpy.data.node_groups:
-            if isinstance(node_tree, FileNodesTree):
-                for item in node_tree.fn_state_map:
-                    active_uuids.add(item.datablock_uuid)
+        # UUIDs of datablocks owned by a node through a tree's state map
+        active_uuids = uuid_manager.managed_uuids()
 
-        for data_id in list(self._owned_copies): # Iterate over a copy to allow modification
+        orphans = []
+        counts = {}
+        for data_id in self._owned_copies:
             data = self._data_store.get(data_id)
-            
+            try:
+                alive = data is not None and hasattr(data, "as_pointer") and bool(data.as_pointer())
+            except ReferenceError:  # Already removed, e.g. by a node
+                continue
+            if not alive:
+                log.debug("Keeping data %s with ID %s", data, data_id)
+                continue
+
             # If the datablock is managed by an active node tree, do not remove it
             if uuid_manager.get_uuid(data) in active_uuids:
-                print(f"DataManager: Not cleaning up managed datablock {data.name} with ID {data_id}.")
+                log.debug("Keeping managed datablock %s with ID %s", data.name, data_id)
                 continue
 
             # IMPORTANT: Do not remove if it's a scene with use_extra_user set
             if isinstance(data, bpy.types.Scene) and getattr(data, "use_extra_user", False):
-                print(f"DataManager: Not cleaning up scene {data.name} with use_extra_user set.")
+                log.debug("Keeping scene %s with use_extra_user set", data.name)
+                continue
+
+            orphaned = data.users == 0
+            if not orphaned:
+                log.debug("Keeping data %s with ID %s (users: %s)", data, data_id, getattr(data, "users", "N/A"))
                 continue
+            collection = _collection_for(data)
+            if collection is None:
+                log.debug("No bpy.data collection for %s, leaving it", data)
+                continue
+            orphans.append((collection, data))
+            counts[collection] = counts.get(collection, 0) + 1
+
+        for collection, data in self._released:
+            try:
+                data.as_pointer()
+            except ReferenceError:  # Already removed
+                continue
+            orphans.append((collection, data))
+            counts[collection] = counts.get(collection, 0) + 1
+        self._released.clear()
+
+        self.written.clear()
+        self.last_removed = [data.as_pointer() for _collection, data in orphans]
+        if orphans:
+            log.debug("Removing orphaned copies: %s", counts)
+            remove_datablocks(orphans)
 
-            if data and hasattr(data, "as_pointer") and data.users == 0:
-                data_name = data.name # Store name before removal
-                print(f"DataManager: Cleaning up data {data_name} with ID {data_id} (users: {data.users})")
-                try:
-                    # Check the correct bpy.data collection to remove from
-                    if isinstance(data, bpy.types.Scene):
-                        bpy.data.scenes.remove(data)
-                    elif isinstance(data, bpy.types.Object):
-                        bpy.data.objects.remove(data)
-                    elif isinstance(data, bpy.types.Collection):
-                        bpy.data.collections.remove(data)
-                    elif isinstance(data, bpy.types.Material):
-                        bpy.data.materials.remove(data)
-                    elif isinstance(data, bpy.types.Mesh):
-                        bpy.data.meshes.remove(data)
-                    elif isinstance(data, bpy.types.Camera):
-                        bpy.data.cameras.remove(data)
-                    elif isinstance(data, bpy.types.Light):
-                        bpy.data.lights.remove(data)
-                    elif isinstance(data, bpy.types.World):
-                        bpy.data.worlds.remove(data)
-                    # Add other datablock types as needed
-                    print(f"DataManager: Successfully removed {data_name}")
-                except (ReferenceError, RuntimeError) as e:
-                    print(f"DataManager: Error removing {data_name}: {e}")
-                    pass
-            else:
-                print(f"DataManager: Not cleaning up data {data} with ID {data_id} (users: {getattr(data, 'users', 'N/A')})")
+        if self.profile is not None:
+            for proxy in self._lazy_copies:
+                if not proxy.written and proxy.consumer is not None:
+                    self.profile.record_avoided(*proxy.consumer)
+        self._lazy_copies.clear()
 
         self._data_store.clear()
         self._ref_counts.clear()
         self._owned_copies.clear()
+        self._identity_index.clear()
         
@@ -0,0 +1,198 @@
+"""Copy-on-write proxies that copy a shared datablock on its first write.
+
+``DataManager.request_mutable_data(..., lazy=True)`` hands nodes a
+:class:`LazyCopy` instead of an eager ``copy()``. Reads go to the shared
+datablock; the first assignment (to an attribute, a nested struct such as
+``scene.render`` or an item) asks the manager for the real copy and every
+later access goes to it. Assigning the value a property already has is not
+a write. Calling a method materializes the copy too, since the proxy cannot
+tell which methods mutate, except for the lookups in ``_READ_ONLY_METHODS``.
+
+Proxies are opt-in per node (``FNBaseNode.lazy_copy``): they are not RNA
+structs, so they must not be passed to Blender API calls that expect one.
+"""
+
+_PLAIN = (bool, int, float, str, bytes, type(None))
+# RNA methods that only read and can run on the shared datablock.
+_READ_ONLY_METHODS = frozenset((
+    "as_pointer", "get", "keys", "values", "items", "find",
+    "is_property_set", "is_property_readonly", "path_from_id",
+))
+
+
+def _resolve(obj, path):
+    for is_item, key in path:
+        obj = obj[key] if is_item else getattr(obj, key)
+    return obj
+
+
+def unwrap(value):
+    """Return the datablock behind ``value`` (also inside lists)."""
+    if isinstance(value, list):
+        return [unwrap(v) for v in value]
+    if type(value) is LazyCopy:
+        return value.target
+    if type(value) is _LazyStruct:
+        return _resolve(value._fn_root.target, value._fn_path)
+    return value
+
+
+def _same(current, value):
+    try:
+        return bool(current == value)
+    except Exception:
+        return False
+
+
+class LazyCopy:
+    """Stands in for a shared datablock until a node writes to it."""
+
+    __slots__ = ("_fn_manager", "_fn_source", "_fn_copy", "consumer")
+
+    def __init__(self, manager, source, consumer=None):
+        object.__setattr__(self, "_fn_manager", manager)
+        object.__setattr__(self, "_fn_source", source)
+        object.__setattr__(self, "_fn_copy", None)
+        # (tree name, node name, socket name) of the node holding the proxy.
+        object.__setattr__(self, "consumer", consumer)
+
+    @property
+    def source(self):
+        return self._fn_source
+
+    @property
+    def target(self):
+        """The copy once written, the shared datablock before."""
+        copy = self._fn_copy
+        return self._fn_source if copy is None else copy
+
+    @property
+    def written(self):
+        return self._fn_copy is not None
+
+    def materialize(self):
+        copy = self._fn_copy
+        if copy is None:
+            copy = self._fn_manager._materialize(self)
+            object.__setattr__(self, "_fn_copy", copy)
+        return copy
+
+    # isinstance(proxy, bpy.types.Scene) keeps working in node code.
+    @property
+    def __class__(self):
+        return type(self.target)
+
+    def __getattr__(self, name):
+        return _wrap(self, ((False, name),), getattr(self.target, name))
+
+    def __setattr__(self, name, value):
+        _write(self, (), False, name, value)
+
+    def __delattr__(self, name):
+        delattr(self.materialize(), name)
+
+    def __getitem__(self, key):
+        return _wrap(self, ((True, key),), self.target[key])
+
+    def __setitem__(self, key, value):
+        _write(self, (), True, key, value)
+
+    def __delitem__(self, key):
+        del self.materialize()[key]
+
+    def __contains__(self, key):
+        return key in self.target
+
+    def __bool__(self):
+        return bool(self.target)
+
+    def __eq__(self, other):
+        return self.target == unwrap(other)
+
+    def __hash__(self):
+        return hash(self.target)
+
+    def __repr__(self):
+        state = "written" if self.written else "shared"
+        return f"<LazyCopy {state} {self.target!r}>"
+
+
+class _LazyStruct:
+    """A nested struct (``scene.render``) reached through a LazyCopy."""
+
+    __slots__ = ("_fn_root", "_fn_path")
+
+    def __init__(self, root, path):
+        object.__setattr__(self, "_fn_root", root)
+        object.__setattr__(self, "_fn_path", path)
+
+    def _fn_target(self):
+        return _resolve(self._fn_root.target, self._fn_path)
+
+    def __getattr__(self, name):
+        return _wrap(self._fn_root, self._fn_path + ((False, name),), getattr(self._fn_target(), name))
+
+    def __setattr__(self, name, value):
+        _write(self._fn_root, self._fn_path, False, name, value)
+
+    def __getitem__(self, key):
+        return _wrap(self._fn_root, self._fn_path + ((True, key),), self._fn_target()[key])
+
+    def __setitem__(self, key, value):
+        _write(self._fn_root, self._fn_path, True, key, value)
+
+    def __delitem__(self, key):
+        self._fn_root.materialize()
+        del self._fn_target()[key]
+
+    def __iter__(self):
+        return iter(self._fn_target())
+
+    def __len__(self):
+        return len(self._fn_target())
+
+    def __contains__(self, key):
+        return key in self._fn_target()
+
+    def __bool__(self):
+        return bool(self._fn_target())
+
+    def __eq__(self, other):
+        return self._fn_target() == unwrap(other)
+
+    def __hash__(self):
+        return hash(self._fn_target())
+
+    def __repr__(self):
+        return repr(self._fn_target())
+
+
+def _wrap(root, path, value):
+    if isinstance(value, _PLAIN):
+        return value
+    if callable(value):
+        if path[-1][1] in _READ_ONLY_METHODS and not path[-1][0]:
+            return value
+        # Other methods may mutate; run them on the copy.
+        root.materialize()
+        return _resolve(root.target, path)
+    return _LazyStruct(root, path)
+
+
+def _write(root, path, is_item, key, value):
+    value = unwrap(value)
+    owner = _resolve(root.target, path)
+    if not root.written:
+        try:
+            current = owner[key] if is_item else getattr(owner, key)
+        except (AttributeError, KeyError, IndexError, TypeError):
+            pass
+        else:
+            if _same(current, value):
+                return
+        root.materialize()
+        owner = _resolve(root.target, path)
+    if is_item:
+        owner[key] = value
+    else:
+        setattr(owner, key, value)
@@ -9,6 +9,8 @@ categories = [
     ]),
     NodeCategory('FILE_NODES_FILE', 'File', items=[
         NodeItem('FNReadBlendNode'),
+        NodeItem('FNReadBlendNamesNode'),
+        NodeItem('FNReadBlendFilesNode'),
         NodeItem('FNImportAlembicNode'),
     ]),
     NodeCategory('FILE_NODES_LIST', 'Utils', items=[
@@ -1,7 +1,78 @@
 """Base mixins and helpers used by node implementations."""
 
+import logging
+import math
+
 import bpy
 
+log = logging.getLogger(__name__)
+
+
+def _same_value(current, value):
+    """Compare an RNA value with the one about to be written.
+
+    Float properties are stored in single precision, so floats (and float
+    vectors) are compared with a tolerance instead of exactly.
+    """
+    if isinstance(value, float) or isinstance(current, float):
+        try:
+            return math.isclose(float(current), float(value), rel_tol=1e-6, abs_tol=1e-7)
+        except (TypeError, ValueError):
+            return False
+    if isinstance(value, (tuple, list)):
+        try:
+            current = tuple(current)
+        except TypeError:
+            return False
+        return len(current) == len(value) and all(
+            _same_value(c, v) for c, v in zip(current, value)
+        )
+    try:
+        return bool(current == value)
+    except Exception:
+        return False
+
+
+def assign_properties(target, values, manager=None):
+    """Assign ``values`` ({"path": value}) on ``target``, skipping no-op writes.
+
+    Paths may be dotted (``"render.resolution_x"``). Every value is compared
+    first and only the changed ones are then written together, so evaluating
+    an unchanged tree does not tag the depsgraph. A failing write is logged
+    and skipped without stopping the others. The written and skipped counts
+    are reported to ``manager`` together with ``target``, and the number of
+    writes is returned.
+    """
+    pending = []
+    skipped = 0
+    for path, value in values.items():
+        *parents, name = path.split(".")
+        try:
+            owner = target
+            for part in parents:
+                owner = getattr(owner, part)
+            current = getattr(owner, name)
+        except AttributeError:
+            log.debug("%s has no property %s", target, path)
+            continue
+        if _same_value(current, value):
+            skipped += 1
+        else:
+            pending.append((owner, name, path, value))
+
+    written = 0
+    for owner, name, path, value in pending:
+        try:
+            setattr(owner, name, value)
+            written += 1
+        except Exception as e:
+            log.debug("Could not set %s on %s: %s", path, target, e)
+
+    record = getattr(manager, "record_writes", None)
+    if record is not None:
+        record(written, skipped, target)
+    return written
+
 
 class FNCacheIDMixin:
     """Mixin to cache a created datablock ID based on a key."""
@@ -25,6 +96,19 @@ class FNCacheIDMixin:
 class FNBaseNode:
     '''Mixin to add a .process(context, inputs) stub'''
     bl_width_default = 160
+    # Nodes with effects outside their outputs opt out of incremental reuse.
+    always_evaluate = False
+    # Nodes that only assign properties on their mutable inputs get lazy
+    # copies, which are copied on the first real write (see lazy_copy.py).
+    lazy_copy = False
+    # Nodes whose outputs depend only on their inputs are memoized by input
+    # value, so earlier input combinations are not evaluated again.
+    pure = False
+    # Nodes reading something besides their inputs, such as a file on disk,
+    # define external_state(inputs) returning a hashable fingerprint of it
+    # (e.g. the file's mtime and size). It is part of the node's input
+    # signature, so incremental passes re-run the node when it changes.
+    external_state = None
     def process(self, context, inputs):
         return {}
 
@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketCamera, FNSocketFloat
 
 
@@ -12,6 +12,7 @@ class FNCameraProps(Node, FNBaseNode):
     """Set camera properties such as focal length."""
     bl_idname = "FNCameraProps"
     bl_label = "Camera Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNCameraProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         cam = inputs.get("Camera")
         if cam:
-            lens = inputs.get("Focal Length")
-            try:
-                cam.lens = lens
-            except Exception:
-                pass
+            assign_properties(cam, {"lens": inputs.get("Focal Length")}, manager)
         return {"Camera": cam}
 
 
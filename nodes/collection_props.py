@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketCollection, FNSocketBool
 
 
@@ -12,6 +12,7 @@ class FNCollectionProps(Node, FNBaseNode):
     """Set collection options such as visibility."""
     bl_idname = "FNCollectionProps"
     bl_label = "Collection Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNCollectionProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         coll = inputs.get("Collection")
         if coll:
-            hide_vp = inputs.get("Hide Viewport")
-            try:
-                coll.hide_viewport = hide_vp
-            except Exception:
-                pass
+            assign_properties(coll, {"hide_viewport": inputs.get("Hide Viewport")}, manager)
         return {"Collection": coll}
 
 
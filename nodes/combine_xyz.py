@@ -11,6 +11,7 @@ class FNCombineXYZ(Node, FNBaseNode):
     """Combine separate X, Y and Z inputs into a vector."""
     bl_idname = "FNCombineXYZ"
     bl_label = "Combine XYZ"
+    pure = True
 
     def init(self, context):
         self.inputs.new('FNSocketFloat', "X")
@@ -48,6 +48,7 @@ class FNCreateList(Node, FNBaseNode):
     """Create a list from several inputs of the chosen type."""
     bl_idname = "FNCreateList"
     bl_label = "Create List"
+    pure = True
 
 
 
@@ -81,7 +82,7 @@ class FNCreateList(Node, FNBaseNode):
 
     def update_type(self, context):
         self._update_sockets(context)
-        auto_evaluate_if_enabled(context)
+        auto_evaluate_if_enabled(self, context)
 
     def _update_sockets(self, context=None):
         while self.inputs:
@@ -98,7 +99,7 @@ class FNCreateList(Node, FNBaseNode):
         out = self.outputs.new(lst, f"{name}s")
         out.display_shape = 'SQUARE'
         if context is not None:
-            auto_evaluate_if_enabled(context)
+            auto_evaluate_if_enabled(self, context)
 
     def init(self, context):
         self._update_sockets(context)
@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketObject, FNSocketBool
 
 
@@ -12,6 +12,7 @@ class FNCyclesObjectProps(Node, FNBaseNode):
     """Set Cycles render properties for an object."""
     bl_idname = "FNCyclesObjectProps"
     bl_label = "Cycles Object Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNCyclesObjectProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         obj = inputs.get("Object")
         if obj:
-            holdout = inputs.get("Holdout")
-            try:
-                obj.is_holdout = holdout
-            except Exception:
-                pass
+            assign_properties(obj, {"is_holdout": inputs.get("Holdout")}, manager)
         return {"Object": obj}
 
 
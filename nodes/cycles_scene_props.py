@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketScene, FNSocketInt
 
 
@@ -12,6 +12,7 @@ class FNCyclesSceneProps(Node, FNBaseNode):
     """Configure Cycles rendering options for a scene."""
     bl_idname = "FNCyclesSceneProps"
     bl_label = "Cycles Scene Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNCyclesSceneProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         scene = inputs.get("Scene")
         if scene and hasattr(scene, "cycles"):
-            samples = inputs.get("Samples")
-            try:
-                scene.cycles.samples = samples
-            except Exception:
-                pass
+            assign_properties(scene, {"cycles.samples": inputs.get("Samples")}, manager)
         return {"Scene": scene}
 
 
@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketObject, FNSocketBool
 
 
@@ -12,6 +12,7 @@ class FNEeveeObjectProps(Node, FNBaseNode):
     """Set Eevee properties on an object."""
     bl_idname = "FNEeveeObjectProps"
     bl_label = "Eevee Object Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNEeveeObjectProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         obj = inputs.get("Object")
         if obj:
-            shadow = inputs.get("Visible Shadow")
-            try:
-                obj.visible_shadow = shadow
-            except Exception:
-                pass
+            assign_properties(obj, {"visible_shadow": inputs.get("Visible Shadow")}, manager)
         return {"Object": obj}
 
 
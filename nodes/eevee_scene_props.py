@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketScene, FNSocketInt
 
 
@@ -12,6 +12,7 @@ class FNEeveeSceneProps(Node, FNBaseNode):
     """Adjust Eevee render samples for a scene."""
     bl_idname = "FNEeveeSceneProps"
     bl_label = "Eevee Scene Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNEeveeSceneProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         scene = inputs.get("Scene")
         if scene and hasattr(scene, "eevee"):
-            samples = inputs.get("Samples")
-            try:
-                scene.eevee.taa_render_samples = samples
-            except Exception:
-                pass
+            assign_properties(scene, {"eevee.taa_render_samples": inputs.get("Samples")}, manager)
         return {"Scene": scene}
 
 
@@ -10,6 +10,7 @@ class FNExecLogic(Node, FNBaseNode):
     """Logic operations on execution sockets."""
     bl_idname = "FNExecLogic"
     bl_label = "Execution Logic"
+    pure = True
 
     op: bpy.props.EnumProperty(
         name="Operation",
@@ -35,7 +36,7 @@ class FNExecLogic(Node, FNBaseNode):
             self.inputs.new('FNSocketExec', f"Exec {i}")
         self.outputs.new('FNSocketExec', 'Exec')
         if context is not None:
-            auto_evaluate_if_enabled(context)
+            auto_evaluate_if_enabled(self, context)
 
     def init(self, context):
         self._update_sockets(context)
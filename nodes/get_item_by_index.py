@@ -48,6 +48,7 @@ class FNGetItemByIndex(Node, FNBaseNode):
     """Output the item at the given index from an input list."""
     bl_idname = "FNGetItemByIndex"
     bl_label = "Get Item by Index"
+    pure = True
 
     data_type: bpy.props.EnumProperty(
         name="Type",
@@ -74,7 +75,7 @@ class FNGetItemByIndex(Node, FNBaseNode):
 
     def update_type(self, context):
         self.update_sockets()
-        auto_evaluate_if_enabled(context)
+        auto_evaluate_if_enabled(self, context)
 
     def update_sockets(self):
         while self.inputs:
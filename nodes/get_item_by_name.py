@@ -48,6 +48,7 @@ class FNGetItemByName(Node, FNBaseNode):
     """Output the item matching a given name from a list."""
     bl_idname = "FNGetItemByName"
     bl_label = "Get Item by Name"
+    pure = True
 
     data_type: bpy.props.EnumProperty(
         name="Type",
@@ -73,7 +74,7 @@ class FNGetItemByName(Node, FNBaseNode):
 
     def update_type(self, context):
         self.update_sockets()
-        auto_evaluate_if_enabled(context)
+        auto_evaluate_if_enabled(self, context)
 
     def update_sockets(self):
         while self.inputs:
@@ -104,7 +104,7 @@ class FNGetItemInList(Node, FNBaseNode):
 
     def update_type(self, context):
         self.update_sockets(self.output_mode == 'SINGLE')
-        auto_evaluate_if_enabled(context)
+        auto_evaluate_if_enabled(self, context)
 
     def update_sockets(self, single_output):
         while self.inputs:
@@ -4,7 +4,7 @@ import bpy
 from bpy.types import NodeCustomGroup
 from .. import operators
 from ..common import LIST_TO_SINGLE
-from ..cow_engine import evaluate_tree as cow_evaluate_tree
+from ..cow_engine import evaluate_group, group_state
 from .base import FNBaseNode
 
 
@@ -32,7 +32,7 @@ class FNGroupNode(NodeCustomGroup, FNBaseNode):
         tree_changed = getattr(self, "_cached_tree", None) is not self.node_tree
         sockets_changed = self._sync_sockets()
         if tree_changed or sockets_changed:
-            operators.auto_evaluate_if_enabled(context=bpy.context)
+            operators.auto_evaluate_if_enabled(self, bpy.context)
         self._cached_tree = self.node_tree
 
     def _sync_sockets(self):
@@ -83,6 +83,10 @@ class FNGroupNode(NodeCustomGroup, FNBaseNode):
         self._socket_hash = new
         return changed
 
+    def external_state(self, inputs):
+        tree = self.node_tree
+        return group_state(tree, self, inputs) if tree else None
+
     def process(self, context, inputs, manager):
         tree = self.node_tree
         if not tree:
@@ -99,24 +103,15 @@ class FNGroupNode(NodeCustomGroup, FNBaseNode):
                 data_id = manager.register_data(val)
                 setattr(inp, prop, manager.get_data(data_id)) # Set the actual data, not the ID
 
-        # Evaluate the internal node tree using the shared manager
-        cow_evaluate_tree(tree, context, manager)
+        # Evaluate the internal node tree in a nested frame of the shared
+        # manager; its copies are cleaned up with the outer evaluation.
+        outputs = evaluate_group(tree, context, manager, self) or {}
 
-        # Retrieve outputs from the internal NodeGroupOutput node
-        out_node = None
-        for n in getattr(tree, "nodes", []):
-            if getattr(n, "bl_idname", "") == "NodeGroupOutput":
-                out_node = n
-                break
-        
         result = {}
-        if out_node:
-            # The outputs of the internal NodeGroupOutput are already IDs
-            # from the shared manager. We just need to map them to the group's outputs.
-            for s in out_node.inputs: # NodeGroupOutput's inputs are the group's outputs
-                key = getattr(s, "identifier", s.name)
-                # The value is already an ID from the internal evaluation
-                result[key] = manager.register_data(manager.get_data(s.value)) # Re-register to get a new ID for the group's output
+        for s in self.outputs:
+            key = getattr(s, "identifier", s.name)
+            data_id = outputs.get(key, outputs.get(s.name))
+            result[key] = manager.resolve(data_id) if data_id is not None else None
 
         return result
 
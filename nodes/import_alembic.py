@@ -1,20 +1,226 @@
 """Node to import objects from an Alembic file."""
 
-import bpy
+import bpy, os, warnings
 from bpy.types import Node
 
 from .base import FNBaseNode
+from .read_blend import _file_stamp, file_state
 from ..sockets import FNSocketString, FNSocketObjectList
+from .. import uuid_manager
+from ..data_manager import remove_datablocks
 
 
+class _AlembicEntry:
+    """Objects imported from one archive and the file state they match."""
+    __slots__ = ("stamp", "uuids", "cache_file", "owners")
+
+    def __init__(self, stamp, uuids, cache_file):
+        self.stamp = stamp              # (mtime_ns, size) at import or reload
+        self.uuids = uuids              # UUIDs of the imported objects
+        self.cache_file = cache_file    # UUID of their CacheFile, or None
+        self.owners = set()             # (tree name, node name) of the nodes using it
+
+
+# Absolute path -> _AlembicEntry, shared by every node importing that path.
 _abc_cache = {}
 
+# bpy.types name -> bpy.data collection of object data, removed together
+# with its object. Resolved from the data's type like
+# data_manager._ID_COLLECTIONS, as the collection names differ between
+# Blender versions: Blender 4.3 moved Grease Pencil data to
+# grease_pencils_v3, next to the legacy type. Empties have no data.
+_DATA_COLLECTIONS = (
+    ("Mesh", "meshes"),
+    ("Curve", "curves"),            # also surfaces and text
+    ("Curves", "hair_curves"),
+    ("PointCloud", "pointclouds"),
+    ("Volume", "volumes"),
+    ("MetaBall", "metaballs"),
+    ("Camera", "cameras"),
+    ("Light", "lights"),
+    ("Lattice", "lattices"),
+    ("Armature", "armatures"),
+    ("GreasePencilv3", "grease_pencils_v3"),
+    ("GreasePencil", "grease_pencils"),
+)
+
+
+def _data_collection(data):
+    for type_name, collection in _DATA_COLLECTIONS:
+        id_type = getattr(bpy.types, type_name, None)
+        if id_type is not None and isinstance(data, id_type) and hasattr(bpy.data, collection):
+            return collection
+    return None
+
+
+# Imported objects are kept in this collection instead of a user's scene.
+# It is not linked to any scene and has a fake user so it survives saving.
+HOLDER_NAME = "File Nodes Alembic"
+_IMPORT_SCENE_NAME = "FN Alembic Import"
+
+
+def _holder_collection():
+    holder = bpy.data.collections.get(HOLDER_NAME)
+    if holder is None:
+        holder = bpy.data.collections.new(HOLDER_NAME)
+        holder.use_fake_user = True
+    return holder
+
+
+def import_objects(abs_path):
+    """Import ``abs_path`` and return the objects it created.
+
+    The importer runs in a scratch scene, so the new objects are exactly
+    that scene's objects and nothing is added to the active scene. They are
+    moved to the holder collection before the scratch scene is removed.
+    """
+    scene = bpy.data.scenes.new(_IMPORT_SCENE_NAME)
+    try:
+        with bpy.context.temp_override(scene=scene, view_layer=scene.view_layers[0]):
+            bpy.ops.wm.alembic_import(filepath=abs_path, as_background_job=False)
+        objects = list(scene.collection.all_objects)
+        holder = _holder_collection()
+        for obj in objects:
+            holder.objects.link(obj)
+    finally:
+        bpy.data.scenes.remove(scene)
+    return objects
+
+
+def _find_cache_file(objects):
+    """The CacheFile read by the modifiers or constraints of ``objects``."""
+    for obj in objects:
+        for owner in (*obj.modifiers, *obj.constraints):
+            cache_file = getattr(owner, "cache_file", None)
+            if cache_file is not None:
+                return cache_file
+    return None
+
+
+def _lookup(uuids, data_collection):
+    return [uuid_manager.find_datablock_by_uuid(u, data_collection) for u in uuids]
+
+
+def _entry_datablocks(entry):
+    """``(collection, datablock)`` pairs still alive for ``entry``."""
+    pairs = []
+    seen = set()
+    for obj in _lookup(entry.uuids, bpy.data.objects):
+        if obj is None:
+            continue
+        pairs.append(("objects", obj))
+        data = obj.data
+        collection = _data_collection(data) if data is not None else None
+        if collection is not None and id(data) not in seen:
+            seen.add(id(data))
+            pairs.append((collection, data))
+    cache_file = uuid_manager.find_datablock_by_uuid(entry.cache_file, bpy.data.cache_files)
+    if cache_file is not None:
+        pairs.append(("cache_files", cache_file))
+    return pairs
+
+
+def _free(entry, manager=None):
+    """Remove the objects, their data and the CacheFile of ``entry``.
+
+    During an evaluation they go through ``manager`` so its cleanup reports
+    their pointers; otherwise (e.g. when a node is deleted) they are
+    removed right away.
+    """
+    pairs = _entry_datablocks(entry)
+    if manager is not None:
+        manager.release(pairs)
+    else:
+        remove_datablocks(pairs)
+
+
+def _release(abs_path, owner, manager=None):
+    """Drop ``owner``'s use of ``abs_path``, freeing it when nobody is left."""
+    entry = _abc_cache.get(abs_path)
+    if entry is None:
+        return
+    entry.owners.discard(owner)
+    if not entry.owners:
+        del _abc_cache[abs_path]
+        _free(entry, manager)
+
+
+def _reload(entry):
+    """Make Blender reread the entry's archive; False without a CacheFile."""
+    cache_file = uuid_manager.find_datablock_by_uuid(entry.cache_file, bpy.data.cache_files)
+    if cache_file is None:
+        return False
+    # Assigning the path tags the CacheFile for update and reopens the
+    # archive; the objects keep reading it through their modifiers and
+    # constraints, so nothing is imported again.
+    cache_file.filepath = cache_file.filepath
+    return True
+
+
+def _state_prefix(node):
+    return f"{node.name}/alembic"
+
+
+def _save_state(node, entry):
+    """Record ``entry``'s UUIDs in the node's tree so a saved file keeps them."""
+    tree = node.id_data
+    prefix = _state_prefix(node)
+    tree.remove_datablock_uuids(prefix)
+    tree.set_datablock_uuid(prefix, entry.cache_file or "")
+    for index, obj_uuid in enumerate(entry.uuids):
+        tree.set_datablock_uuid(f"{prefix}/{index}", obj_uuid)
+
+
+def _owner_key(node):
+    return (node.id_data.name, node.name)
+
+
+def _entry_for(node, abs_path):
+    """The cache entry for ``abs_path`` used by ``node``.
+
+    After the .blend file is reopened the module cache is empty, so the
+    entry is rebuilt from the UUIDs saved in the node's state map.
+    """
+    entry = _abc_cache.get(abs_path)
+    if entry is not None or node.imported_path != abs_path:
+        return entry
+    tree = node.id_data
+    prefix = _state_prefix(node)
+    cache_file = tree.get_datablock_uuid(prefix)
+    if cache_file is None:
+        return None
+    uuids = []
+    while True:
+        obj_uuid = tree.get_datablock_uuid(f"{prefix}/{len(uuids)}")
+        if obj_uuid is None:
+            break
+        uuids.append(obj_uuid)
+    # The stamp is unknown, so the first evaluation reloads the CacheFile.
+    entry = _AlembicEntry(None, uuids, cache_file or None)
+    entry.owners.add(_owner_key(node))
+    _abc_cache[abs_path] = entry
+    return entry
+
+
+def _forget(node, manager=None):
+    """Release the node's import and clear its saved state."""
+    path = node.imported_path
+    if path:
+        if _entry_for(node, path) is not None:
+            _release(path, _owner_key(node), manager)
+        node.id_data.remove_datablock_uuids(_state_prefix(node))
+        node.imported_path = ""
+
 
 class FNImportAlembic(Node, FNBaseNode):
     """Load objects from an Alembic archive."""
     bl_idname = "FNImportAlembicNode"
     bl_label = "Import Alembic"
 
+    # Path of the archive whose objects the node outputs. Saved with the
+    # .blend file so the import can be found again after reopening it.
+    imported_path: bpy.props.StringProperty(options={'HIDDEN'})
+
     @classmethod
     def poll(cls, ntree):
         return ntree.bl_idname == "FileNodesTreeType"
@@ -25,41 +231,60 @@ class FNImportAlembic(Node, FNBaseNode):
         sock.display_shape = 'SQUARE'
 
     def free(self):
-        self._invalidate_cache()
+        _forget(self)
 
-    def _invalidate_cache(self, path=None):
-        path = path or getattr(self, "_cached_filepath", None)
-        if path:
-            _abc_cache.pop(path, None)
-            self._cached_filepath = None
+    def external_state(self, inputs):
+        return file_state(inputs.get("File Path"))
 
     def process(self, context, inputs, manager):
         filepath = inputs.get("File Path") or ""
-        abs_path = bpy.path.abspath(filepath)
-        if filepath != getattr(self, "_cached_filepath", None):
-            self._invalidate_cache()
-        objects = []
+        abs_path = os.path.normpath(bpy.path.abspath(filepath)) if filepath else ""
+        if self.imported_path and self.imported_path != abs_path:
+            _forget(self, manager)
         if not filepath:
-            self._cached_filepath = None
-            return {"Objects": objects}
+            return {"Objects": []}
+        try:
+            stamp = _file_stamp(abs_path)
+        except OSError as e:
+            warnings.warn(f"Cannot read Alembic file: {e}")
+            return {"Objects": []}
 
-        cached = _abc_cache.get(abs_path)
-        if cached is not None:
-            self._cached_filepath = abs_path
-            return {"Objects": cached}
+        owner = _owner_key(self)
+        entry = _entry_for(self, abs_path)
+        if entry is not None:
+            # Objects are looked up by UUID, so undo or renames do not leave
+            # stale references in the cache.
+            objects = _lookup(entry.uuids, bpy.data.objects)
+            if None not in objects and (entry.stamp == stamp or _reload(entry)):
+                entry.stamp = stamp
+                if owner not in entry.owners:
+                    entry.owners.add(owner)
+                    _save_state(self, entry)
+                self.imported_path = abs_path
+                return {"Objects": objects}
+            # Objects were deleted or there is no CacheFile to reload: the
+            # import is replaced for every node sharing it. The other nodes
+            # join the new entry, and save its UUIDs, when they next run.
+            del _abc_cache[abs_path]
+            _free(entry, manager)
 
-        scene = context.scene
-        before = set(scene.objects)
         try:
-            bpy.ops.wm.alembic_import(filepath=abs_path)
-        except Exception:
-            self._cached_filepath = None
-            return {"Objects": objects}
-        for obj in scene.objects:
-            if obj not in before:
-                objects.append(obj)
-        _abc_cache[abs_path] = objects
-        self._cached_filepath = abs_path
+            objects = import_objects(abs_path)
+        except Exception as e:
+            warnings.warn(f"Failed to import Alembic: {e}")
+            self.id_data.remove_datablock_uuids(_state_prefix(self))
+            self.imported_path = ""
+            return {"Objects": []}
+        cache_file = _find_cache_file(objects)
+        entry = _AlembicEntry(
+            stamp,
+            [uuid_manager.get_or_create_uuid(obj) for obj in objects],
+            uuid_manager.get_or_create_uuid(cache_file),
+        )
+        entry.owners.add(owner)
+        _abc_cache[abs_path] = entry
+        _save_state(self, entry)
+        self.imported_path = abs_path
         return {"Objects": objects}
 
 
@@ -68,4 +293,4 @@ def register():
 
 
 def unregister():
-    bpy.utils.unregister_class(FNImportAlembic)
\ No newline at end of file
+    bpy.utils.unregister_class(FNImportAlembic)
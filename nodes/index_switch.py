@@ -31,6 +31,7 @@ class FNIndexSwitch(Node, FNBaseNode):
     """Select an input socket by index."""
     bl_idname = "FNIndexSwitch"
     bl_label = "Index Switch"
+    pure = True
 
     input_count: bpy.props.IntProperty(
         name="Inputs",
@@ -74,7 +75,7 @@ class FNIndexSwitch(Node, FNBaseNode):
             sock.is_mutable = False
         self.outputs.new(single, name)
         if context is not None:
-            auto_evaluate_if_enabled(context)
+            auto_evaluate_if_enabled(self, context)
 
     # Backwards compatible name used in tests
     def update_sockets(self, context=None):
@@ -12,6 +12,7 @@ class FNJoinStrings(Node, FNBaseNode):
     """Join input strings with a separator."""
     bl_idname = "FNJoinStrings"
     bl_label = "Join Strings"
+    pure = True
 
     input_count: bpy.props.IntProperty(
         name="Inputs",
@@ -51,7 +52,7 @@ class FNJoinStrings(Node, FNBaseNode):
             self.inputs.new('FNSocketString', f"String {i}")
         self.outputs.new('FNSocketString', "String")
         if context is not None:
-            auto_evaluate_if_enabled(context)
+            auto_evaluate_if_enabled(self, context)
 
 
 def register():
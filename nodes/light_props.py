@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketLight, FNSocketFloat
 
 
@@ -12,6 +12,7 @@ class FNLightProps(Node, FNBaseNode):
     """Adjust light settings such as energy."""
     bl_idname = "FNLightProps"
     bl_label = "Light Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNLightProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         light = inputs.get("Light")
         if light:
-            energy = inputs.get("Energy")
-            try:
-                light.energy = energy
-            except Exception:
-                pass
+            assign_properties(light, {"energy": inputs.get("Energy")}, manager)
         return {"Light": light}
 
 
@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketMaterial, FNSocketBool
 
 
@@ -12,6 +12,7 @@ class FNMaterialProps(Node, FNBaseNode):
     """Toggle the use of nodes for a material."""
     bl_idname = "FNMaterialProps"
     bl_label = "Material Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNMaterialProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         mat = inputs.get("Material")
         if mat:
-            use_nodes = inputs.get("Use Nodes")
-            try:
-                mat.use_nodes = use_nodes
-            except Exception:
-                pass
+            assign_properties(mat, {"use_nodes": inputs.get("Use Nodes")}, manager)
         return {"Material": mat}
 
 
@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketMesh, FNSocketBool
 
 
@@ -12,6 +12,7 @@ class FNMeshProps(Node, FNBaseNode):
     """Toggle auto-smoothing on a mesh."""
     bl_idname = "FNMeshProps"
     bl_label = "Mesh Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNMeshProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         mesh = inputs.get("Mesh")
         if mesh:
-            auto = inputs.get("Auto Smooth")
-            try:
-                mesh.use_auto_smooth = auto
-            except Exception:
-                pass
+            assign_properties(mesh, {"use_auto_smooth": inputs.get("Auto Smooth")}, manager)
         return {"Mesh": mesh}
 
 
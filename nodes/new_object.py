@@ -43,7 +43,7 @@ class FNNewObject(Node, FNCacheIDMixin, FNBaseNode):
         while self.outputs:
             self.outputs.remove(self.outputs[-1])
         self.outputs.new('FNSocketObject', "Object")
-        auto_evaluate_if_enabled(context)
+        auto_evaluate_if_enabled(self, context)
 
     @classmethod
     def poll(cls, ntree):
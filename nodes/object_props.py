@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketObject, FNSocketBool
 
 
@@ -12,6 +12,7 @@ class FNObjectProps(Node, FNBaseNode):
     """Set visibility flags on an object."""
     bl_idname = "FNObjectProps"
     bl_label = "Object Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -29,13 +30,10 @@ class FNObjectProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         obj = inputs.get("Object")
         if obj:
-            hide_vp = inputs.get("Hide Viewport")
-            hide_re = inputs.get("Hide Render")
-            try:
-                obj.hide_viewport = hide_vp
-                obj.hide_render = hide_re
-            except Exception:
-                pass
+            assign_properties(obj, {
+                "hide_viewport": inputs.get("Hide Viewport"),
+                "hide_render": inputs.get("Hide Render"),
+            }, manager)
         return {"Object": obj}
 
 
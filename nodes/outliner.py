@@ -77,7 +77,7 @@ class FNOutlinerNode(Node, FNBaseNode):
         sock.is_mutable = False
 
     def update(self):
-        auto_evaluate_if_enabled(bpy.context)
+        auto_evaluate_if_enabled(self, bpy.context)
 
     def _collect(self, coll, depth=0, parent=-1, items=None):
         if items is None:
@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketScene, FNSocketInt
 
 
@@ -12,6 +12,7 @@ class FNOutputProps(Node, FNBaseNode):
     """Set render resolution for a scene."""
     bl_idname = "FNOutputProps"
     bl_label = "Output Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -29,13 +30,10 @@ class FNOutputProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         scene = inputs.get("Scene")
         if scene:
-            res_x = inputs.get("Resolution X")
-            res_y = inputs.get("Resolution Y")
-            try:
-                scene.render.resolution_x = res_x
-                scene.render.resolution_y = res_y
-            except Exception:
-                pass
+            assign_properties(scene, {
+                "render.resolution_x": inputs.get("Resolution X"),
+                "render.resolution_y": inputs.get("Resolution Y"),
+            }, manager)
         return {"Scene": scene}
 
 
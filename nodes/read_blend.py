@@ -1,8 +1,12 @@
 """Node that loads datablocks from a .blend file."""
 
-import bpy, os, warnings
+import bpy, hashlib, logging, os, time, warnings
+from fnmatch import fnmatchcase
 from bpy.types import Node
 from .base import FNBaseNode
+from .. import blend_file, cow_engine
+from ..common import add_handler, persistent_handler, remove_handler
+from ..operators import auto_evaluate_if_enabled
 from ..sockets import (
     FNSocketSceneList, FNSocketObjectList, FNSocketCollectionList, FNSocketWorldList,
     FNSocketCameraList, FNSocketImageList, FNSocketLightList, FNSocketMaterialList,
@@ -10,9 +14,197 @@ from ..sockets import (
     FNSocketString,
 )
 
+log = logging.getLogger(__name__)
+
+# Output socket, bpy.data collection and ID type of each category.
+_CATEGORIES = (
+    ("Scenes", "scenes", "Scene"),
+    ("Objects", "objects", "Object"),
+    ("Collections", "collections", "Collection"),
+    ("Worlds", "worlds", "World"),
+    ("Cameras", "cameras", "Camera"),
+    ("Images", "images", "Image"),
+    ("Lights", "lights", "Light"),
+    ("Materials", "materials", "Material"),
+    ("Meshes", "meshes", "Mesh"),
+    ("NodeTrees", "node_groups", "NodeTree"),
+    ("Texts", "texts", "Text"),
+    ("WorkSpaces", "workspaces", "WorkSpace"),
+)
+
 # Cache loaded libraries so repeated evaluations don't reload and
-# duplicate linked datablocks.
+# duplicate linked datablocks. Maps the absolute path to a _LibraryEntry.
+# Entries are shared by every node reading the file and validated against
+# the file on each use.
 _blend_cache = {}
+_cache_stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+
+class _LibraryEntry:
+    """Linked IDs of one library file and the file state they came from."""
+
+    __slots__ = ("stamp", "digest", "loaded", "report")
+
+    def __init__(self, stamp, digest=None):
+        # (st_mtime_ns, st_size) when the entry was filled.
+        self.stamp = stamp
+        self.digest = digest
+        # (category, name filter) -> linked IDs
+        self.loaded = {}
+        # Dependency tree lines of the last load that preloaded libraries.
+        self.report = []
+
+
+def _file_stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def file_state(filepath):
+    """Stamp of the file at ``filepath`` for a node's external_state.
+
+    None when there is no path or the file cannot be read.
+    """
+    if not filepath:
+        return None
+    try:
+        return _file_stamp(os.path.normpath(bpy.path.abspath(filepath)))
+    except OSError:
+        return None
+
+
+def _file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _find_library(path):
+    path = os.path.normcase(os.path.normpath(path))
+    for library in bpy.data.libraries:
+        lib_path = os.path.normpath(bpy.path.abspath(library.filepath))
+        if os.path.normcase(lib_path) == path:
+            return library
+    return None
+
+
+def dependency_report(abs_path):
+    """Dependency tree lines recorded when ``abs_path`` was last preloaded."""
+    entry = _blend_cache.get(abs_path)
+    return list(entry.report) if entry is not None else []
+
+
+def cache_stats():
+    """Return the library cache hit, miss and reload counts."""
+    return dict(_cache_stats)
+
+
+def invalidate(path=None):
+    """Forget the cached IDs of ``path`` or of every library."""
+    if path is None:
+        _blend_cache.clear()
+    else:
+        _blend_cache.pop(path, None)
+
+
+def _filter_names(names, pattern):
+    if not pattern:
+        return list(names)
+    return [n for n in names if fnmatchcase(n, pattern)]
+
+
+def linked_categories(node):
+    """Entries of ``_CATEGORIES`` whose output socket on ``node`` is linked."""
+    linked = []
+    for category in _CATEGORIES:
+        sock = node.outputs.get(category[0])
+        if sock is not None and sock.is_linked:
+            linked.append(category)
+    return linked
+
+
+def update_linked_categories(node):
+    # Linking another output needs a run that loads its category.
+    if linked_categories(node) != getattr(node, "_loaded_categories", None):
+        cow_engine.mark_dirty(node)
+
+
+def _cache_entry(abs_path, verify_hash=False):
+    """Return the valid cache entry of ``abs_path``, reloading if stale."""
+    stamp = _file_stamp(abs_path)
+    entry = _blend_cache.get(abs_path)
+    if entry is None:
+        entry = _LibraryEntry(stamp, _file_digest(abs_path) if verify_hash else None)
+        _blend_cache[abs_path] = entry
+        return entry
+    if entry.stamp == stamp:
+        return entry
+    if verify_hash:
+        digest = _file_digest(abs_path)
+        if digest == entry.digest:
+            # Saved again without changes.
+            entry.stamp = stamp
+            return entry
+        entry.digest = digest
+    else:
+        entry.digest = None
+    entry.stamp = stamp
+    # Reload the library in place: existing users of its IDs keep
+    # pointing at them, unlike removing and linking it again.
+    library = _find_library(abs_path)
+    if library is not None:
+        library.reload()
+        _cache_stats["reloads"] += 1
+    entry.loaded.clear()
+    return entry
+
+
+def _preload(abs_path):
+    """Read the libraries ``abs_path`` depends on, all in one threaded batch."""
+    graph = blend_file.dependency_graph([abs_path])
+    order = blend_file.dependency_order(graph, abs_path)
+    log.debug("Preloaded %d libraries for %s: %s", len(order) - 1, abs_path, order[:-1])
+    return graph
+
+
+def link_library(abs_path, categories, pattern="", verify_hash=False, preload=False):
+    """Link the ``categories`` of ``abs_path`` and return ``{collection: [IDs]}``.
+
+    ``categories`` are entries of ``_CATEGORIES``; only names matching
+    ``pattern`` are linked. Results come from the library cache when the
+    file is unchanged. With ``preload`` the libraries linked indirectly are
+    read first (see blend_file.dependency_graph) and the entry's report
+    lists them with their read times. Must run on the main thread.
+    """
+    try:
+        entry = _cache_entry(abs_path, verify_hash)
+        loaded = entry.loaded
+        missing = [c for c in categories if (c[1], pattern) not in loaded]
+        if missing:
+            _cache_stats["misses"] += 1
+            graph = _preload(abs_path) if preload else None
+            started = time.perf_counter()
+            with bpy.data.libraries.load(abs_path, link=True) as (data_from, data_to):
+                for _out, attr, _type in missing:
+                    setattr(data_to, attr, _filter_names(getattr(data_from, attr), pattern))
+            elapsed = time.perf_counter() - started
+            if graph is not None:
+                entry.report = [f"Linked in {elapsed * 1000:.1f} ms"] + blend_file.format_tree(graph, abs_path)
+                log.info("Library dependencies of %s:\n%s", abs_path, "\n".join(entry.report))
+            for _out, attr, type_name in missing:
+                id_type = getattr(bpy.types, type_name)
+                collection = getattr(bpy.data, attr)
+                loaded[(attr, pattern)] = [
+                    d if isinstance(d, id_type) else collection.get(d) for d in getattr(data_to, attr)
+                ]
+        else:
+            _cache_stats["hits"] += 1
+    except Exception:
+        invalidate(abs_path)
+        raise
+    return {attr: list(loaded[(attr, pattern)]) for _out, attr, _type in categories}
 
 class FNReadBlendNode(Node, FNBaseNode):
     """Load a blend file and output its contained datablocks."""
@@ -22,8 +214,22 @@ class FNReadBlendNode(Node, FNBaseNode):
     bl_idname = "FNReadBlendNode"
     bl_label = "Read Blend File"
 
+    verify_hash: bpy.props.BoolProperty(
+        name="Verify Contents",
+        description="When the file's time or size changed, compare a hash of its contents before reloading",
+        default=False,
+        update=auto_evaluate_if_enabled,
+    )
+    preload_dependencies: bpy.props.BoolProperty(
+        name="Preload Dependencies",
+        description="Read the libraries this file links from in one parallel batch before linking, and report them",
+        default=False,
+        update=auto_evaluate_if_enabled,
+    )
+
     def init(self, context):
         sock = self.inputs.new('FNSocketString', "File Path")
+        sock = self.inputs.new('FNSocketString', "Name Filter")
         sock = self.outputs.new('FNSocketSceneList', "Scenes")
         sock.display_shape = 'SQUARE'
         sock = self.outputs.new('FNSocketObjectList', "Objects")
@@ -48,15 +254,23 @@ class FNReadBlendNode(Node, FNBaseNode):
         sock.display_shape = 'SQUARE'
         sock = self.outputs.new('FNSocketWorkSpaceList', "WorkSpaces")
         sock.display_shape = 'SQUARE'
+        sock = self.outputs.new('FNSocketStringList', "Dependencies")
+        sock.display_shape = 'SQUARE'
 
-    def free(self):
-        self._invalidate_cache()
+    def draw_buttons(self, context, layout):
+        layout.prop(self, "verify_hash")
+        layout.prop(self, "preload_dependencies")
 
-    def _invalidate_cache(self, path=None):
-        path = path or getattr(self, "_cached_filepath", None)
-        if path:
-            _blend_cache.pop(path, None)
-            self._cached_filepath = None
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        stats = _cache_stats
+        layout.label(text=f"Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['reloads']} reloads")
+
+    def update(self):
+        update_linked_categories(self)
+
+    def external_state(self, inputs):
+        return file_state(inputs.get("File Path"))
 
     def process(self, context, inputs, manager):
         def _warn(msg):
@@ -67,91 +281,42 @@ class FNReadBlendNode(Node, FNBaseNode):
                 
                 warnings.warn(msg)
 
-        empty = {
-            "Scenes": [], "Objects": [], "Collections": [], "Worlds": [],
-            "Cameras": [], "Images": [], "Lights": [], "Materials": [],
-            "Meshes": [], "NodeTrees": [], "Texts": [], "WorkSpaces": [],
-        }
+        empty = {out: [] for out, _attr, _type in _CATEGORIES}
+        empty["Dependencies"] = []
 
         filepath = inputs.get("File Path", "") or ""
-        abs_path = bpy.path.abspath(filepath)
-        if filepath != getattr(self, "_cached_filepath", None):
-            self._invalidate_cache()
+        abs_path = os.path.normpath(bpy.path.abspath(filepath))
         if not filepath or not os.path.isfile(abs_path):
             _warn("Invalid filepath")
-            self._cached_filepath = None
             return empty
 
-        cached = _blend_cache.get(abs_path)
-        if cached is not None:
-            self._cached_filepath = abs_path
-            return cached
-
-        scenes_out, objects_out, collections_out, worlds_out = [], [], [], []
-        cameras_out, images_out, lights_out = [], [], []
-        materials_out, meshes_out, nodetrees_out = [], [], []
-        texts_out, workspaces_out = [], []
+        # Only link the categories something consumes, and within them only
+        # the names matching the filter.
+        pattern = inputs.get("Name Filter", "") or ""
+        linked = self._loaded_categories = linked_categories(self)
         try:
-            with bpy.data.libraries.load(abs_path, link=True) as (data_from, data_to):
-                data_to.scenes = data_from.scenes
-                data_to.objects = data_from.objects
-                data_to.collections = data_from.collections
-                data_to.worlds = data_from.worlds
-                data_to.cameras = data_from.cameras
-                data_to.images = data_from.images
-                data_to.lights = data_from.lights
-                data_to.materials = data_from.materials
-                data_to.meshes = data_from.meshes
-                data_to.node_groups = data_from.node_groups
-                data_to.texts = data_from.texts
-                data_to.workspaces = data_from.workspaces
+            loaded = link_library(abs_path, linked, pattern, self.verify_hash, self.preload_dependencies)
         except Exception as e:
             _warn(f"Failed to load library: {e}")
-            self._cached_filepath = None
             return empty
-        for s in data_to.scenes:
-            scenes_out.append(s if isinstance(s, bpy.types.Scene) else bpy.data.scenes.get(s))
-        for o in data_to.objects:
-            objects_out.append(o if isinstance(o, bpy.types.Object) else bpy.data.objects.get(o))
-        for c in data_to.collections:
-            collections_out.append(c if isinstance(c, bpy.types.Collection) else bpy.data.collections.get(c))
-        for w in data_to.worlds:
-            worlds_out.append(w if isinstance(w, bpy.types.World) else bpy.data.worlds.get(w))
-        for cam in data_to.cameras:
-            cameras_out.append(cam if isinstance(cam, bpy.types.Camera) else bpy.data.cameras.get(cam))
-        for img in data_to.images:
-            images_out.append(img if isinstance(img, bpy.types.Image) else bpy.data.images.get(img))
-        for li in data_to.lights:
-            lights_out.append(li if isinstance(li, bpy.types.Light) else bpy.data.lights.get(li))
-        for mat in data_to.materials:
-            materials_out.append(mat if isinstance(mat, bpy.types.Material) else bpy.data.materials.get(mat))
-        for me in data_to.meshes:
-            meshes_out.append(me if isinstance(me, bpy.types.Mesh) else bpy.data.meshes.get(me))
-        for nt in data_to.node_groups:
-            nodetrees_out.append(nt if isinstance(nt, bpy.types.NodeTree) else bpy.data.node_groups.get(nt))
-        for txt in data_to.texts:
-            texts_out.append(txt if isinstance(txt, bpy.types.Text) else bpy.data.texts.get(txt))
-        for ws in data_to.workspaces:
-            workspaces_out.append(ws if isinstance(ws, bpy.types.WorkSpace) else bpy.data.workspaces.get(ws))
-        result = {
-            "Scenes": scenes_out,
-            "Objects": objects_out,
-            "Collections": collections_out,
-            "Worlds": worlds_out,
-            "Cameras": cameras_out,
-            "Images": images_out,
-            "Lights": lights_out,
-            "Materials": materials_out,
-            "Meshes": meshes_out,
-            "NodeTrees": nodetrees_out,
-            "Texts": texts_out,
-            "WorkSpaces": workspaces_out,
-        }
-        _blend_cache[abs_path] = result
-        self._cached_filepath = abs_path
+
+        result = dict(empty)
+        for out, attr, _type in linked:
+            result[out] = loaded[attr]
+        if self.preload_dependencies:
+            result["Dependencies"] = dependency_report(abs_path)
         return result
 
+@persistent_handler
+def _reset_cache(*_args):
+    # File loads and undo free the linked IDs the cache points to.
+    invalidate()
+
+
 def register():
     bpy.utils.register_class(FNReadBlendNode)
+    add_handler(_reset_cache)
+
 def unregister():
+    remove_handler(_reset_cache)
     bpy.utils.unregister_class(FNReadBlendNode)
@@ -0,0 +1,167 @@
+"""Node that loads datablocks from several .blend files at once."""
+
+import bpy, glob, os, warnings
+from bpy.types import Node
+from .base import FNBaseNode
+from .read_blend import (
+    _CATEGORIES, _file_stamp, file_state, link_library, linked_categories,
+    update_linked_categories,
+)
+from .. import blend_file
+from ..operators import auto_evaluate_if_enabled
+from ..sockets import FNSocketString, FNSocketStringList
+
+
+# Scan errors after which Blender may still be able to read the file: the
+# codec is missing here, or the scan stopped before ENDB and its counts
+# cannot be trusted.
+_UNSCANNED = (blend_file.UnsupportedCompression, blend_file.IncompleteScan)
+
+# Pre-scan result (BlendSummary or scan error) of each file, keyed by the
+# absolute path and validated against the file's (mtime, size) stamp.
+_summary_cache = {}
+
+
+def scan_summaries(paths):
+    """Return ``{path: BlendSummary or exception}`` for ``paths``, using the cache.
+
+    Only files that are new or changed since their last scan are read.
+    """
+    summaries = {}
+    stale = []
+    for path in paths:
+        try:
+            stamp = _file_stamp(path)
+        except OSError:
+            stamp = None
+        cached = _summary_cache.get(path)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            summaries[path] = cached[1]
+        else:
+            # Holds the stamp until the file is scanned below.
+            summaries[path] = stamp
+            stale.append(path)
+    # Reading headers and block tables needs no bpy, so it runs in worker
+    # threads.
+    for path, summary in blend_file.scan_many(stale).items():
+        stamp = summaries[path]
+        if stamp is not None and not isinstance(summary, OSError):
+            _summary_cache[path] = (stamp, summary)
+        else:
+            _summary_cache.pop(path, None)
+        summaries[path] = summary
+    return summaries
+
+
+def expand_paths(pattern, paths=()):
+    """Absolute paths of the files matched by ``pattern`` plus ``paths``.
+
+    ``pattern`` is a directory (all .blend files in it) or a glob; ``**``
+    matches subdirectories. Duplicates are dropped, order is kept.
+    """
+    found = []
+    if pattern:
+        pattern = bpy.path.abspath(pattern)
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.blend")
+        found.extend(sorted(glob.glob(pattern, recursive=True)))
+    found.extend(bpy.path.abspath(p) for p in paths if p)
+    result = []
+    seen = set()
+    for path in found:
+        path = os.path.normpath(path)
+        if path not in seen and os.path.isfile(path):
+            seen.add(path)
+            result.append(path)
+    return result
+
+
+def plan_loads(summaries, categories):
+    """Order the files to link from their pre-scan ``summaries``.
+
+    Files without IDs in ``categories`` are left out; the others are
+    linked largest first. Files that could not be fully scanned (e.g. zstd
+    without a zstd module, or a scan that stopped before ENDB) are kept
+    last so Blender can still read them.
+    """
+    scanned, unknown = [], []
+    for path, summary in summaries.items():
+        if isinstance(summary, _UNSCANNED):
+            unknown.append(path)
+        elif isinstance(summary, blend_file.BlendSummary):
+            used = sum(summary.count(attr) for _out, attr, _type in categories)
+            if used:
+                scanned.append((used, path))
+    scanned.sort(key=lambda item: -item[0])
+    return [path for _used, path in scanned] + unknown
+
+
+class FNReadBlendFilesNode(Node, FNBaseNode):
+    """Load datablocks from every blend file matching a directory or glob."""
+    @classmethod
+    def poll(cls, ntree):
+        return ntree.bl_idname == "FileNodesTreeType"
+    bl_idname = "FNReadBlendFilesNode"
+    bl_label = "Read Blend Files"
+
+    verify_hash: bpy.props.BoolProperty(
+        name="Verify Contents",
+        description="When a file's time or size changed, compare a hash of its contents before reloading",
+        default=False,
+        update=auto_evaluate_if_enabled,
+    )
+
+    def init(self, context):
+        self.inputs.new('FNSocketString', "Pattern")
+        sock = self.inputs.new('FNSocketStringList', "Paths")
+        sock.display_shape = 'SQUARE'
+        self.inputs.new('FNSocketString', "Name Filter")
+        sock = self.outputs.new('FNSocketStringList', "Files")
+        sock.display_shape = 'SQUARE'
+        for out, _attr, type_name in _CATEGORIES:
+            sock = self.outputs.new(f"FNSocket{type_name}List", out)
+            sock.display_shape = 'SQUARE'
+
+    def draw_buttons(self, context, layout):
+        layout.prop(self, "verify_hash")
+
+    def update(self):
+        update_linked_categories(self)
+
+    def external_state(self, inputs):
+        # Matching files are listed again so added or removed ones count.
+        paths = expand_paths(inputs.get("Pattern") or "", inputs.get("Paths") or [])
+        return tuple((path, file_state(path)) for path in paths)
+
+    def process(self, context, inputs, manager):
+        result = {out: [] for out, _attr, _type in _CATEGORIES}
+        paths = expand_paths(inputs.get("Pattern") or "", inputs.get("Paths") or [])
+        # Only the linking below touches bpy.data.
+        summaries = scan_summaries(paths)
+        result["Files"] = []
+        for path, summary in summaries.items():
+            if isinstance(summary, Exception) and not isinstance(summary, _UNSCANNED):
+                warnings.warn(f"Cannot read {path}: {summary}")
+            else:
+                result["Files"].append(path)
+
+        linked = self._loaded_categories = linked_categories(self)
+        if not linked:
+            return result
+        pattern = inputs.get("Name Filter", "") or ""
+        for path in plan_loads(summaries, linked):
+            try:
+                loaded = link_library(path, linked, pattern, self.verify_hash)
+            except Exception as e:
+                warnings.warn(f"Failed to load library {path}: {e}")
+                continue
+            for out, attr, _type in linked:
+                result[out].extend(loaded[attr])
+        return result
+
+
+def register():
+    bpy.utils.register_class(FNReadBlendFilesNode)
+
+def unregister():
+    bpy.utils.unregister_class(FNReadBlendFilesNode)
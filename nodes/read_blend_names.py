@@ -0,0 +1,69 @@
+"""Node that lists the datablock names in a .blend file without linking them."""
+
+import bpy, os, warnings
+from bpy.types import Node
+from .base import FNBaseNode
+from .read_blend import _CATEGORIES, _file_stamp, _filter_names, file_state
+from .. import blend_file
+from ..sockets import FNSocketString, FNSocketStringList
+
+# Names per bpy.data collection of each listed file, keyed by the absolute
+# path and validated against the file's (mtime, size) stamp.
+_names_cache = {}
+
+
+def read_names(abs_path):
+    """Return ``{collection: [names]}`` for ``abs_path``, using the cache."""
+    stamp = _file_stamp(abs_path)
+    cached = _names_cache.get(abs_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        # Reading the block index directly skips Blender's library reader.
+        names = blend_file.list_names(abs_path)
+    except blend_file.BlendFileError:
+        # Nothing is assigned to data_to, so no datablock is linked or appended.
+        with bpy.data.libraries.load(abs_path) as (data_from, _data_to):
+            names = {attr: list(getattr(data_from, attr)) for _out, attr, _type in _CATEGORIES}
+    _names_cache[abs_path] = (stamp, names)
+    return names
+
+
+class FNReadBlendNamesNode(Node, FNBaseNode):
+    """List the names of the datablocks in a blend file."""
+    @classmethod
+    def poll(cls, ntree):
+        return ntree.bl_idname == "FileNodesTreeType"
+    bl_idname = "FNReadBlendNamesNode"
+    bl_label = "Read Blend Names"
+
+    def init(self, context):
+        self.inputs.new('FNSocketString', "File Path")
+        self.inputs.new('FNSocketString', "Name Filter")
+        for out, _attr, _type in _CATEGORIES:
+            self.outputs.new('FNSocketStringList', out)
+
+    def external_state(self, inputs):
+        return file_state(inputs.get("File Path"))
+
+    def process(self, context, inputs, manager):
+        empty = {out: [] for out, _attr, _type in _CATEGORIES}
+        filepath = inputs.get("File Path", "") or ""
+        abs_path = os.path.normpath(bpy.path.abspath(filepath))
+        if not filepath or not os.path.isfile(abs_path):
+            warnings.warn("Invalid filepath")
+            return empty
+        try:
+            names = read_names(abs_path)
+        except Exception as e:
+            warnings.warn(f"Failed to read library: {e}")
+            return empty
+        pattern = inputs.get("Name Filter", "") or ""
+        return {out: _filter_names(names[attr], pattern) for out, attr, _type in _CATEGORIES}
+
+
+def register():
+    bpy.utils.register_class(FNReadBlendNamesNode)
+
+def unregister():
+    bpy.utils.unregister_class(FNReadBlendNamesNode)
@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketScene, FNSocketInt, FNSocketObject
 
 
@@ -12,6 +12,7 @@ class FNSceneProps(Node, FNBaseNode):
     """Adjust the frame start and end of a scene."""
     bl_idname = "FNSceneProps"
     bl_label = "Scene Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -31,19 +32,13 @@ class FNSceneProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         scene = inputs.get("Scene")
         if scene:
+            values = {}
             cam_obj = inputs.get("Camera")
             if cam_obj:
-                try:
-                    scene.camera = cam_obj
-                except Exception:
-                    pass
-            start = inputs.get("Start")
-            end = inputs.get("End")
-            try:
-                scene.frame_start = start
-                scene.frame_end = end
-            except Exception:
-                pass
+                values["camera"] = cam_obj
+            values["frame_start"] = inputs.get("Start")
+            values["frame_end"] = inputs.get("End")
+            assign_properties(scene, values, manager)
         return {"Scene": scene}
 
 
@@ -11,6 +11,7 @@ class FNSeparateXYZ(Node, FNBaseNode):
     """Split a vector into its individual components."""
     bl_idname = "FNSeparateXYZ"
     bl_label = "Separate XYZ"
+    pure = True
 
     def init(self, context):
         self.inputs.new('FNSocketVector', "Vector")
@@ -2,7 +2,7 @@
 
 import bpy
 from bpy.types import Node
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketCollection, FNSocketString
 
 
@@ -11,6 +11,7 @@ class FNSetCollectionName(Node, FNBaseNode):
     """Rename a collection datablock."""
     bl_idname = "FNSetCollectionName"
     bl_label = "Set Collection Name"
+    lazy_copy = True
 
     @classmethod
     def poll(cls, ntree):
@@ -25,11 +26,7 @@ class FNSetCollectionName(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         coll = inputs.get("Collection")
         if coll:
-            name = inputs.get("Name") or ""
-            try:
-                coll.name = name
-            except Exception:
-                pass
+            assign_properties(coll, {"name": inputs.get("Name") or ""}, manager)
         return {"Collection": coll}
 
 
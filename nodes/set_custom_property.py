@@ -1,3 +1,5 @@
+import logging
+
 import bpy
 from bpy.types import Node
 from ..operators import auto_evaluate_if_enabled
@@ -18,6 +20,8 @@ from ..sockets import (
     FNSocketViewLayer,
 )
 
+log = logging.getLogger(__name__)
+
 # Mapping for single datablock sockets
 _socket_single = {
     "SCENE": "FNSocketScene",
@@ -79,11 +83,11 @@ class FNSetCustomProperty(Node, FNBaseNode):
 
     def update_data_block_type(self, context):
         self._update_sockets(context)
-        auto_evaluate_if_enabled(context)
+        auto_evaluate_if_enabled(self, context)
 
     def update_property_type(self, context):
         self._update_sockets(context)  # Update sockets when property type changes
-        auto_evaluate_if_enabled(context)
+        auto_evaluate_if_enabled(self, context)
 
     def _update_sockets(self, context=None):
         # Clear existing sockets
@@ -141,7 +145,7 @@ class FNSetCustomProperty(Node, FNBaseNode):
             self.outputs.new(datablock_socket_id, self.data_block_type.replace("_", " ").title())
 
         if context is not None:
-            auto_evaluate_if_enabled(context)
+            auto_evaluate_if_enabled(self, context)
 
     def init(self, context):
         self._update_sockets(context)
@@ -156,16 +160,14 @@ class FNSetCustomProperty(Node, FNBaseNode):
         prop_description = inputs.get("Description")
         library_override = inputs.get("Library Override")
 
-        print(f"[DEBUG] Processing Set Custom Property node.")
-        print(f"[DEBUG] Datablock: {datablock}")
-        print(f"[DEBUG] Property Name: {prop_name}")
+        log.debug("Set Custom Property %s: datablock=%s name=%s", self.name, datablock, prop_name)
 
         prop_value = inputs.get("Value")
         value_socket = self.inputs.get("Value")
         if value_socket and not value_socket.is_linked:
             prop_value = inputs.get("Default Value")
 
-        print(f"[DEBUG] Property Value to set: {prop_value}")
+        log.debug("Property value to set: %s", prop_value)
 
         if datablock and prop_name:
             try:
@@ -178,7 +180,7 @@ class FNSetCustomProperty(Node, FNBaseNode):
                     id_props["_RNA_UI"][prop_name] = {}
 
                 prop_metadata = id_props["_RNA_UI"][prop_name]
-                print(f"[DEBUG] Metadata before update: {prop_metadata}")
+                log.debug("Metadata before update: %s", prop_metadata)
 
                 if self.property_type == "INT":
                     prop_metadata["min"] = inputs.get("Min")
@@ -194,10 +196,10 @@ class FNSetCustomProperty(Node, FNBaseNode):
                 if prop_description:
                     prop_metadata["description"] = prop_description
 
-                print(f"[DEBUG] Metadata after update: {prop_metadata}")
+                log.debug("Metadata after update: %s", prop_metadata)
 
             except Exception as e:
-                print(f"[ERROR] Error setting custom property: {e}")
+                log.error("Error setting custom property %s: %s", prop_name, e)
                 pass
         out_name = self.data_block_type.replace("_", " ").title()
         return {out_name: datablock}
@@ -2,7 +2,7 @@
 
 import bpy
 from bpy.types import Node
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketObject, FNSocketString
 
 
@@ -11,6 +11,7 @@ class FNSetObjectName(Node, FNBaseNode):
     """Change the name of an object."""
     bl_idname = "FNSetObjectName"
     bl_label = "Set Object Name"
+    lazy_copy = True
 
     @classmethod
     def poll(cls, ntree):
@@ -25,11 +26,7 @@ class FNSetObjectName(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         obj = inputs.get("Object")
         if obj:
-            name = inputs.get("Name") or ""
-            try:
-                obj.name = name
-            except Exception:
-                pass
+            assign_properties(obj, {"name": inputs.get("Name") or ""}, manager)
         return {"Object": obj}
 
 
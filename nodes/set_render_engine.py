@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketScene, FNSocketString
 
 
@@ -12,6 +12,7 @@ class FNSetRenderEngine(Node, FNBaseNode):
     """Change which render engine a scene uses."""
     bl_idname = "FNSetRenderEngine"
     bl_label = "Set Render Engine"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNSetRenderEngine(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         scene = inputs.get("Scene")
         if scene:
-            engine = inputs.get("Engine")
-            try:
-                scene.render.engine = engine
-            except Exception:
-                pass
+            assign_properties(scene, {"render.engine": inputs.get("Engine")}, manager)
         return {"Scene": scene}
 
 
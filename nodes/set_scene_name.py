@@ -2,7 +2,7 @@
 
 import bpy
 from bpy.types import Node
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketScene, FNSocketString
 
 
@@ -11,6 +11,7 @@ class FNSetSceneName(Node, FNBaseNode):
     """Rename the provided scene."""
     bl_idname = "FNSetSceneName"
     bl_label = "Set Scene Name"
+    lazy_copy = True
 
     @classmethod
     def poll(cls, ntree):
@@ -25,11 +26,7 @@ class FNSetSceneName(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         scene = inputs.get("Scene")
         if scene:
-            name = inputs.get("Name") or ""
-            try:
-                scene.name = name
-            except Exception:
-                pass
+            assign_properties(scene, {"name": inputs.get("Name") or ""}, manager)
         return {"Scene": scene}
 
 
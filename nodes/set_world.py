@@ -2,7 +2,7 @@
 
 import bpy
 from bpy.types import Node
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketScene, FNSocketWorld
 
 
@@ -13,6 +13,7 @@ class FNSetWorld(Node, FNBaseNode):
         return ntree.bl_idname == "FileNodesTreeType"
     bl_idname = "FNSetWorldNode"
     bl_label = "Set World to Scene"
+    lazy_copy = True
 
     def init(self, context):
         self.inputs.new('FNSocketScene', "Scene")
@@ -24,7 +25,7 @@ class FNSetWorld(Node, FNBaseNode):
         scene = inputs.get("Scene")
         world = inputs.get("World")
         if scene and world:
-            scene.world = world
+            assign_properties(scene, {"world": world}, manager)
         return {"Scene": scene}
 
 def register():
@@ -11,6 +11,7 @@ class FNSplitString(Node, FNBaseNode):
     """Split an input string into a list of substrings."""
     bl_idname = "FNSplitString"
     bl_label = "Split String"
+    pure = True
 
     def init(self, context):
         self.inputs.new('FNSocketString', "String")
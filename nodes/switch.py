@@ -31,6 +31,7 @@ class FNSwitch(Node, FNBaseNode):
     """Choose between two inputs based on a boolean value."""
     bl_idname = "FNSwitch"
     bl_label = "Switch"
+    pure = True
 
     data_type: bpy.props.EnumProperty(
         name="Type",
@@ -55,7 +56,7 @@ class FNSwitch(Node, FNBaseNode):
 
     def update_type(self, context):
         self._update_sockets()
-        auto_evaluate_if_enabled(context)
+        auto_evaluate_if_enabled(self, context)
 
     def _update_sockets(self):
         while self.inputs:
@@ -115,7 +115,7 @@ class FNViewLayerVisibility(Node, FNBaseNode):
         # Only trigger evaluation when properties change. The collection
         # states are synchronized during node execution to avoid overwriting
         # user settings with the current scene state.
-        auto_evaluate_if_enabled(bpy.context)
+        auto_evaluate_if_enabled(self, bpy.context)
 
     def _get_view_layer_for_ui(self, context):
         stored = getattr(self, "_input_view_layer", None)
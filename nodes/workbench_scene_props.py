@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketScene, FNSocketInt
 
 
@@ -12,6 +12,7 @@ class FNWorkbenchSceneProps(Node, FNBaseNode):
     """Set the anti-aliasing samples for Workbench renderer."""
     bl_idname = "FNWorkbenchSceneProps"
     bl_label = "Workbench Scene Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,12 +28,8 @@ class FNWorkbenchSceneProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         scene = inputs.get("Scene")
         if scene and hasattr(scene, "display"):
-            samples = inputs.get("AA Samples")
-            try:
-                if hasattr(scene.display, 'render_aa'):
-                    scene.display.render_aa = samples
-            except Exception:
-                pass
+            # Properties missing in this Blender version are skipped.
+            assign_properties(scene, {"display.render_aa": inputs.get("AA Samples")}, manager)
         return {"Scene": scene}
 
 
@@ -3,7 +3,7 @@
 import bpy
 from bpy.types import Node
 
-from .base import FNBaseNode
+from .base import FNBaseNode, assign_properties
 from ..sockets import FNSocketWorld, FNSocketBool
 
 
@@ -12,6 +12,7 @@ class FNWorldProps(Node, FNBaseNode):
     """Enable or disable nodes for a world."""
     bl_idname = "FNWorldProps"
     bl_label = "World Properties"
+    lazy_copy = True
 
 
     @classmethod
@@ -27,11 +28,7 @@ class FNWorldProps(Node, FNBaseNode):
     def process(self, context, inputs, manager):
         world = inputs.get("World")
         if world:
-            use_nodes = inputs.get("Use Nodes")
-            try:
-                world.use_nodes = use_nodes
-            except Exception:
-                pass
+            assign_properties(world, {"use_nodes": inputs.get("Use Nodes")}, manager)
         return {"World": world}
 
 
@@ -1,8 +1,12 @@
+import logging
+
 import bpy
 from bpy.types import Operator
 from . import ADDON_NAME
 from .common import LIST_TO_SINGLE
-from . import cow_engine
+from . import cow_engine, profiler, scheduler
+
+log = logging.getLogger(__name__)
 
 _active_tree = None
 
@@ -10,14 +14,42 @@ _active_tree = None
 class FN_OT_evaluate_all(Operator):
     bl_idname = "file_nodes.evaluate"
     bl_label = "Evaluate File Nodes"
+    bl_description = "Evaluate every File Nodes tree in the file"
 
     def execute(self, context):
-        count, kept_scenes = evaluate_tree(context)
+        count, kept_scenes = evaluate_tree(context, incremental=False)
         scene_names = ", ".join([s.name for s in kept_scenes]) if kept_scenes else "None"
         self.report({"INFO"}, f"Evaluated {count} File Node trees. Kept scenes: {scene_names}")
         return {"FINISHED"}
 
 
+class FN_OT_export_profile(Operator):
+    bl_idname = "file_nodes.export_profile"
+    bl_label = "Export Evaluation Profile"
+    bl_description = "Write the last evaluation profile to a JSON file"
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH', default="file_nodes_profile.json")
+
+    @classmethod
+    def poll(cls, context):
+        return profiler.last_profile() is not None
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        path = bpy.path.abspath(self.filepath)
+        try:
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(profiler.last_profile().to_json())
+        except OSError as exc:
+            self.report({'ERROR'}, f"Could not write profile: {exc}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Profile written to {path}")
+        return {'FINISHED'}
+
+
 class FN_OT_new_tree(Operator):
     bl_idname = "file_nodes.new_tree"
     bl_label = "New File Nodes Tree"
@@ -82,18 +114,14 @@ class FN_OT_trigger_exec(Operator):
         tree = bpy.data.node_groups.get(self.tree_name)
         if not tree:
             return {'CANCELLED'}
-        auto_eval = False
-        prefs = context.preferences.addons.get(ADDON_NAME)
-        if prefs:
-            auto_eval = prefs.preferences.auto_evaluate
+        # Exec values are only set for the duration of this evaluation, so it
+        # has to run now rather than through the auto-evaluate scheduler.
         if self.group_input:
             inp = tree.fn_inputs.inputs.get(self.socket_name)
             if not inp:
                 return {'CANCELLED'}
             inp.exec_value = True
-            auto_evaluate_if_enabled(context=context)
-            if not auto_eval:
-                evaluate_tree(context)
+            evaluate_tree(context, trees=[tree])
             inp.exec_value = False
         else:
             node = tree.nodes.get(self.node_name)
@@ -103,9 +131,7 @@ class FN_OT_trigger_exec(Operator):
             if not sock:
                 return {'CANCELLED'}
             sock.value = True
-            auto_evaluate_if_enabled(context=context)
-            if not auto_eval:
-                evaluate_tree(context)
+            evaluate_tree(context, trees=[tree])
             sock.value = False
         return {'FINISHED'}
 
@@ -125,8 +151,8 @@ class FN_OT_render_scenes(Operator):
         # Set the exec value to true to trigger the render in the process method
         node.inputs.get("Exec").value = True
 
-        # Run a full evaluation
-        evaluate_tree(context)
+        # Evaluate the node's tree and the trees using it as a group
+        evaluate_tree(context, trees=[node.id_data])
 
         # Reset the exec value
         node.inputs.get("Exec").value = False
@@ -147,37 +173,116 @@ class FN_OT_execute_input(Operator):
             return {"CANCELLED"}
 
         node.outputs.get("Exec").value = True
-        evaluate_tree(context)
+        evaluate_tree(context, trees=[node.id_data])
         node.outputs.get("Exec").value = False
 
         return {"FINISHED"}
 
 
 def auto_evaluate_if_enabled(self=None, context=None):
-    """Evaluate all file node trees if the preference is enabled."""
+    """Schedule an evaluation of the tree owning ``self`` if the preference is enabled.
+
+    Requests are debounced by the ``auto_evaluate_delay`` preference; with a
+    delay of zero the evaluation runs immediately. Without an owner every
+    tree is evaluated.
+    """
+    tree = None
     if context is None and isinstance(self, bpy.types.Context):
         context = self
+    elif self is not None:
+        cow_engine.mark_dirty(self)
+        tree = getattr(self, "id_data", None)
     context = context or bpy.context
     prefs = context.preferences.addons.get(ADDON_NAME)
-    if prefs and prefs.preferences.auto_evaluate and _active_tree is None:
-        evaluate_tree(context)
+    if not (prefs and prefs.preferences.auto_evaluate and _active_tree is None):
+        return
+    delay = getattr(prefs.preferences, "auto_evaluate_delay", 0.0)
+    if delay > 0 and scheduler.request(tree, delay):
+        return
+    trees = [tree] if getattr(tree, "bl_idname", "") == "FileNodesTreeType" else None
+    evaluate_tree(context, trees=trees)
+
+
+def schedule_auto_evaluate(trees, context=None):
+    """Queue an evaluation of ``trees`` if the auto-evaluate preference is enabled.
+
+    Meant for handlers, where evaluating on the spot is not safe, so the
+    request always goes through the scheduler. An empty ``trees`` queues
+    every tree. Returns True if an evaluation was requested.
+    """
+    context = context or bpy.context
+    if not _preference(context, "auto_evaluate") or _active_tree is not None:
+        return False
+    prefs = context.preferences.addons.get(ADDON_NAME).preferences
+    delay = getattr(prefs, "auto_evaluate_delay", 0.0)
+    return all([scheduler.request(tree, delay) for tree in trees or [None]])
+
+
+def _preference(context, name):
+    prefs = context.preferences.addons.get(ADDON_NAME) if hasattr(context, "preferences") else None
+    return bool(prefs and getattr(prefs.preferences, name, False))
+
+
+def _file_node_trees():
+    return [t for t in bpy.data.node_groups if getattr(t, "bl_idname", "") == "FileNodesTreeType"]
+
+
+def tree_dependents():
+    """Map each tree (by name) to the names of the trees using it as a group."""
+    dependents = {}
+    for tree in _file_node_trees():
+        for node in getattr(tree, "nodes", []):
+            if getattr(node, "bl_idname", "") != "FNGroupNode":
+                continue
+            group = getattr(node, "node_tree", None)
+            if group is not None:
+                dependents.setdefault(group.name, set()).add(tree.name)
+    return dependents
+
+
+def affected_trees(trees):
+    """Return ``trees`` plus every tree that uses one of them, directly or
+    through nested groups, in ``bpy.data.node_groups`` order."""
+    dependents = tree_dependents()
+    names = set()
+    stack = [t.name for t in trees]
+    while stack:
+        name = stack.pop()
+        if name in names:
+            continue
+        names.add(name)
+        stack.extend(dependents.get(name, ()))
+    return [t for t in _file_node_trees() if t.name in names]
 
 
 ### Evaluator ###
-def evaluate_tree(context):
-    """Evaluate all File Nodes trees in the current blend file."""
+def evaluate_tree(context, incremental=None, trees=None, dependents=True):
+    """Evaluate all File Nodes trees in the current blend file.
+
+    ``incremental`` defaults to the addon preference; pass ``False`` to
+    force every node to run. ``trees`` restricts evaluation to the given
+    trees and, unless ``dependents`` is False, to the trees that use them
+    as groups; disabled trees are still skipped.
+    """
     global _active_tree
+    if incremental is None:
+        incremental = _preference(context, "incremental_evaluate")
     count = 0
     from .data_manager import DataManager # Import DataManager here
     manager = DataManager() # Instantiate DataManager
+    if _preference(context, "profile_evaluation"):
+        manager.profile = profiler.EvaluationProfile()
     all_kept_scenes = [] # New list to collect all kept scenes
 
-    for tree in bpy.data.node_groups:
+    if trees is not None and dependents:
+        trees = affected_trees(trees)
+    for tree in (bpy.data.node_groups if trees is None else trees):
         if getattr(tree, "bl_idname", "") != "FileNodesTreeType":
             continue
         if not getattr(tree, "fn_enabled", True):
             continue
-
+        if scheduler.should_stop():
+            break
 
         ctx = getattr(tree, "fn_inputs", None)
         if ctx:
@@ -185,7 +290,7 @@ def evaluate_tree(context):
             ctx.prepare_eval_scene(context.scene)
 
         _active_tree = tree
-        cow_engine.evaluate_tree(tree, context, manager)
+        cow_engine.evaluate_tree(tree, context, manager, incremental=incremental)
         _active_tree = None
 
         if ctx:
@@ -204,6 +309,14 @@ def evaluate_tree(context):
 
         count += 1
 
+    if manager.copies_deferred:
+        log.info("Lazy copies: %d deferred, %d made, %d avoided",
+                 manager.copies_deferred, manager.copies_materialized, manager.copies_avoided)
+    if manager.writes_made or manager.writes_skipped:
+        log.info("Property writes: %d made, %d skipped as unchanged",
+                 manager.writes_made, manager.writes_skipped)
+    if manager.profile is not None:
+        manager.profile.finish()
     return count, all_kept_scenes
 
 
@@ -220,9 +333,11 @@ def register():
     bpy.utils.register_class(FN_OT_execute_input)
     bpy.utils.register_class(FN_OT_new_tree)
     bpy.utils.register_class(FN_OT_remove_tree)
+    bpy.utils.register_class(FN_OT_export_profile)
 
 
 def unregister():
+    bpy.utils.unregister_class(FN_OT_export_profile)
     bpy.utils.unregister_class(FN_OT_remove_tree)
     bpy.utils.unregister_class(FN_OT_new_tree)
     bpy.utils.unregister_class(FN_OT_render_scenes)
@@ -0,0 +1,149 @@
+"""Optional timing and copy-on-write statistics for tree evaluations."""
+
+import json
+import time
+
+# Profile of the most recent profiled evaluation, if any.
+_last_profile = None
+
+
+class NodeTiming:
+    """Accumulated cost of one node across an evaluation."""
+
+    __slots__ = ("tree", "node", "bl_idname", "calls", "cached", "time")
+
+    def __init__(self, tree, node, bl_idname):
+        self.tree = tree
+        self.node = node
+        self.bl_idname = bl_idname
+        self.calls = 0
+        self.cached = 0
+        self.time = 0.0
+
+
+class SocketCopies:
+    """Copy-on-write copies made while feeding one input socket."""
+
+    __slots__ = ("tree", "node", "socket", "count", "avoided", "types")
+
+    def __init__(self, tree, node, socket):
+        self.tree = tree
+        self.node = node
+        self.socket = socket
+        self.count = 0
+        # Lazy copies handed to this socket that were never written.
+        self.avoided = 0
+        # Datablock type name -> number of copies.
+        self.types = {}
+
+
+class EvaluationProfile:
+    """Collects per-node timings and per-socket copy counts.
+
+    The engine only calls into a profile when one is attached to the
+    DataManager, so an evaluation without profiling pays a single ``None``
+    check per node.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.copies = {}
+        self.trees = []
+        self.writes = 0
+        self.writes_skipped = 0
+        self.total_time = 0.0
+        self._started = time.perf_counter()
+
+    def record_node(self, tree, node, elapsed, cached=False):
+        key = (tree, node.name)
+        timing = self.nodes.get(key)
+        if timing is None:
+            timing = self.nodes[key] = NodeTiming(tree, node.name, getattr(node, "bl_idname", ""))
+        if cached:
+            timing.cached += 1
+        else:
+            timing.calls += 1
+        timing.time += elapsed
+
+    def _socket_copies(self, tree, node_name, socket_name):
+        key = (tree, node_name, socket_name)
+        copies = self.copies.get(key)
+        if copies is None:
+            copies = self.copies[key] = SocketCopies(tree, node_name, socket_name)
+        return copies
+
+    def record_copy(self, tree, node_name, socket_name, data):
+        copies = self._socket_copies(tree, node_name, socket_name)
+        copies.count += 1
+        type_name = type(data).__name__
+        copies.types[type_name] = copies.types.get(type_name, 0) + 1
+
+    def record_avoided(self, tree, node_name, socket_name):
+        self._socket_copies(tree, node_name, socket_name).avoided += 1
+
+    def record_writes(self, written, skipped):
+        self.writes += written
+        self.writes_skipped += skipped
+
+    def record_tree(self, tree):
+        if tree not in self.trees:
+            self.trees.append(tree)
+
+    def finish(self):
+        """Stop the clock and make this the profile returned by last_profile()."""
+        global _last_profile
+        self.total_time = time.perf_counter() - self._started
+        _last_profile = self
+        return self
+
+    @property
+    def copy_count(self):
+        return sum(c.count for c in self.copies.values())
+
+    @property
+    def avoided_count(self):
+        return sum(c.avoided for c in self.copies.values())
+
+    def slowest(self, count=10):
+        """Return the ``count`` node timings with the highest total time."""
+        return sorted(self.nodes.values(), key=lambda t: t.time, reverse=True)[:count]
+
+    def as_dict(self):
+        return {
+            "total_time": self.total_time,
+            "trees": list(self.trees),
+            "nodes": [
+                {
+                    "tree": t.tree,
+                    "node": t.node,
+                    "bl_idname": t.bl_idname,
+                    "calls": t.calls,
+                    "cached": t.cached,
+                    "time": t.time,
+                }
+                for t in sorted(self.nodes.values(), key=lambda t: t.time, reverse=True)
+            ],
+            "copies": [
+                {
+                    "tree": c.tree,
+                    "node": c.node,
+                    "socket": c.socket,
+                    "count": c.count,
+                    "avoided": c.avoided,
+                    "datablocks": dict(c.types),
+                }
+                for c in sorted(self.copies.values(), key=lambda c: c.count, reverse=True)
+            ],
+            "copy_count": self.copy_count,
+            "avoided_count": self.avoided_count,
+            "writes": self.writes,
+            "writes_skipped": self.writes_skipped,
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.as_dict(), indent=indent)
+
+
+def last_profile():
+    """Return the profile of the most recent profiled evaluation, or None."""
+    return _last_profile
@@ -0,0 +1,145 @@
+"""Debounced auto-evaluation.
+
+Property ``update`` callbacks fire for every step of a slider drag or every
+edit of a list node. Instead of evaluating on each of them, ``request``
+records which tree was touched and (re)arms a ``bpy.app.timers`` callback.
+The evaluation runs once no request has arrived for ``delay`` seconds and
+only covers the touched trees.
+"""
+
+import logging
+import time
+
+import bpy
+
+from .common import add_handler, persistent_handler, remove_handler
+
+log = logging.getLogger(__name__)
+
+# Names of the trees touched since the last flush.
+_pending = set()
+# True when a request could not be attributed to a tree.
+_pending_all = False
+# perf_counter() time after which the pending evaluation may run.
+_deadline = 0.0
+_timer_registered = False
+# Set while a flush is evaluating trees; cancel() sets _cancelled so the
+# evaluation loop stops before the next tree.
+_running = False
+_cancelled = False
+
+
+def _timers():
+    return getattr(getattr(bpy, "app", None), "timers", None)
+
+
+def _tree_name(tree):
+    if tree is None or getattr(tree, "bl_idname", "") != "FileNodesTreeType":
+        return None
+    return getattr(tree, "name", None)
+
+
+def request(tree=None, delay=0.25):
+    """Schedule an evaluation of ``tree`` (or of every tree when None).
+
+    Each request pushes the evaluation back to ``delay`` seconds from now,
+    so a burst of updates results in a single evaluation. Returns False if
+    timers are unavailable and the caller should evaluate immediately.
+    """
+    global _pending_all, _deadline, _timer_registered
+    timers = _timers()
+    if timers is None:
+        return False
+
+    name = _tree_name(tree)
+    if name is None:
+        _pending_all = True
+    else:
+        _pending.add(name)
+    _deadline = time.perf_counter() + delay
+
+    if not _timer_registered or not timers.is_registered(_on_timer):
+        timers.register(_on_timer, first_interval=delay)
+        _timer_registered = True
+    return True
+
+
+def is_pending():
+    return _pending_all or bool(_pending)
+
+
+def should_stop():
+    """True when the running flush was cancelled and should not continue."""
+    return _running and _cancelled
+
+
+def cancel():
+    """Drop pending requests and stop a flush that is currently running."""
+    global _pending_all, _timer_registered, _cancelled
+    _pending.clear()
+    _pending_all = False
+    if _running:
+        _cancelled = True
+    timers = _timers()
+    if _timer_registered and timers is not None and timers.is_registered(_on_timer):
+        timers.unregister(_on_timer)
+    _timer_registered = False
+
+
+def flush(context=None):
+    """Evaluate the pending trees now. Returns the number of trees evaluated."""
+    global _pending_all, _running, _cancelled
+    if not is_pending():
+        return 0
+    evaluate_all = _pending_all
+    names = sorted(_pending)
+    _pending.clear()
+    _pending_all = False
+
+    from .operators import evaluate_tree  # operators imports this module
+
+    trees = None
+    if not evaluate_all:
+        trees = [bpy.data.node_groups.get(n) for n in names]
+        trees = [t for t in trees if t is not None]
+        if not trees:
+            return 0
+
+    log.debug("Scheduled evaluation of %s", "all trees" if trees is None else names)
+    _running = True
+    _cancelled = False
+    try:
+        count, _kept = evaluate_tree(context or bpy.context, trees=trees)
+    finally:
+        _running = False
+        _cancelled = False
+    return count
+
+
+def _on_timer():
+    global _timer_registered
+    remaining = _deadline - time.perf_counter()
+    if remaining > 0:
+        # Another request arrived since the timer was armed; wait out the
+        # rest of the quiet period.
+        return remaining
+    _timer_registered = False
+    try:
+        flush()
+    except Exception:
+        log.exception("Scheduled File Nodes evaluation failed")
+    return None
+
+
+@persistent_handler
+def _cancel_handler(*_args):
+    cancel()
+
+
+def register():
+    add_handler(_cancel_handler, ("load_pre",))
+
+
+def unregister():
+    cancel()
+    remove_handler(_cancel_handler, ("load_pre",))
@@ -0,0 +1,164 @@
+import sys
+import os
+import json
+import importlib
+import types
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+PKG_NAME = "fn_batch"
+
+# ---- fake bpy ----
+class _FakeID:
+    def __init__(self, name=""):
+        self.name = name
+    def as_pointer(self):
+        return id(self)
+
+class _Named(list):
+    def get(self, name):
+        return next((item for item in self if item.name == name), None)
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.get(key)
+        return list.__getitem__(self, key)
+
+def _make_bpy_module():
+    bpy = types.ModuleType("bpy")
+    bpy.__path__ = []
+    types_mod = types.ModuleType("bpy.types")
+    for name in ("Scene", "Object", "Collection", "World", "Material", "Mesh", "Camera",
+                 "Light", "Image", "Text", "WorkSpace", "NodeTree", "Node"):
+        setattr(types_mod, name, type(name, (_FakeID,), {}))
+    types_mod.Operator = type("Operator", (), {})
+    types_mod.Panel = type("Panel", (), {})
+    types_mod.PropertyGroup = type("PropertyGroup", (), {})
+    types_mod.Context = type("Context", (), {})
+    bpy.types = types_mod
+    bpy.data = types.SimpleNamespace(node_groups=_Named(), objects=_Named(), filepath="")
+    bpy.context = types.SimpleNamespace()
+    bpy.props = types.SimpleNamespace(
+        BoolProperty=lambda **k: None,
+        IntProperty=lambda **k: None,
+        FloatProperty=lambda **k: None,
+        FloatVectorProperty=lambda **k: None,
+        StringProperty=lambda **k: None,
+        CollectionProperty=lambda **k: None,
+        PointerProperty=lambda **k: None,
+        EnumProperty=lambda **k: None,
+    )
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None, unregister_class=lambda cls: None)
+    bpy.ops = types.SimpleNamespace(wm=types.SimpleNamespace())
+    return bpy
+
+bpy = _make_bpy_module()
+sys.modules["bpy"] = bpy
+sys.modules["bpy.types"] = bpy.types
+pkg = types.ModuleType(PKG_NAME)
+pkg.__path__ = [ROOT]
+pkg.ADDON_NAME = PKG_NAME
+sys.modules[PKG_NAME] = pkg
+batch = importlib.import_module(f"{PKG_NAME}.batch")
+sys.modules.pop("bpy", None)
+sys.modules.pop("bpy.types", None)
+
+
+def setup_module(module):
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy.types
+
+
+class _Input:
+    _props = {"FNSocketInt": "int_value", "FNSocketObject": "object_value"}
+
+    def __init__(self, name, socket_type):
+        self.name = name
+        self.socket_type = socket_type
+        self.int_value = 0
+        self.object_value = None
+
+    def prop_name(self):
+        return self._props.get(self.socket_type)
+
+
+class _Inputs:
+    def __init__(self, inputs):
+        self.inputs = inputs
+
+    def sync_inputs(self, tree):
+        pass
+
+
+class _Tree:
+    bl_idname = "FileNodesTreeType"
+    fn_enabled = True
+
+    def __init__(self, name, inputs=()):
+        self.name = name
+        self.fn_inputs = _Inputs(list(inputs))
+
+
+def _install(monkeypatch, *trees):
+    bpy.data.node_groups[:] = list(trees)
+    calls = []
+
+    def fake_evaluate(context, incremental=None, trees=None, dependents=True):
+        calls.append(([t.name for t in trees], incremental))
+        return len(trees), []
+
+    monkeypatch.setattr(batch.operators, "evaluate_tree", fake_evaluate)
+    return calls
+
+
+# ---- tests ----
+def test_inline_overrides_are_applied_before_evaluation(monkeypatch):
+    frame = _Input("Frame", "FNSocketInt")
+    camera = _Input("Camera", "FNSocketObject")
+    cam_obj = bpy.types.Object("CAM")
+    bpy.data.objects[:] = [cam_obj]
+    calls = _install(monkeypatch, _Tree("Shot", [frame, camera]), _Tree("Other"))
+
+    code = batch.main(["--tree", "Shot", "--set", "Shot:Frame=12", "--set", "Shot:Camera=CAM"], exit=False)
+
+    assert code == batch.EXIT_OK
+    assert frame.int_value == 12
+    assert camera.object_value is cam_obj
+    assert calls == [(["Shot"], False)]
+
+
+def test_job_files_run_in_order(monkeypatch, tmp_path):
+    calls = _install(monkeypatch, _Tree("A"), _Tree("B"))
+    job = tmp_path / "job.json"
+    job.write_text(json.dumps([{"trees": ["B"]}, {"trees": ["A", "B"]}]))
+
+    code = batch.main(["--job", str(job), "--incremental"], exit=False)
+
+    assert code == batch.EXIT_OK
+    assert calls == [(["B"], True), (["A"], True), (["B"], True)]
+
+
+def test_failed_job_does_not_stop_the_rest(monkeypatch, tmp_path):
+    calls = _install(monkeypatch, _Tree("A"))
+    job = tmp_path / "job.json"
+    job.write_text(json.dumps([{"trees": ["Missing"]}, {"trees": ["A"]}]))
+
+    assert batch.main(["--job", str(job)], exit=False) == batch.EXIT_FAILED
+    assert calls == [(["A"], False)]
+
+
+def test_usage_errors(monkeypatch, tmp_path):
+    calls = _install(monkeypatch, _Tree("A"))
+    assert batch.main(["--set", "no-separator"], exit=False) == batch.EXIT_USAGE
+    assert batch.main(["--job", "/nonexistent/job.json"], exit=False) == batch.EXIT_USAGE
+    job = tmp_path / "job.json"
+    job.write_text(json.dumps({"trees": ["A"]}))
+    # Job options would otherwise run against whichever file a job opened last.
+    assert batch.main(["--job", str(job), "--save"], exit=False) == batch.EXIT_USAGE
+    assert calls == []
+
+
+def teardown_module(module):
+    sys.modules.pop("bpy", None)
+    sys.modules.pop("bpy.types", None)
+    for name in list(sys.modules):
+        if name == PKG_NAME or name.startswith(PKG_NAME + "."):
+            sys.modules.pop(name, None)
@@ -0,0 +1,167 @@
+import os
+import gzip
+import importlib.util
+import struct
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+# blend_file has no bpy dependency and is loaded on its own.
+_spec = importlib.util.spec_from_file_location("fn_blend_file", os.path.join(ROOT, "blend_file.py"))
+blend_file = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(blend_file)
+
+
+def _block(code, data=b"", large=False):
+    if large:
+        return struct.pack("<4siQqq", code, 0, 0, len(data), 1) + data
+    return struct.pack("<4siQii", code, len(data), 0, 0, 1) + data
+
+
+def _blend(blocks, large=False):
+    header = b"BLENDER17-01v0500" if large else b"BLENDER-v405"
+    body = b"".join(_block(code, data, large) for code, data in blocks)
+    return header + body + _block(b"ENDB", large=large)
+
+
+def _pad(data):
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _sdna():
+    # struct ID { void *next, *prev; char name[66]; }
+    # struct Library { ID id; char name[1024]; }  (the path, as older files store it)
+    names = [b"*next", b"*prev", b"name[66]", b"id", b"name[1024]"]
+    types = [b"char", b"void", b"ID", b"Library"]
+    data = b"SDNA" + b"NAME" + struct.pack("<i", len(names)) + _pad(b"".join(n + b"\0" for n in names))
+    data += b"TYPE" + struct.pack("<i", len(types)) + _pad(b"".join(t + b"\0" for t in types))
+    data += b"TLEN" + _pad(struct.pack("<4H", 1, 0, 82, 82 + 1024))
+    data += b"STRC" + struct.pack("<i", 2)
+    data += struct.pack("<hh6h", 2, 3, 1, 0, 1, 1, 0, 2)
+    data += struct.pack("<hh4h", 3, 2, 2, 3, 0, 4)
+    return data
+
+
+def _id(name):
+    return b"\0" * 16 + name.ljust(66, b"\0")
+
+
+def _library_block(name, filepath):
+    return (b"LI\0\0", _id(name) + filepath.ljust(1024, b"\0"))
+
+
+_BLOCKS = [
+    (b"REND", b"\0" * 8),
+    (b"OB\0\0", b"\0" * 40),
+    (b"DATA", b"\0" * 16),
+    (b"OB\0\0", b"\0" * 40),
+    (b"ME\0\0", b"\0" * 40),
+    (b"ID\0\0", b"\0" * 40),
+]
+
+
+def test_scan_counts_local_ids(tmp_path):
+    path = tmp_path / "plain.blend"
+    path.write_bytes(_blend(_BLOCKS))
+    summary = blend_file.scan(str(path))
+    assert summary.header.version == 405
+    assert summary.header.pointer_size == 8
+    assert summary.header.compression == "NONE"
+    assert summary.id_counts == {"OB": 2, "ME": 1}
+    assert summary.count("objects") == 2 and summary.count("images") == 0
+
+
+def test_scan_reads_gzip_and_large_block_headers(tmp_path):
+    path = tmp_path / "packed.blend"
+    path.write_bytes(gzip.compress(_blend(_BLOCKS, large=True)))
+    summary = blend_file.scan(str(path))
+    assert (summary.header.version, summary.header.compression) == (500, "GZIP")
+    assert summary.id_counts == {"OB": 2, "ME": 1}
+
+
+@pytest.mark.skipif(blend_file._zstd is None, reason="no zstd module")
+def test_scan_reads_every_zstd_frame(tmp_path):
+    data = _blend([(b"OB\0\0", b"\0" * 40)] * 20)
+    split = len(data) // 2
+    # Blender writes independent frames followed by a skippable seek table.
+    frames = blend_file._zstd.compress(data[:split]) + blend_file._zstd.compress(data[split:])
+    seek_table = struct.pack("<II", 0x184D2A5E, 9) + b"\0" * 9
+    path = tmp_path / "frames.blend"
+    path.write_bytes(frames + seek_table)
+    summary = blend_file.scan(str(path))
+    assert summary.header.compression == "ZSTD"
+    assert summary.id_counts == {"OB": 20}
+
+
+def test_scan_without_endb_is_an_error(tmp_path):
+    path = tmp_path / "truncated.blend"
+    path.write_bytes(_blend(_BLOCKS)[:-30])
+    with pytest.raises(blend_file.IncompleteScan, match="ENDB"):
+        blend_file.scan(str(path))
+
+
+def test_scan_many_reports_errors_per_file(tmp_path):
+    good = tmp_path / "good.blend"
+    good.write_bytes(_blend(_BLOCKS))
+    bad = tmp_path / "bad.blend"
+    bad.write_bytes(b"not a blend file")
+    results = blend_file.scan_many([str(good), str(bad)])
+    assert list(results) == [str(good), str(bad)]
+    assert results[str(good)].id_counts["OB"] == 2
+    assert isinstance(results[str(bad)], blend_file.BlendFileError)
+    with pytest.raises(blend_file.BlendFileError):
+        blend_file.scan(str(bad))
+
+
+def test_names_come_from_id_blocks_via_sdna(tmp_path):
+    path = tmp_path / "names.blend"
+    blocks = [
+        (b"OB\0\0", _id(b"OBChair")),
+        (b"DATA", b"\0" * 16),
+        (b"OB\0\0", _id(b"OBTable")),
+        (b"MA\0\0", _id(b"MAWood")),
+        (b"ID\0\0", _id(b"OBLinked")),
+        (b"DNA1", _sdna()),
+    ]
+    path.write_bytes(gzip.compress(_blend(blocks)))
+    summary = blend_file.scan(str(path), names=True)
+    assert summary.id_names == {"OB": ["Chair", "Table"], "MA": ["Wood"]}
+    names = blend_file.list_names(str(path))
+    assert names["objects"] == ["Chair", "Table"]
+    assert names["materials"] == ["Wood"] and names["images"] == []
+
+
+def test_names_need_a_dna_block(tmp_path):
+    path = tmp_path / "nodna.blend"
+    path.write_bytes(_blend(_BLOCKS))
+    with pytest.raises(blend_file.BlendFileError):
+        blend_file.scan(str(path), names=True)
+
+
+def test_dependency_graph_follows_library_blocks(tmp_path):
+    (tmp_path / "libs").mkdir()
+    textures = tmp_path / "libs" / "textures.blend"
+    textures.write_bytes(_blend([(b"IM\0\0", _id(b"IMWood")), (b"DNA1", _sdna())]))
+    props = tmp_path / "libs" / "props.blend"
+    props.write_bytes(_blend([_library_block(b"LItextures", b"//textures.blend"), (b"DNA1", _sdna())]))
+    shot = tmp_path / "shot.blend"
+    shot.write_bytes(_blend([
+        _library_block(b"LIprops", b"//libs/props.blend"),
+        _library_block(b"LItextures", b"//libs\\textures.blend"),
+        _library_block(b"LImissing", b"//missing.blend"),
+        (b"DNA1", _sdna()),
+    ]))
+
+    graph = blend_file.dependency_graph([str(shot)])
+    assert graph[str(shot)].dependencies == [str(props), str(textures), str(tmp_path / "missing.blend")]
+    assert graph[str(props)].dependencies == [str(textures)]
+    assert isinstance(graph[str(tmp_path / "missing.blend")].error, OSError)
+    order = blend_file.dependency_order(graph, str(shot))
+    assert order == [str(textures), str(props), str(tmp_path / "missing.blend"), str(shot)]
+
+    lines = blend_file.format_tree(graph, str(shot))
+    assert [line.split(" (")[0] for line in lines] == [
+        "shot.blend", "  props.blend", "    textures.blend", "  textures.blend", "  missing.blend",
+    ]
+    assert "error" in lines[-1]
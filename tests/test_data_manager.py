@@ -0,0 +1,211 @@
+import sys
+import os
+import importlib
+import types
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+PKG_NAME = "fn_data_manager"
+
+# ---- fake bpy ----
+class _FakeID:
+    def __init__(self, name):
+        self.name = name
+        self.users = 0
+    def as_pointer(self):
+        return id(self)
+    def copy(self):
+        return type(self)(self.name + ".001")
+
+def _make_bpy_module():
+    bpy = types.ModuleType("bpy")
+    bpy.__path__ = []
+    types_mod = types.ModuleType("bpy.types")
+    for name in ("Scene", "Object", "Collection", "World", "Material", "Mesh", "Camera",
+                 "Light", "Image", "Text", "WorkSpace", "NodeTree"):
+        setattr(types_mod, name, type(name, (_FakeID,), {}))
+    types_mod.Operator = type("Operator", (), {})
+    types_mod.PropertyGroup = type("PropertyGroup", (), {})
+    types_mod.Context = type("Context", (), {})
+    bpy.types = types_mod
+    bpy.data = types.SimpleNamespace(node_groups=[])
+    bpy.props = types.SimpleNamespace(
+        BoolProperty=lambda **k: None,
+        IntProperty=lambda **k: None,
+        FloatProperty=lambda **k: None,
+        FloatVectorProperty=lambda **k: None,
+        StringProperty=lambda **k: None,
+        CollectionProperty=lambda **k: None,
+        PointerProperty=lambda **k: None,
+        EnumProperty=lambda **k: None,
+    )
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None, unregister_class=lambda cls: None)
+    return bpy
+
+bpy = _make_bpy_module()
+sys.modules["bpy"] = bpy
+sys.modules["bpy.types"] = bpy.types
+pkg = types.ModuleType(PKG_NAME)
+pkg.__path__ = [ROOT]
+pkg.ADDON_NAME = PKG_NAME
+sys.modules[PKG_NAME] = pkg
+dm_mod = importlib.import_module(f"{PKG_NAME}.data_manager")
+# Only keep the fake bpy installed while this module's tests run.
+sys.modules.pop("bpy", None)
+sys.modules.pop("bpy.types", None)
+
+
+def setup_module(module):
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy.types
+
+
+# ---- tests ----
+def test_register_same_object_returns_same_id():
+    manager = dm_mod.DataManager()
+    scene = bpy.types.Scene("Scene")
+    first = manager.register_data(scene, initial_refcount=1)
+    second = manager.register_data(scene, initial_refcount=3)
+    assert first == second
+    assert manager._ref_counts[first] == 3
+    assert manager.get_data(first) is scene
+
+
+def test_register_distinct_objects_get_distinct_ids():
+    manager = dm_mod.DataManager()
+    a = bpy.types.Scene("Scene")
+    b = bpy.types.Scene("Scene")
+    assert manager.register_data(a) != manager.register_data(b)
+
+
+def test_cleanup_resets_identity_index():
+    manager = dm_mod.DataManager()
+    scene = bpy.types.Scene("Scene")
+    first = manager.register_data(scene)
+    manager.cleanup()
+    assert manager.get_data(first) is None
+    assert manager.register_data(scene) != first
+
+
+def test_record_writes_notes_the_written_datablock():
+    manager = dm_mod.DataManager()
+    scene = bpy.types.Scene("Scene")
+    manager.record_writes(0, 2, scene)
+    assert manager.written == set()
+    # Writes to nested structs count for the datablock owning them.
+    manager.record_writes(1, 0, types.SimpleNamespace(id_data=scene))
+    assert manager.written == {id(scene)}
+    manager.cleanup()
+    assert manager.written == set()
+
+
+class _Collection(list):
+    def remove(self, data):
+        list.remove(self, data)
+        data.removed = True
+
+
+def _install_data(batch=True):
+    names = {"Scene": "scenes", "Object": "objects", "Image": "images", "Text": "texts",
+             "NodeTree": "node_groups", "WorkSpace": "workspaces", "Mesh": "meshes"}
+    collections = {coll: _Collection() for coll in names.values()}
+    batches = []
+    data = types.SimpleNamespace(**collections)
+    if batch:
+        def batch_remove(ids):
+            batches.append(list(ids))
+            for datablock in ids:
+                datablock.removed = True
+        data.batch_remove = batch_remove
+    bpy.data = data
+    return collections, batches
+
+
+def _owned_copies(manager, *datablocks):
+    for datablock in datablocks:
+        manager._owned_copies.add(manager.register_data(datablock))
+
+
+def test_cleanup_removes_every_orphan_in_one_batch():
+    _collections, batches = _install_data()
+    manager = dm_mod.DataManager()
+    blocks = [getattr(bpy.types, name)(name) for name in ("Image", "Text", "NodeTree", "WorkSpace", "Mesh")]
+    used = bpy.types.Object("Used")
+    used.users = 1
+    _owned_copies(manager, *blocks, used)
+    manager.cleanup()
+    assert len(batches) == 1
+    assert set(map(id, batches[0])) == set(map(id, blocks))
+    assert not getattr(used, "removed", False)
+
+
+def test_cleanup_without_batch_remove_uses_type_table():
+    collections, _batches = _install_data(batch=False)
+    manager = dm_mod.DataManager()
+    image = bpy.types.Image("Image")
+    tree = type("CustomTree", (bpy.types.NodeTree,), {})("Tree")
+    collections["images"].append(image)
+    collections["node_groups"].append(tree)
+    _owned_copies(manager, image, tree)
+    manager.cleanup()
+    assert image.removed and tree.removed
+    assert not collections["images"] and not collections["node_groups"]
+
+
+def test_removing_one_by_one_survives_rejected_datablocks():
+    collections, _batches = _install_data(batch=False)
+    def reject(data):
+        raise TypeError("expected an Image type")
+    collections["images"].remove = reject
+    manager = dm_mod.DataManager()
+    image, text = bpy.types.Image("Image"), bpy.types.Text("Text")
+    collections["images"].append(image)
+    collections["texts"].append(text)
+    _owned_copies(manager, image, text)
+    manager.cleanup()
+    assert text.removed and not getattr(image, "removed", False)
+
+
+class _RemovedObject(_FakeID):
+    def as_pointer(self):
+        raise ReferenceError("StructRNA has been removed")
+
+
+def test_cleanup_removes_released_datablocks_in_use():
+    _collections, batches = _install_data()
+    manager = dm_mod.DataManager()
+    obj, mesh = bpy.types.Object("Rock"), bpy.types.Mesh("Rock")
+    obj.users = mesh.users = 1
+    manager.release([("objects", obj), ("meshes", mesh), ("objects", _RemovedObject("Gone"))])
+    manager.cleanup()
+    assert batches == [[obj, mesh]]
+    assert manager.last_removed == [id(obj), id(mesh)]
+    manager.cleanup()
+    assert len(batches) == 1
+
+
+def test_cleanup_skips_copies_removed_during_evaluation():
+    _collections, batches = _install_data()
+    manager = dm_mod.DataManager()
+
+    class _DyingScene(bpy.types.Scene):
+        gone = False
+        def __getattribute__(self, name):
+            if object.__getattribute__(self, "gone") and name not in ("gone", "__class__"):
+                raise ReferenceError("StructRNA has been removed")
+            return object.__getattribute__(self, name)
+        def get(self, key):
+            return None
+
+    dying, kept = _DyingScene("Dying"), bpy.types.Text("Kept")
+    _owned_copies(manager, dying, kept)
+    dying.gone = True
+    manager.cleanup()
+    assert batches == [[kept]]
+
+
+def teardown_module(module):
+    sys.modules.pop("bpy", None)
+    sys.modules.pop("bpy.types", None)
+    for name in list(sys.modules):
+        if name == PKG_NAME or name.startswith(PKG_NAME + "."):
+            sys.modules.pop(name, None)
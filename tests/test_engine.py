@@ -0,0 +1,840 @@
+import sys
+import os
+import importlib
+import types
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+PKG_NAME = "fn_engine"
+
+# ---- fake bpy ----
+class _FakeID:
+    def __init__(self, name):
+        self._name = name
+        self.removed = False
+        self.users = 0
+    @property
+    def name(self):
+        if self.removed:
+            raise ReferenceError("StructRNA has been removed")
+        return self._name
+    def as_pointer(self):
+        return id(self)
+    def copy(self):
+        # Copies count as used so cleanup keeps them, like a linked scene.
+        dup = bpy.data.scenes.new(self._name + ".001")
+        dup.users = 1
+        return dup
+
+class _DataCollection(dict):
+    def __init__(self, cls):
+        super().__init__()
+        self.cls = cls
+    def new(self, name):
+        obj = self.cls(name)
+        self[name] = obj
+        return obj
+    def remove(self, obj):
+        self.pop(obj.name, None)
+        obj.removed = True
+    def __iter__(self):
+        return iter(self.values())
+
+def _make_bpy_module():
+    bpy = types.ModuleType("bpy")
+    bpy.__path__ = []
+    class Scene(_FakeID):
+        pass
+    types_mod = types.ModuleType("bpy.types")
+    types_mod.Scene = Scene
+    for name in ("Object", "Collection", "World", "Material", "Mesh", "Camera", "Light",
+                 "Image", "Text", "WorkSpace", "NodeTree"):
+        setattr(types_mod, name, type(name, (_FakeID,), {}))
+    types_mod.Operator = type("Operator", (), {})
+    types_mod.PropertyGroup = type("PropertyGroup", (), {})
+    types_mod.Context = type("Context", (), {})
+    bpy.types = types_mod
+    bpy.data = types.SimpleNamespace(scenes=_DataCollection(Scene), node_groups=[])
+    bpy.props = types.SimpleNamespace(
+        BoolProperty=lambda **k: None,
+        IntProperty=lambda **k: None,
+        FloatProperty=lambda **k: None,
+        FloatVectorProperty=lambda **k: None,
+        StringProperty=lambda **k: None,
+        CollectionProperty=lambda **k: None,
+        PointerProperty=lambda **k: None,
+        EnumProperty=lambda **k: None,
+    )
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None, unregister_class=lambda cls: None)
+    bpy.context = types.SimpleNamespace(scene=None)
+    return bpy
+
+bpy = _make_bpy_module()
+sys.modules["bpy"] = bpy
+sys.modules["bpy.types"] = bpy.types
+pkg = types.ModuleType(PKG_NAME)
+pkg.__path__ = [ROOT]
+pkg.ADDON_NAME = PKG_NAME
+sys.modules[PKG_NAME] = pkg
+cow_mod = importlib.import_module(f"{PKG_NAME}.cow_engine")
+dm_mod = importlib.import_module(f"{PKG_NAME}.data_manager")
+# Only keep the fake bpy installed while this module's tests run.
+sys.modules.pop("bpy", None)
+sys.modules.pop("bpy.types", None)
+
+# ---- fake node system ----
+class FakeSocket:
+    def __init__(self, node, name, bl_idname, value=None):
+        self.node = node
+        self.name = name
+        self.identifier = name
+        self.bl_idname = bl_idname
+        self.is_linked = False
+        self.links = []
+        self.is_multi_input = False
+        self.is_mutable = True
+        self.value = value
+
+class FakeLink:
+    def __init__(self, from_socket):
+        self.from_node = from_socket.node
+        self.from_socket = from_socket
+
+class FakeNode:
+    def __init__(self, tree, name, bl_idname):
+        self.id_data = tree
+        self.name = name
+        self.bl_idname = bl_idname
+        self.inputs = []
+        self.outputs = []
+        self.calls = 0
+        tree.nodes.append(self)
+
+    def link(self, input_name, upstream, output_name):
+        sock = next(s for s in self.inputs if s.name == input_name)
+        src = next(s for s in upstream.outputs if s.name == output_name)
+        link = FakeLink(src)
+        sock.is_linked = True
+        sock.links.append(link)
+        src.is_linked = True
+        src.links.append(link)
+
+    def unlink(self, input_name):
+        sock = next(s for s in self.inputs if s.name == input_name)
+        for link in sock.links:
+            link.from_socket.links.remove(link)
+            link.from_socket.is_linked = bool(link.from_socket.links)
+        sock.links.clear()
+        sock.is_linked = False
+
+class UpperNode(FakeNode):
+    def __init__(self, tree, name, value):
+        super().__init__(tree, name, "FNUpper")
+        self.inputs.append(FakeSocket(self, "String", "FNSocketString", value))
+        self.outputs.append(FakeSocket(self, "String", "FNSocketString"))
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        return {"String": (inputs.get("String") or "").upper()}
+
+class JoinNode(FakeNode):
+    def __init__(self, tree, name):
+        super().__init__(tree, name, "FNJoin")
+        self.inputs.append(FakeSocket(self, "A", "FNSocketString"))
+        self.inputs.append(FakeSocket(self, "B", "FNSocketString"))
+        self.outputs.append(FakeSocket(self, "String", "FNSocketString"))
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        return {"String": f"{inputs.get('A')}{inputs.get('B')}"}
+
+class NewSceneNode(FakeNode):
+    def __init__(self, tree, name):
+        super().__init__(tree, name, "FNNewScene")
+        self.inputs.append(FakeSocket(self, "Name", "FNSocketString"))
+        self.outputs.append(FakeSocket(self, "Scene", "FNSocketScene"))
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        name = inputs.get("Name") or "Scene"
+        scene = bpy.data.scenes.get(name) or bpy.data.scenes.new(name)
+        return {"Scene": scene}
+
+class OutputNode(FakeNode):
+    def __init__(self, tree, name):
+        super().__init__(tree, name, "FNOutputScenesNode")
+        sock = FakeSocket(self, "Scenes", "FNSocketSceneList")
+        sock.is_mutable = False
+        self.inputs.append(sock)
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        return {}
+
+class FakeTree:
+    bl_idname = "FileNodesTreeType"
+    def __init__(self):
+        self.nodes = []
+
+def build_tree():
+    bpy.data.scenes.clear()
+    cow_mod.invalidate()
+    tree = FakeTree()
+    left = UpperNode(tree, "Left", "a")
+    right = UpperNode(tree, "Right", "b")
+    join = JoinNode(tree, "Join")
+    join.link("A", left, "String")
+    join.link("B", right, "String")
+    new = NewSceneNode(tree, "New Scene")
+    new.link("Name", join, "String")
+    out = OutputNode(tree, "Output")
+    out.link("Scenes", new, "Scene")
+    return tree, left, right, join, new, out
+
+def _calls(*nodes):
+    return [n.calls for n in nodes]
+
+# ---- tests ----
+def test_unchanged_tree_reuses_cached_outputs():
+    tree, left, right, join, new, out = build_tree()
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(left, right, join, new) == [1, 1, 1, 1]
+    # Output nodes always run.
+    assert out.calls == 2
+
+def test_full_evaluation_reruns_every_node():
+    tree, left, right, join, new, out = build_tree()
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    cow_mod.evaluate_tree(tree, None)
+    assert _calls(left, right, join, new, out) == [2, 2, 2, 2, 2]
+
+def test_socket_change_reruns_downstream_cone_only():
+    tree, left, right, join, new, out = build_tree()
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    left.inputs[0].value = "c"
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(left, right, join, new) == [2, 1, 2, 2]
+    assert set(bpy.data.scenes.keys()) == {"AB", "CB"}
+
+def test_unchanged_upstream_output_stops_propagation():
+    tree, left, right, join, new, out = build_tree()
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    left.inputs[0].value = "A"  # uppercases to the same string
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(left, right, join, new) == [2, 1, 1, 1]
+
+def test_mark_dirty_forces_rerun():
+    tree, left, right, join, new, out = build_tree()
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    cow_mod.mark_dirty(right.inputs[0])
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(left, right, join, new) == [1, 2, 1, 1]
+
+def test_removed_datablock_invalidates_cache():
+    tree, left, right, join, new, out = build_tree()
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    bpy.data.scenes.remove(bpy.data.scenes["AB"])
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(left, right, join, new) == [1, 1, 1, 2]
+    assert "AB" in bpy.data.scenes
+
+class PassNode(FakeNode):
+    def __init__(self, tree, name):
+        super().__init__(tree, name, "FNPass")
+        self.inputs.append(FakeSocket(self, "String", "FNSocketString"))
+        self.outputs.append(FakeSocket(self, "String", "FNSocketString"))
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        return {"String": (inputs.get("String") or "") + "."}
+
+class CollectNode(FakeNode):
+    def __init__(self, tree, name):
+        super().__init__(tree, name, "FNOutputScenesNode")
+        self.inputs.append(FakeSocket(self, "Scenes", "FNSocketString"))
+        self.result = None
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        self.result = inputs.get("Scenes")
+        return {}
+
+def test_plan_orders_dependencies_first():
+    tree, left, right, join, new, out = build_tree()
+    plan = cow_mod.compile_plan(tree)
+    order = [step.node for step in plan.steps]
+    assert order.index(left) < order.index(join)
+    assert order.index(right) < order.index(join)
+    assert order.index(join) < order.index(new) < order.index(out)
+
+def test_deep_chain_does_not_recurse():
+    cow_mod.invalidate()
+    tree = FakeTree()
+    depth = sys.getrecursionlimit() * 2
+    prev = UpperNode(tree, "Start", "x")
+    for i in range(depth):
+        node = PassNode(tree, f"Pass {i}")
+        node.link("String", prev, "String")
+        prev = node
+    out = CollectNode(tree, "Output")
+    out.link("Scenes", prev, "String")
+    cow_mod.evaluate_tree(tree, None)
+    assert out.result == "X" + "." * depth
+
+def test_cycle_links_are_dropped_at_plan_time():
+    cow_mod.invalidate()
+    tree = FakeTree()
+    a = PassNode(tree, "A")
+    b = PassNode(tree, "B")
+    a.link("String", b, "String")
+    b.link("String", a, "String")
+    out = CollectNode(tree, "Output")
+    out.link("Scenes", a, "String")
+    plan = cow_mod.compile_plan(tree)
+    assert [step.node for step in plan.steps] == [b, a, out]
+    cow_mod.evaluate_tree(tree, None)
+    assert (a.calls, b.calls) == (1, 1)
+    assert out.result == ".."
+
+def test_plan_is_cached_until_topology_changes():
+    tree, left, right, join, new, out = build_tree()
+    cow_mod.evaluate_tree(tree, None)
+    plan = cow_mod.get_plan(tree)
+    cow_mod.evaluate_tree(tree, None)
+    assert cow_mod.get_plan(tree) is plan
+
+    # An update without a topology change keeps the plan.
+    cow_mod.invalidate_plan(tree)
+    assert cow_mod.get_plan(tree) is plan
+
+    out.inputs[0].is_mutable = True
+    cow_mod.invalidate_plan(tree)
+    replanned = cow_mod.get_plan(tree)
+    assert replanned is not plan
+
+    extra = UpperNode(tree, "Extra", "z")
+    join.unlink("B")
+    join.link("B", extra, "String")
+    cow_mod.invalidate_plan(tree)
+    assert extra in [step.node for step in cow_mod.get_plan(tree).steps]
+    cow_mod.evaluate_tree(tree, None)
+    assert "AZ" in bpy.data.scenes
+
+class _NoFormat(str):
+    def __str__(self):
+        raise AssertionError("value was formatted")
+    __repr__ = __str__
+
+def test_default_log_level_does_not_format_values():
+    tree, left, right, join, new, out = build_tree()
+    left.inputs[0].value = _NoFormat("a")
+    cow_mod.evaluate_tree(tree, None)
+    assert left.calls == 1
+
+class RenameNode(FakeNode):
+    def __init__(self, tree, name, new_name):
+        super().__init__(tree, name, "FNRename")
+        self.inputs.append(FakeSocket(self, "Scene", "FNSocketScene"))
+        self.outputs.append(FakeSocket(self, "Scene", "FNSocketScene"))
+        self.new_name = new_name
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        scene = inputs.get("Scene")
+        if scene is not None:
+            scene._name = self.new_name
+        return {"Scene": scene}
+
+def test_profile_records_timings_and_copies():
+    profiler = importlib.import_module(f"{PKG_NAME}.profiler")
+    tree, left, right, join, new, out = build_tree()
+    rename_a = RenameNode(tree, "Rename A", "A")
+    rename_b = RenameNode(tree, "Rename B", "B")
+    rename_a.link("Scene", new, "Scene")
+    rename_b.link("Scene", new, "Scene")
+    out.inputs[0].is_multi_input = True
+    out.unlink("Scenes")
+    out.link("Scenes", rename_a, "Scene")
+    out.link("Scenes", rename_b, "Scene")
+
+    manager = dm_mod.DataManager()
+    manager.profile = profiler.EvaluationProfile()
+    cow_mod.evaluate_tree(tree, None, manager)
+    cow_mod.evaluate_tree(tree, None, manager, incremental=True)
+    report = manager.profile.finish().as_dict()
+
+    assert profiler.last_profile() is manager.profile
+    nodes = {entry["node"]: entry for entry in report["nodes"]}
+    assert nodes["Join"]["calls"] == 1 and nodes["Join"]["cached"] == 1
+    assert nodes["Output"]["calls"] == 2
+    copies = {(c["node"], c["socket"]): c for c in report["copies"]}
+    assert copies[("Rename A", "Scene")]["count"] == 1
+    assert copies[("Rename A", "Scene")]["datablocks"] == {"Scene": 1}
+    assert report["copy_count"] == 1
+    assert '"copy_count": 1' in manager.profile.to_json()
+
+class GroupOutputNode(FakeNode):
+    def __init__(self, tree, name):
+        super().__init__(tree, name, "NodeGroupOutput")
+        self.inputs.append(FakeSocket(self, "String", "FNSocketString"))
+
+class GroupNode(FakeNode):
+    """Evaluates ``group`` with the caller's manager, like FNGroupNode."""
+    def __init__(self, tree, name, group):
+        super().__init__(tree, name, "FNGroup")
+        self.group = group
+        sock = FakeSocket(self, "Scene", "FNSocketScene")
+        sock.is_mutable = False
+        self.inputs.append(sock)
+        self.outputs.append(FakeSocket(self, "Scene", "FNSocketScene"))
+        self.depths = []
+        self.result = None
+
+    def external_state(self, inputs):
+        return cow_mod.group_state(self.group, self, inputs)
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        self.depths.append(manager.frame_depth)
+        outputs = cow_mod.evaluate_group(self.group, context, manager, self)
+        self.result = manager.resolve(outputs.get("String"))
+        return {"Scene": inputs.get("Scene")}
+
+def test_nested_group_evaluation_defers_cleanup():
+    tree, left, right, join, new, out = build_tree()
+    group = FakeTree()
+    inner = UpperNode(group, "Inner", "g")
+    group_out = GroupOutputNode(group, "Group Output")
+    group_out.link("String", inner, "String")
+    group_node = GroupNode(tree, "Group", group)
+    group_node.link("Scene", new, "Scene")
+    rename = RenameNode(tree, "Rename", "Renamed")
+    rename.link("Scene", new, "Scene")
+    out.inputs[0].is_multi_input = True
+    out.unlink("Scenes")
+    out.link("Scenes", group_node, "Scene")
+    out.link("Scenes", rename, "Scene")
+
+    manager = dm_mod.DataManager()
+    cleanups = []
+    original_cleanup = manager.cleanup
+    def counting_cleanup():
+        cleanups.append(len(manager._data_store))
+        original_cleanup()
+    manager.cleanup = counting_cleanup
+
+    outputs = cow_mod.evaluate_tree(tree, None, manager)
+
+    assert outputs == {}
+    assert group_node.depths == [1]
+    assert group_node.result == "G"
+    # Only the outer evaluation cleans up, after every node has run.
+    assert len(cleanups) == 1 and cleanups[0] > 0
+    assert manager.frame_depth == 0
+    # The outer tree's data survived the group's evaluation.
+    assert rename.calls == 1
+    assert "Renamed" in [sc._name for sc in bpy.data.scenes]
+    assert cow_mod.evaluate_tree(group, None, dm_mod.DataManager()) != {}
+
+class FrameNode(FakeNode):
+    """Property node opting into lazy copies, like FNSceneProps."""
+    lazy_copy = True
+
+    def __init__(self, tree, name, start):
+        super().__init__(tree, name, "FNFrame")
+        self.inputs.append(FakeSocket(self, "Scene", "FNSocketScene"))
+        self.outputs.append(FakeSocket(self, "Scene", "FNSocketScene"))
+        self.start = start
+        self.received = None
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        scene = self.received = inputs.get("Scene")
+        if scene is not None:
+            scene.frame_start = self.start
+        return {"Scene": scene}
+
+def _lazy_tree(start):
+    tree, left, right, join, new, out = build_tree()
+    bpy.data.scenes.new("AB").frame_start = 1
+    frame = FrameNode(tree, "Frame", start)
+    frame.link("Scene", new, "Scene")
+    rename = RenameNode(tree, "Rename", "Renamed")
+    rename.link("Scene", new, "Scene")
+    out.inputs[0].is_multi_input = True
+    out.unlink("Scenes")
+    out.link("Scenes", frame, "Scene")
+    out.link("Scenes", rename, "Scene")
+    return tree, frame, rename
+
+def test_lazy_copy_skips_unwritten_copy():
+    profiler = importlib.import_module(f"{PKG_NAME}.profiler")
+    tree, frame, rename = _lazy_tree(start=1)
+    manager = dm_mod.DataManager()
+    manager.profile = profiler.EvaluationProfile()
+    cow_mod.evaluate_tree(tree, None, manager)
+
+    assert type(frame.received) is not bpy.types.Scene
+    assert (manager.copies_deferred, manager.copies_avoided) == (1, 1)
+    assert manager.lazy_consumers == {("", "Frame", "Scene"): False}
+    # The unwritten scene was passed on, so Rename still had to copy.
+    names = sorted(sc._name for sc in bpy.data.scenes)
+    assert names == ["AB", "Renamed"]
+    assert manager.profile.avoided_count == 1
+
+def test_lazy_copy_materializes_on_write():
+    tree, frame, rename = _lazy_tree(start=7)
+    manager = dm_mod.DataManager()
+    cow_mod.evaluate_tree(tree, None, manager)
+
+    assert (manager.copies_deferred, manager.copies_materialized) == (1, 1)
+    assert manager.lazy_consumers == {("", "Frame", "Scene"): True}
+    scenes = {sc._name: sc for sc in bpy.data.scenes}
+    assert scenes["AB.001"].frame_start == 7
+    # Rename was the last consumer and could edit the original in place.
+    assert scenes["Renamed"].frame_start == 1
+
+def test_reused_lazy_pass_through_is_still_shared():
+    tree, left, right, join, new, out = build_tree()
+    bpy.data.scenes.new("AB").frame_start = 1
+    frame = FrameNode(tree, "Frame", 1)
+    frame.link("Scene", new, "Scene")
+    rename = RenameNode(tree, "Rename", "Renamed2")
+    rename.link("Scene", frame, "Scene")
+    out.inputs[0].is_multi_input = True
+    out.link("Scenes", rename, "Scene")
+
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    cow_mod.mark_dirty(rename)
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    # Frame was reused and still passed the scene Output reads, so
+    # Rename had to copy it instead of renaming it in place.
+    assert (frame.calls, rename.calls) == (1, 2)
+    assert bpy.data.scenes["AB"]._name == "AB"
+
+class StampNode(FakeNode):
+    """Reads an outside source like FNReadBlendNode reads a file."""
+    def __init__(self, tree, name):
+        super().__init__(tree, name, "FNStamp")
+        self.inputs.append(FakeSocket(self, "String", "FNSocketString", "path"))
+        self.outputs.append(FakeSocket(self, "Scene", "FNSocketScene"))
+        self.stamp = 1
+
+    def external_state(self, inputs):
+        return (inputs["String"], self.stamp)
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        return {"Scene": bpy.data.scenes.get("AB")}
+
+def test_external_state_is_part_of_the_signature():
+    tree, left, right, join, new, out = build_tree()
+    stamp = StampNode(tree, "Stamp")
+    rename = RenameNode(tree, "Rename", "AB")
+    rename.link("Scene", stamp, "Scene")
+    out.inputs[0].is_multi_input = True
+    out.link("Scenes", rename, "Scene")
+    for _ in range(3):
+        cow_mod.evaluate_tree(tree, None, incremental=True)
+    # Unchanged state: the node and everything after it are reused.
+    assert (stamp.calls, rename.calls) == (1, 1)
+    stamp.stamp = 2
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert (stamp.calls, rename.calls) == (2, 2)
+
+class PickNode(FakeNode):
+    """Pure node like FNSwitch."""
+    pure = True
+
+    def __init__(self, tree, name, switch):
+        super().__init__(tree, name, "FNPick")
+        self.inputs.append(FakeSocket(self, "Switch", "FNSocketBool", switch))
+        self.inputs.append(FakeSocket(self, "A", "FNSocketString", "first"))
+        self.inputs.append(FakeSocket(self, "B", "FNSocketString", "second"))
+        self.outputs.append(FakeSocket(self, "String", "FNSocketString"))
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        return {"String": inputs["B"] if inputs["Switch"] else inputs["A"]}
+
+def test_pure_node_memoizes_earlier_inputs():
+    tree, left, right, join, new, out = build_tree()
+    pick = PickNode(tree, "Pick", False)
+    new.unlink("Name")
+    new.link("Name", pick, "String")
+    for switch in (False, True, False, True):
+        pick.inputs[0].value = switch
+        cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert pick.calls == 2
+    assert set(bpy.data.scenes.keys()) == {"first", "second"}
+    # Full evaluations do not read the memo.
+    cow_mod.evaluate_tree(tree, None)
+    assert pick.calls == 3
+    # Node settings are not part of the key; marking the node dirty drops it.
+    cow_mod.mark_dirty(pick)
+    pick.inputs[0].value = False
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert pick.calls == 4
+
+class PickSceneNode(FakeNode):
+    """Pure node taking a mutable scene it never writes to."""
+    pure = True
+
+    def __init__(self, tree, name, switch):
+        super().__init__(tree, name, "FNPickScene")
+        self.inputs.append(FakeSocket(self, "Scene", "FNSocketScene"))
+        self.inputs.append(FakeSocket(self, "Switch", "FNSocketBool", switch))
+        self.outputs.append(FakeSocket(self, "String", "FNSocketString"))
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        return {"String": inputs["Scene"].name + ("!" if inputs["Switch"] else "")}
+
+def test_memo_hit_does_not_copy_inputs(monkeypatch):
+    tree, left, right, join, new, out = build_tree()
+    pick = PickSceneNode(tree, "Pick", False)
+    pick.link("Scene", new, "Scene")
+    reader = SceneNameNode(tree, "Scene Name")
+    reader.link("Scene", new, "Scene")
+    collect = CollectNode(tree, "Collect")
+    collect.inputs[0].is_multi_input = True
+    collect.link("Scenes", pick, "String")
+    collect.link("Scenes", reader, "String")
+    for switch in (False, True):
+        pick.inputs[1].value = switch
+        cow_mod.evaluate_tree(tree, None, incremental=True)
+
+    copies = []
+    request = dm_mod.DataManager.request_mutable_data
+    def counting(self, data_id, *args, **kwargs):
+        result = request(self, data_id, *args, **kwargs)
+        if result != data_id:
+            copies.append(data_id)
+        return result
+    monkeypatch.setattr(dm_mod.DataManager, "request_mutable_data", counting)
+    pick.inputs[1].value = False
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert pick.calls == 2 and copies == []
+
+def test_changed_datablock_changes_memo_key():
+    cow_mod.invalidate()
+    scene = bpy.data.scenes.new("Memo")
+    before = cow_mod._memo_key("tree", "Pick", {"Scene": scene, "Names": ["a"]})
+    assert before == cow_mod._memo_key("tree", "Pick", {"Scene": scene, "Names": ["a"]})
+    cow_mod.note_changed(scene)
+    assert cow_mod._memo_key("tree", "Pick", {"Scene": scene, "Names": ["a"]}) != before
+    assert cow_mod._memo_key("tree", "Pick", {"Value": object()}) is None
+
+class _FakeVector:
+    """Stands in for mathutils.Vector / bpy_prop_array: numeric, not a list."""
+    def __init__(self, *values):
+        self._values = list(values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+def test_numeric_sequence_is_memoizable():
+    key = cow_mod._memo_key("tree", "Separate", {"Vector": _FakeVector(1.0, 2.0, 3.0)})
+    assert key is not None
+    assert key == cow_mod._memo_key("tree", "Separate", {"Vector": _FakeVector(1.0, 2.0, 3.0)})
+    assert key != cow_mod._memo_key("tree", "Separate", {"Vector": _FakeVector(1.0, 2.0, 4.0)})
+    assert cow_mod._memo_key("tree", "Separate", {"Vector": _FakeVector(1.0, object())}) is None
+
+class SceneNameNode(FakeNode):
+    def __init__(self, tree, name):
+        super().__init__(tree, name, "FNSceneName")
+        sock = FakeSocket(self, "Scene", "FNSocketScene")
+        sock.is_mutable = False
+        self.inputs.append(sock)
+        self.outputs.append(FakeSocket(self, "String", "FNSocketString"))
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        return {"String": inputs["Scene"].name}
+
+def _depsgraph(*ids):
+    return types.SimpleNamespace(updates=[types.SimpleNamespace(id=i) for i in ids])
+
+def test_depsgraph_update_flags_consuming_nodes_only():
+    tree, left, right, join, new, out = build_tree()
+    reader = SceneNameNode(tree, "Scene Name")
+    reader.link("Scene", new, "Scene")
+    collect = CollectNode(tree, "Collect")
+    collect.link("Scenes", reader, "String")
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    scene = bpy.data.scenes["AB"]
+
+    # The first update reports the scene New Scene just wrote; ignore it.
+    cow_mod._depsgraph_update(None, _depsgraph(scene))
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(new, reader) == [1, 1]
+
+    # A later edit (e.g. in the viewport) re-runs only the reader.
+    cow_mod._depsgraph_update(None, _depsgraph(bpy.data.scenes.new("Unrelated")))
+    cow_mod._depsgraph_update(None, _depsgraph(scene))
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(left, right, join, new, reader) == [1, 1, 1, 1, 2]
+    assert collect.result == "AB"
+
+def test_depsgraph_update_schedules_the_consuming_tree(monkeypatch):
+    tree, left, right, join, new, out = build_tree()
+    reader = SceneNameNode(tree, "Scene Name")
+    reader.link("Scene", new, "Scene")
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    cow_mod._depsgraph_update(None, _depsgraph(bpy.data.scenes["AB"]))
+
+    operators = importlib.import_module(f"{PKG_NAME}.operators")
+    requests = []
+    monkeypatch.setattr(operators.scheduler, "request", lambda t, delay: requests.append((t, delay)) or True)
+    monkeypatch.setattr(bpy.data, "node_groups", [tree])
+    prefs = types.SimpleNamespace(auto_evaluate=False, auto_evaluate_delay=0.5)
+    addons = {PKG_NAME: types.SimpleNamespace(preferences=prefs)}
+    monkeypatch.setattr(bpy, "context", types.SimpleNamespace(preferences=types.SimpleNamespace(addons=addons)))
+
+    # Edits reaching no node, or with the preference off, queue nothing.
+    cow_mod._depsgraph_update(None, _depsgraph(bpy.data.scenes.new("Unrelated")))
+    cow_mod._depsgraph_update(None, _depsgraph(bpy.data.scenes["AB"]))
+    assert requests == []
+    prefs.auto_evaluate = True
+    cow_mod._depsgraph_update(None, _depsgraph(bpy.data.scenes["AB"]))
+    assert requests == [(tree, 0.5)]
+
+def test_group_instances_keep_separate_incremental_caches():
+    tree, left, right, join, new, out = build_tree()
+    group = FakeTree()
+    inner = UpperNode(group, "Inner", "g")
+    group_out = GroupOutputNode(group, "Group Output")
+    group_out.link("String", inner, "String")
+    first = GroupNode(tree, "First", group)
+    second = GroupNode(tree, "Second", group)
+    collect = CollectNode(tree, "Collect")
+    collect.inputs[0].is_multi_input = True
+    collect.link("Scenes", first, "Scene")
+    collect.link("Scenes", second, "Scene")
+
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    cow_mod.evaluate_tree(group, None, incremental=True)
+    assert inner.calls == 3
+    # Each instance and the standalone run reuse their own results.
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    cow_mod.evaluate_tree(group, None, incremental=True)
+    assert inner.calls == 3 and first.result == second.result == "G"
+
+    # A flag on the inner node reaches every cache holding its results.
+    cow_mod.mark_dirty(inner)
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert inner.calls == 5
+    cow_mod.evaluate_tree(group, None, incremental=True)
+    assert inner.calls == 6
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert inner.calls == 6
+
+def test_invalidate_drops_nested_group_caches():
+    tree, left, right, join, new, out = build_tree()
+    group = FakeTree()
+    inner = UpperNode(group, "Inner", "g")
+    group_out = GroupOutputNode(group, "Group Output")
+    group_out.link("String", inner, "String")
+    nested = FakeTree()
+    nested_node = GroupNode(nested, "Nested", group)
+    GroupOutputNode(nested, "Group Output")
+    outer_group = GroupNode(tree, "Outer", nested)
+    out.inputs[0].is_multi_input = True
+    out.link("Scenes", outer_group, "Scene")
+    collect = CollectNode(nested, "Collect")
+    collect.link("Scenes", nested_node, "Scene")
+
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert inner.calls == 1
+    # Editing the outer tree drops the caches of the groups inside it.
+    cow_mod.invalidate(tree)
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert inner.calls == 2
+    # So does editing a group tree used further down.
+    cow_mod.invalidate(group)
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert inner.calls == 3
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert inner.calls == 3
+
+def test_unchanged_group_is_reused_with_its_consumers():
+    tree, left, right, join, new, out = build_tree()
+    group = FakeTree()
+    inner = UpperNode(group, "Inner", "g")
+    group_out = GroupOutputNode(group, "Group Output")
+    group_out.link("String", inner, "String")
+    group_node = GroupNode(tree, "Group", group)
+    group_node.link("Scene", new, "Scene")
+    rename = RenameNode(tree, "Rename", "AB")
+    rename.link("Scene", group_node, "Scene")
+    out.inputs[0].is_multi_input = True
+    out.link("Scenes", rename, "Scene")
+
+    for _ in range(3):
+        cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert (group_node.calls, inner.calls, rename.calls) == (1, 1, 1)
+    # An edit inside the group changes its state.
+    inner.inputs[0].value = "h"
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert (group_node.calls, inner.calls, rename.calls) == (2, 2, 2)
+    assert group_node.result == "H"
+
+class ScenePassNode(FakeNode):
+    """Hands its scene on without writing to it."""
+    def __init__(self, tree, name, scene):
+        super().__init__(tree, name, "FNScenePass")
+        sock = FakeSocket(self, "Scene", "FNSocketScene", scene)
+        sock.is_mutable = False
+        self.inputs.append(sock)
+        self.outputs.append(FakeSocket(self, "Scene", "FNSocketScene"))
+
+    def process(self, context, inputs, manager):
+        self.calls += 1
+        return {"Scene": inputs["Scene"]}
+
+def test_passed_through_datablock_is_not_an_own_write():
+    tree, left, right, join, new, out = build_tree()
+    existing = bpy.data.scenes.new("Existing")
+    passing = ScenePassNode(tree, "Pass", existing)
+    reader = SceneNameNode(tree, "Scene Name")
+    reader.link("Scene", passing, "Scene")
+    collect = CollectNode(tree, "Collect")
+    collect.link("Scenes", reader, "String")
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert existing.as_pointer() not in cow_mod._own_writes
+    assert bpy.data.scenes["AB"].as_pointer() in cow_mod._own_writes
+
+    cow_mod._depsgraph_update(None, _depsgraph(existing))
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(new, passing, reader) == [1, 2, 2]
+
+def test_full_pass_tracks_nothing_until_incremental_reuse():
+    tree, left, right, join, new, out = build_tree()
+    reader = SceneNameNode(tree, "Scene Name")
+    reader.link("Scene", new, "Scene")
+    collect = CollectNode(tree, "Collect")
+    collect.link("Scenes", reader, "String")
+    cow_mod.evaluate_tree(tree, None)
+    assert cow_mod._consumers == {} and cow_mod._own_writes == set()
+
+    # The incremental pass reuses the full pass's results and records what
+    # the reused nodes read, so later edits still reach them.
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(new, reader) == [1, 1]
+    cow_mod._depsgraph_update(None, _depsgraph(bpy.data.scenes["AB"]))
+    cow_mod.evaluate_tree(tree, None, incremental=True)
+    assert _calls(new, reader) == [1, 2]
+
+def setup_module(module):
+    # Other test modules swap the fake bpy out; DataManager.cleanup reads
+    # bpy.data and needs ours in place.
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy.types
+
+def teardown_module(module):
+    sys.modules.pop("bpy", None)
+    sys.modules.pop("bpy.types", None)
+    for name in list(sys.modules):
+        if name == PKG_NAME or name.startswith(PKG_NAME + "."):
+            sys.modules.pop(name, None)
@@ -0,0 +1,377 @@
+import sys
+import os
+import importlib.util
+import types
+import contextlib
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+PKG_NAME = "fn_import_alembic"
+
+# ---- fake bpy ----
+class _FakeID(dict):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.use_fake_user = False
+        self.removed = False
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+    def __bool__(self):
+        return True
+    def as_pointer(self):
+        if self.removed:
+            raise ReferenceError("StructRNA has been removed")
+        return id(self)
+    def get(self, key, default=None):
+        if self.removed:
+            raise ReferenceError("StructRNA has been removed")
+        return super().get(key, default)
+
+class _CacheFile(_FakeID):
+    def __init__(self, name):
+        super().__init__(name)
+        self._filepath = ""
+        self.reloads = 0
+    @property
+    def filepath(self):
+        return self._filepath
+    @filepath.setter
+    def filepath(self, value):
+        if self._filepath:
+            self.reloads += 1
+        self._filepath = value
+
+class _Object(_FakeID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.type = 'MESH'
+        self.data = None
+        self.modifiers = []
+        self.constraints = []
+
+class _Mesh(_FakeID):
+    pass
+
+class _Curve(_FakeID):
+    pass
+
+class _GreasePencil(_FakeID):
+    pass
+
+class _Objects(list):
+    def link(self, obj):
+        self.append(obj)
+
+class _Collection(_FakeID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.objects = _Objects()
+    @property
+    def all_objects(self):
+        return list(self.objects)
+
+class _Scene(_FakeID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.collection = _Collection("Scene Collection")
+        self.view_layers = [types.SimpleNamespace(name="ViewLayer")]
+
+class _DataCollection(list):
+    def __init__(self, cls):
+        super().__init__()
+        self.cls = cls
+    def new(self, name):
+        db = self.cls(name)
+        self.append(db)
+        return db
+    def get(self, name):
+        return next((db for db in self if db.name == name), None)
+    def remove(self, db):
+        super().remove(db)
+        db.removed = True
+
+class _Context:
+    def __init__(self):
+        self.scene = None
+        self.overrides = []
+    @contextlib.contextmanager
+    def temp_override(self, **kw):
+        self.overrides.append(kw)
+        previous, self.scene = self.scene, kw["scene"]
+        try:
+            yield
+        finally:
+            self.scene = previous
+
+# Object names each path imports; a path missing here fails like a bad file.
+_archives = {}
+_imports = []
+
+def _alembic_import(filepath, as_background_job=True):
+    assert not as_background_job
+    if filepath not in _archives:
+        raise RuntimeError("Cannot open archive")
+    _imports.append(filepath)
+    cache_file = bpy.data.cache_files.new(os.path.basename(filepath))
+    cache_file.filepath = filepath
+    for name in _archives[filepath]:
+        obj = bpy.data.objects.new(name)
+        if name.startswith("Curve"):
+            obj.type = 'CURVE'
+            obj.data = bpy.data.curves.new(name)
+        elif name.startswith("Stroke"):
+            obj.type = 'GREASEPENCIL'
+            obj.data = bpy.data.grease_pencils_v3.new(name)
+        else:
+            obj.data = bpy.data.meshes.new(name)
+        obj.modifiers.append(types.SimpleNamespace(type='MESH_SEQUENCE_CACHE', cache_file=cache_file))
+        bpy.context.scene.collection.objects.link(obj)
+    return {'FINISHED'}
+
+def _make_bpy_module():
+    bpy = types.ModuleType("bpy")
+    bpy.__path__ = []
+    types_mod = types.ModuleType("bpy.types")
+    types_mod.Node = type("Node", (), {})
+    types_mod.Mesh = _Mesh
+    types_mod.Curve = _Curve
+    # As on Blender 4.3: Grease Pencil v3 next to the legacy type.
+    types_mod.GreasePencilv3 = _GreasePencil
+    types_mod.GreasePencil = type("GreasePencil", (_FakeID,), {})
+    bpy.types = types_mod
+    bpy.data = types.SimpleNamespace(
+        objects=_DataCollection(_Object),
+        meshes=_DataCollection(_Mesh),
+        curves=_DataCollection(_Curve),
+        grease_pencils_v3=_DataCollection(_GreasePencil),
+        cache_files=_DataCollection(_CacheFile),
+        collections=_DataCollection(_Collection),
+        scenes=_DataCollection(_Scene),
+        node_groups=[],
+    )
+    bpy.context = _Context()
+    bpy.ops = types.SimpleNamespace(wm=types.SimpleNamespace(alembic_import=_alembic_import))
+    bpy.path = types.SimpleNamespace(abspath=lambda p: p)
+    bpy.props = types.SimpleNamespace(StringProperty=lambda **k: None, BoolProperty=lambda **k: None)
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None, unregister_class=lambda cls: None)
+    return bpy
+
+bpy = _make_bpy_module()
+
+# ---- stub package modules ----
+def _load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def _load():
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy.types
+    pkg = types.ModuleType(PKG_NAME)
+    pkg.__path__ = []
+    sys.modules[PKG_NAME] = pkg
+    _load_module(f"{PKG_NAME}.common", os.path.join(ROOT, "common.py"))
+    pkg.uuid_manager = _load_module(f"{PKG_NAME}.uuid_manager", os.path.join(ROOT, "uuid_manager.py"))
+    _load_module(f"{PKG_NAME}.lazy_copy", os.path.join(ROOT, "lazy_copy.py"))
+    pkg.data_manager = _load_module(f"{PKG_NAME}.data_manager", os.path.join(ROOT, "data_manager.py"))
+    pkg.cow_engine = types.SimpleNamespace(mark_dirty=lambda node: None)
+    pkg.blend_file = types.ModuleType(f"{PKG_NAME}.blend_file")
+    operators = types.ModuleType(f"{PKG_NAME}.operators")
+    operators.auto_evaluate_if_enabled = lambda *a, **k: None
+    sys.modules[f"{PKG_NAME}.operators"] = operators
+    nodes_pkg = types.ModuleType(f"{PKG_NAME}.nodes")
+    nodes_pkg.__path__ = []
+    sys.modules[f"{PKG_NAME}.nodes"] = nodes_pkg
+    base = types.ModuleType(f"{PKG_NAME}.nodes.base")
+    base.FNBaseNode = type("FNBaseNode", (), {})
+    sys.modules[f"{PKG_NAME}.nodes.base"] = base
+    sockets = types.ModuleType(f"{PKG_NAME}.sockets")
+    sockets.__getattr__ = lambda name: type(name, (), {})
+    sys.modules[f"{PKG_NAME}.sockets"] = sockets
+    _load_module(f"{PKG_NAME}.nodes.read_blend", os.path.join(ROOT, "nodes", "read_blend.py"))
+    return _load_module(f"{PKG_NAME}.nodes.import_alembic", os.path.join(ROOT, "nodes", "import_alembic.py"))
+
+import_alembic = _load()
+DataManager = sys.modules[f"{PKG_NAME}.data_manager"].DataManager
+sys.modules.pop("bpy", None)
+sys.modules.pop("bpy.types", None)
+
+
+def setup_module(module):
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy.types
+
+
+def _reset(tmp_path, **archives):
+    import_alembic._abc_cache.clear()
+    _tree.state.clear()
+    _archives.clear()
+    _imports.clear()
+    for collection in ("objects", "meshes", "curves", "grease_pencils_v3", "cache_files", "collections", "scenes"):
+        getattr(bpy.data, collection).clear()
+    bpy.context.overrides.clear()
+    bpy.context.scene = bpy.data.scenes.new("Scene")
+    paths = []
+    for name, objects in archives.items():
+        path = tmp_path / f"{name}.abc"
+        path.write_bytes(b"Ogawa")
+        _archives[str(path)] = objects
+        paths.append(str(path))
+    return paths
+
+class _Tree:
+    """FileNodesTree stand-in with a dict as its state map."""
+    def __init__(self):
+        self.name = "NodeTree"
+        self.state = {}
+    def get_datablock_uuid(self, key):
+        return self.state.get(key)
+    def set_datablock_uuid(self, key, value):
+        self.state[key] = value
+    def remove_datablock_uuids(self, prefix):
+        for key in [k for k in self.state if k.startswith(prefix)]:
+            del self.state[key]
+
+_tree = _Tree()
+
+def _node(name="Import Alembic", imported_path=""):
+    node = import_alembic.FNImportAlembic()
+    node.name = name
+    node.id_data = _tree
+    node.imported_path = imported_path
+    return node
+
+def _names(objects):
+    return [o.name for o in objects]
+
+
+# ---- tests ----
+def test_import_runs_in_scratch_scene(tmp_path):
+    path, = _reset(tmp_path, rock=["Rock", "Pebble"])
+    user_scene = bpy.context.scene
+    out = _node().process(bpy.context, {"File Path": path}, None)
+
+    assert _names(out["Objects"]) == ["Rock", "Pebble"]
+    assert user_scene.collection.objects == []
+    assert bpy.data.scenes == [user_scene]
+    holder = bpy.data.collections.get(import_alembic.HOLDER_NAME)
+    assert holder.objects == out["Objects"] and holder.use_fake_user
+
+
+def test_reimport_resolves_objects_by_uuid(tmp_path):
+    path, = _reset(tmp_path, rock=["Rock"])
+    node = _node()
+    first = node.process(bpy.context, {"File Path": path}, None)["Objects"]
+    first[0].name = "Renamed"
+    assert node.process(bpy.context, {"File Path": path}, None)["Objects"] == first
+    assert _imports == [path]
+
+
+def test_changed_file_reloads_cache_file_in_place(tmp_path):
+    path, = _reset(tmp_path, rock=["Rock", "Pebble"])
+    node = _node()
+    first = node.process(bpy.context, {"File Path": path}, None)["Objects"]
+    with open(path, "ab") as f:
+        f.write(b"more frames")
+    again = node.process(bpy.context, {"File Path": path}, None)["Objects"]
+
+    assert again == first and _imports == [path]
+    assert bpy.data.cache_files[0].reloads == 1
+    node.process(bpy.context, {"File Path": path}, None)
+    assert bpy.data.cache_files[0].reloads == 1
+
+
+def test_external_state_is_the_archive_stamp(tmp_path):
+    path, = _reset(tmp_path, rock=["Rock"])
+    node = _node()
+    state = node.external_state({"File Path": path})
+    assert state is not None and node.external_state({"File Path": path}) == state
+    with open(path, "ab") as f:
+        f.write(b"more frames")
+    assert node.external_state({"File Path": path}) != state
+    assert node.external_state({"File Path": ""}) is None
+
+
+def test_deleted_objects_are_superseded_through_manager(tmp_path):
+    path, = _reset(tmp_path, rock=["Rock", "Pebble"])
+    node = _node()
+    rock, pebble = node.process(bpy.context, {"File Path": path}, None)["Objects"]
+    bpy.data.objects.remove(rock)
+    manager = DataManager()
+    again = node.process(bpy.context, {"File Path": path}, manager)["Objects"]
+
+    assert len(_imports) == 2 and pebble not in again
+    # The old import is freed when the evaluation cleans up, not before.
+    assert not pebble.removed
+    manager.cleanup()
+    assert pebble.removed and pebble.data.removed
+    assert manager.last_removed == [id(pebble), id(pebble.data), id(rock.modifiers[0].cache_file)]
+    assert _names(bpy.data.objects) == ["Rock", "Pebble"] and len(bpy.data.cache_files) == 1
+
+
+def test_shared_import_is_freed_with_its_last_node(tmp_path):
+    rock_path, tree_path = _reset(tmp_path, rock=["Rock"], tree=["Tree"])
+    node, other = _node(), _node("Other")
+    rock = node.process(bpy.context, {"File Path": rock_path}, None)["Objects"]
+    assert other.process(bpy.context, {"File Path": rock_path}, None)["Objects"] == rock
+
+    manager = DataManager()
+    node.process(bpy.context, {"File Path": tree_path}, manager)
+    manager.cleanup()
+    assert not rock[0].removed
+    other.free()
+    assert rock[0].removed and len(bpy.data.cache_files) == 1
+    node.free()
+    assert bpy.data.objects == [] and bpy.data.cache_files == []
+    assert import_alembic._abc_cache == {}
+
+
+def test_reopened_file_finds_saved_import(tmp_path):
+    path, = _reset(tmp_path, rock=["Rock", "Pebble"])
+    node = _node()
+    objects = node.process(bpy.context, {"File Path": path}, None)["Objects"]
+    assert len(_tree.state) == 3
+
+    # Reopening the .blend keeps the objects, node and state map but not
+    # the module cache.
+    import_alembic._abc_cache.clear()
+    reopened = _node(imported_path=node.imported_path)
+    assert reopened.process(bpy.context, {"File Path": path}, None)["Objects"] == objects
+    assert _imports == [path] and bpy.data.cache_files[0].reloads == 1
+
+    reopened.free()
+    assert bpy.data.objects == [] and bpy.data.cache_files == [] and _tree.state == {}
+
+
+def test_free_removes_data_of_every_object_type(tmp_path):
+    path, = _reset(tmp_path, rock=["Rock", "Curve", "Stroke"])
+    node = _node()
+    rock, curve, stroke = node.process(bpy.context, {"File Path": path}, None)["Objects"]
+    node.free()
+    assert rock.data.removed and curve.data.removed and stroke.data.removed
+    assert bpy.data.meshes == [] and bpy.data.curves == [] and bpy.data.grease_pencils_v3 == []
+
+
+def test_failed_import_warns_and_cleans_up(tmp_path):
+    _reset(tmp_path)
+    node = _node()
+    path = tmp_path / "broken.abc"
+    path.write_bytes(b"")
+    with pytest.warns(UserWarning, match="Cannot open archive"):
+        out = node.process(bpy.context, {"File Path": str(path)}, None)
+    assert out == {"Objects": []}
+    assert len(bpy.data.scenes) == 1
+    with pytest.warns(UserWarning, match="Cannot read"):
+        node.process(bpy.context, {"File Path": str(tmp_path / "missing.abc")}, None)
+
+
+def teardown_module(module):
+    sys.modules.pop("bpy", None)
+    sys.modules.pop("bpy.types", None)
+    for name in list(sys.modules):
+        if name == PKG_NAME or name.startswith(PKG_NAME + "."):
+            sys.modules.pop(name, None)
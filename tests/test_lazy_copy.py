@@ -0,0 +1,89 @@
+import os
+import importlib.util
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+spec = importlib.util.spec_from_file_location("fn_lazy_copy", os.path.join(ROOT, "lazy_copy.py"))
+lazy_copy = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(lazy_copy)
+
+
+# ---- fakes ----
+class Render:
+    def __init__(self):
+        self.resolution_x = 1920
+
+class Scene(dict):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.frame_start = 1
+        self.render = Render()
+        self.linked = []
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+    def __bool__(self):
+        return True
+    def as_pointer(self):
+        return id(self)
+    def copy(self):
+        dup = Scene(self.name + ".001")
+        dup.frame_start = self.frame_start
+        dup.render.resolution_x = self.render.resolution_x
+        dup.update(self)
+        return dup
+    def link(self, obj):
+        self.linked.append(obj)
+
+class Manager:
+    def __init__(self):
+        self.copies = []
+    def _materialize(self, proxy):
+        dup = proxy.source.copy()
+        self.copies.append(dup)
+        return dup
+
+
+def _proxy():
+    manager = Manager()
+    scene = Scene("Scene")
+    return manager, scene, lazy_copy.LazyCopy(manager, scene, ("Tree", "Node", "Scene"))
+
+
+# ---- tests ----
+def test_reads_do_not_copy():
+    manager, scene, proxy = _proxy()
+    assert proxy.frame_start == 1
+    assert proxy.render.resolution_x == 1920
+    assert proxy.get("missing") is None
+    assert isinstance(proxy, Scene)
+    assert proxy == scene and bool(proxy)
+    assert manager.copies == [] and not proxy.written
+
+
+def test_same_value_is_not_a_write():
+    manager, scene, proxy = _proxy()
+    proxy.frame_start = 1
+    proxy.render.resolution_x = 1920
+    assert manager.copies == []
+    assert lazy_copy.unwrap(proxy) is scene
+
+
+def test_first_write_copies_once():
+    manager, scene, proxy = _proxy()
+    proxy.frame_start = 10
+    proxy.render.resolution_x = 640
+    proxy["custom"] = 1
+    assert len(manager.copies) == 1
+    dup = manager.copies[0]
+    assert (dup.frame_start, dup.render.resolution_x, dup["custom"]) == (10, 640, 1)
+    assert (scene.frame_start, scene.render.resolution_x) == (1, 1920)
+    assert "custom" not in scene
+    assert proxy.written and lazy_copy.unwrap([proxy]) == [dup]
+
+
+def test_method_calls_run_on_the_copy():
+    manager, scene, proxy = _proxy()
+    proxy.link("Cube")
+    assert scene.linked == []
+    assert manager.copies[0].linked == ["Cube"]
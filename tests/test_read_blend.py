@@ -0,0 +1,347 @@
+import sys
+import os
+import importlib.util
+import types
+import struct
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+PKG_NAME = "fn_read_blend"
+
+# ---- fake bpy ----
+class _FakeID:
+    def __init__(self, name):
+        self.name = name
+    def as_pointer(self):
+        return id(self)
+
+class _DataCollection(dict):
+    def __init__(self, cls):
+        super().__init__()
+        self.cls = cls
+    def new(self, name):
+        obj = self.cls(name)
+        self[name] = obj
+        return obj
+
+_CATEGORY_TYPES = {
+    "scenes": "Scene", "objects": "Object", "collections": "Collection", "worlds": "World",
+    "cameras": "Camera", "images": "Image", "lights": "Light", "materials": "Material",
+    "meshes": "Mesh", "node_groups": "NodeTree", "texts": "Text", "workspaces": "WorkSpace",
+}
+
+class _Library:
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.reloads = 0
+    def reload(self):
+        self.reloads += 1
+
+class _Libraries(list):
+    """bpy.data.libraries stand-in; load() links names from ``contents``."""
+    def __init__(self):
+        super().__init__()
+        self.contents = {}
+        self.loads = []
+        self.load_paths = []
+
+    def load(self, path, link=False):
+        libraries = self
+        self.load_paths.append(path)
+        if not any(lib.filepath == path for lib in self):
+            self.append(_Library(path))
+
+        class _Load:
+            def __enter__(self):
+                self.data_from = types.SimpleNamespace(**{
+                    attr: list(libraries.contents.get(attr, ())) for attr in _CATEGORY_TYPES
+                })
+                self.data_to = types.SimpleNamespace()
+                return self.data_from, self.data_to
+
+            def __exit__(self, *exc):
+                requested = {}
+                for attr, names in vars(self.data_to).items():
+                    collection = getattr(bpy.data, attr)
+                    requested[attr] = list(names)
+                    setattr(self.data_to, attr, [collection.get(n) or collection.new(n) for n in names])
+                libraries.loads.append(requested)
+                return False
+
+        return _Load()
+
+def _make_bpy_module():
+    bpy = types.ModuleType("bpy")
+    bpy.__path__ = []
+    types_mod = types.ModuleType("bpy.types")
+    for type_name in _CATEGORY_TYPES.values():
+        setattr(types_mod, type_name, type(type_name, (_FakeID,), {}))
+    types_mod.Node = type("Node", (), {})
+    bpy.types = types_mod
+    data = {attr: _DataCollection(getattr(types_mod, t)) for attr, t in _CATEGORY_TYPES.items()}
+    bpy.data = types.SimpleNamespace(libraries=_Libraries(), **data)
+    bpy.path = types.SimpleNamespace(abspath=lambda p: p)
+    bpy.props = types.SimpleNamespace(StringProperty=lambda **k: None, BoolProperty=lambda **k: None)
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None, unregister_class=lambda cls: None)
+    return bpy
+
+bpy = _make_bpy_module()
+
+# ---- stub package modules ----
+_dirty = []
+
+def _load():
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy.types
+    pkg = types.ModuleType(PKG_NAME)
+    pkg.__path__ = []
+    pkg.cow_engine = types.SimpleNamespace(mark_dirty=_dirty.append)
+    sys.modules[PKG_NAME] = pkg
+    spec = importlib.util.spec_from_file_location(f"{PKG_NAME}.common", os.path.join(ROOT, "common.py"))
+    common = importlib.util.module_from_spec(spec)
+    sys.modules[f"{PKG_NAME}.common"] = common
+    spec.loader.exec_module(common)
+    nodes_pkg = types.ModuleType(f"{PKG_NAME}.nodes")
+    nodes_pkg.__path__ = []
+    sys.modules[f"{PKG_NAME}.nodes"] = nodes_pkg
+    base = types.ModuleType(f"{PKG_NAME}.nodes.base")
+    base.FNBaseNode = type("FNBaseNode", (), {})
+    sys.modules[f"{PKG_NAME}.nodes.base"] = base
+    operators = types.ModuleType(f"{PKG_NAME}.operators")
+    operators.auto_evaluate_if_enabled = lambda *a, **k: None
+    sys.modules[f"{PKG_NAME}.operators"] = operators
+    spec = importlib.util.spec_from_file_location(f"{PKG_NAME}.blend_file", os.path.join(ROOT, "blend_file.py"))
+    pkg.blend_file = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pkg.blend_file)
+    sockets = types.ModuleType(f"{PKG_NAME}.sockets")
+    sockets.__getattr__ = lambda name: type(name, (), {})
+    sys.modules[f"{PKG_NAME}.sockets"] = sockets
+    modules = []
+    for module_name in ("read_blend", "read_blend_names", "read_blend_files"):
+        name = f"{PKG_NAME}.nodes.{module_name}"
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, "nodes", f"{module_name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        modules.append(module)
+    return modules
+
+read_blend, read_blend_names, read_blend_files = _load()
+sys.modules.pop("bpy", None)
+sys.modules.pop("bpy.types", None)
+
+
+def setup_module(module):
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy.types
+
+
+class _Socket:
+    def __init__(self, name, is_linked=False):
+        self.name = name
+        self.is_linked = is_linked
+
+class _Sockets(list):
+    def get(self, name):
+        return next((s for s in self if s.name == name), None)
+
+def _node(*linked):
+    node = read_blend.FNReadBlendNode()
+    node.verify_hash = False
+    node.preload_dependencies = False
+    node.outputs = _Sockets(_Socket(out, out in linked) for out, _a, _t in read_blend._CATEGORIES)
+    return node
+
+def _library(tmp_path):
+    path = tmp_path / "assets.blend"
+    path.write_bytes(b"BLENDER")
+    read_blend.invalidate()
+    read_blend._cache_stats.update(hits=0, misses=0, reloads=0)
+    bpy.data.libraries.clear()
+    bpy.data.libraries.loads.clear()
+    bpy.data.libraries.load_paths.clear()
+    bpy.data.libraries.contents = {
+        "objects": ["Chair", "Table", "Lamp"],
+        "images": [f"tex_{i}" for i in range(100)],
+        "node_groups": ["Rig"],
+    }
+    return str(path)
+
+
+# ---- tests ----
+def test_only_linked_categories_are_loaded(tmp_path):
+    path = _library(tmp_path)
+    node = _node("Objects")
+    out = node.process(None, {"File Path": path}, None)
+
+    assert bpy.data.libraries.loads == [{"objects": ["Chair", "Table", "Lamp"]}]
+    assert [o.name for o in out["Objects"]] == ["Chair", "Table", "Lamp"]
+    assert out["Images"] == [] and out["NodeTrees"] == []
+
+
+def test_name_filter_limits_linked_ids(tmp_path):
+    path = _library(tmp_path)
+    node = _node("Objects", "Images")
+    out = node.process(None, {"File Path": path, "Name Filter": "T*"}, None)
+
+    assert bpy.data.libraries.loads == [{"objects": ["Table"], "images": []}]
+    assert [o.name for o in out["Objects"]] == ["Table"]
+
+
+def test_newly_linked_output_loads_only_its_category(tmp_path):
+    path = _library(tmp_path)
+    node = _node("Objects")
+    node.process(None, {"File Path": path}, None)
+    node.update()
+    assert _dirty == []
+
+    node.outputs.get("NodeTrees").is_linked = True
+    node.update()
+    assert _dirty == [node]
+    out = node.process(None, {"File Path": path}, None)
+    assert bpy.data.libraries.loads[1:] == [{"node_groups": ["Rig"]}]
+    assert len(out["Objects"]) == 3 and [n.name for n in out["NodeTrees"]] == ["Rig"]
+    _dirty.clear()
+
+
+def test_preload_reports_dependency_tree(tmp_path):
+    path = _library(tmp_path)
+    node = _node("Objects")
+    node.preload_dependencies = True
+    out = node.process(None, {"File Path": path}, None)
+
+    report = out["Dependencies"]
+    assert report[0].startswith("Linked in ")
+    # The stand-in file has no block table, so the reader reports an error.
+    assert report[1].startswith("assets.blend (error:")
+    assert node.process(None, {"File Path": path}, None)["Dependencies"] == report
+
+
+def test_cache_hits_until_the_file_changes(tmp_path):
+    path = _library(tmp_path)
+    node, other = _node("Objects"), _node("Objects")
+    first = node.process(None, {"File Path": path}, None)
+    # Nodes reading the same file share its cache entry.
+    assert other.process(None, {"File Path": path}, None) == first
+    assert read_blend.cache_stats() == {"hits": 1, "misses": 1, "reloads": 0}
+
+    with open(path, "ab") as f:
+        f.write(b"more")
+    node.process(None, {"File Path": path}, None)
+    assert bpy.data.libraries[0].reloads == 1
+    assert read_blend.cache_stats() == {"hits": 1, "misses": 2, "reloads": 1}
+
+
+def test_external_state_follows_the_file(tmp_path):
+    path = _library(tmp_path)
+    nodes = [_node(), read_blend_names.FNReadBlendNamesNode()]
+    states = [n.external_state({"File Path": path}) for n in nodes]
+    assert states[0] is not None and states[0] == states[1]
+    assert nodes[0].external_state({"File Path": path}) == states[0]
+    with open(path, "ab") as f:
+        f.write(b"more")
+    assert nodes[0].external_state({"File Path": path}) != states[0]
+    assert nodes[0].external_state({"File Path": str(tmp_path / "missing.blend")}) is None
+
+    files = read_blend_files.FNReadBlendFilesNode()
+    listed = files.external_state({"Pattern": str(tmp_path)})
+    (tmp_path / "new.blend").write_bytes(b"BLENDER")
+    assert files.external_state({"Pattern": str(tmp_path)}) != listed
+
+
+def test_verified_hash_skips_reload_of_unchanged_contents(tmp_path):
+    path = _library(tmp_path)
+    node = _node("Objects")
+    node.verify_hash = True
+    node.process(None, {"File Path": path}, None)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    node.process(None, {"File Path": path}, None)
+    assert bpy.data.libraries[0].reloads == 0
+    assert read_blend.cache_stats() == {"hits": 1, "misses": 1, "reloads": 0}
+
+    with open(path, "wb") as f:
+        f.write(b"BLENDER-v2")
+    node.process(None, {"File Path": path}, None)
+    assert read_blend.cache_stats()["reloads"] == 1
+
+
+def test_names_node_lists_without_linking(tmp_path):
+    path = _library(tmp_path)
+    read_blend_names._names_cache.clear()
+    objects_before = len(bpy.data.objects)
+    node = read_blend_names.FNReadBlendNamesNode()
+    out = node.process(None, {"File Path": path, "Name Filter": "*a*"}, None)
+
+    assert out["Objects"] == ["Chair", "Table", "Lamp"]
+    assert out["Images"] == [] and out["Scenes"] == []
+    assert bpy.data.libraries.loads == [{}]
+    assert len(bpy.data.objects) == objects_before
+
+    node.process(None, {"File Path": path}, None)
+    assert len(bpy.data.libraries.loads) == 1
+    with open(path, "ab") as f:
+        f.write(b"more")
+    assert node.process(None, {"File Path": path}, None)["NodeTrees"] == ["Rig"]
+    assert len(bpy.data.libraries.loads) == 2
+
+
+def _blend_with(path, codes):
+    # Minimal .blend: header, one block per ID code, ENDB.
+    blocks = b"".join(struct.pack("<4siQii", c + b"\0\0", 0, 0, 0, 1) for c in codes)
+    path.write_bytes(b"BLENDER-v405" + blocks + struct.pack("<4siQii", b"ENDB", 0, 0, 0, 0))
+    return str(path)
+
+def test_files_node_links_matching_files_largest_first(tmp_path):
+    _library(tmp_path)
+    shots = tmp_path / "shots"
+    shots.mkdir()
+    small = _blend_with(shots / "a_small.blend", [b"OB"])
+    large = _blend_with(shots / "b_large.blend", [b"OB", b"OB", b"OB"])
+    images = _blend_with(shots / "c_images.blend", [b"IM"])
+    # A scan that stops before ENDB cannot tell what the file holds.
+    cut = _blend_with(shots / "d_cut.blend", [b"IM"])
+    with open(cut, "r+b") as f:
+        f.truncate(os.path.getsize(cut) - 8)
+    (shots / "notes.blend").write_bytes(b"text")
+    node = read_blend_files.FNReadBlendFilesNode()
+    node.verify_hash = False
+    node.outputs = _Sockets(_Socket(out, out == "Objects") for out, _a, _t in read_blend._CATEGORIES)
+
+    with pytest.warns(UserWarning, match="notes.blend"):
+        out = node.process(None, {"Pattern": str(shots), "Paths": [small]}, None)
+
+    assert out["Files"] == [small, large, images, cut]
+    # The images-only file has no objects and is never linked.
+    assert bpy.data.libraries.load_paths == [large, small, cut]
+
+
+def test_summaries_are_rescanned_only_after_a_change(tmp_path, monkeypatch):
+    read_blend_files._summary_cache.clear()
+    first = _blend_with(tmp_path / "first.blend", [b"OB"])
+    second = _blend_with(tmp_path / "second.blend", [b"OB", b"IM"])
+    scanned = []
+    scan_many = read_blend_files.blend_file.scan_many
+    def counting_scan(paths):
+        scanned.append(list(paths))
+        return scan_many(paths)
+    monkeypatch.setattr(read_blend_files.blend_file, "scan_many", counting_scan)
+
+    summaries = read_blend_files.scan_summaries([first, second])
+    assert read_blend_files.scan_summaries([first, second]) == summaries
+    _blend_with(tmp_path / "second.blend", [b"OB", b"IM", b"IM"])
+    again = read_blend_files.scan_summaries([first, second])
+
+    assert scanned == [[first, second], [], [second]]
+    assert again[first] is summaries[first]
+    assert again[second].count("images") == 2
+
+
+def teardown_module(module):
+    sys.modules.pop("bpy", None)
+    sys.modules.pop("bpy.types", None)
+    for name in list(sys.modules):
+        if name == PKG_NAME or name.startswith(PKG_NAME + "."):
+            sys.modules.pop(name, None)
@@ -102,3 +102,42 @@ def test_sets_camera_on_scene():
     out = node.process(None, {"Scene": scene, "Camera": cam_obj, "Start": 1, "End": 5}, None)
     assert out["Scene"] is scene
     assert scene.camera is cam_obj
+
+
+class _WriteCounter:
+    def __init__(self):
+        self.writes = []
+    def record_writes(self, written, skipped, target=None):
+        self.writes.append((written, skipped))
+
+
+class _TrackedScene(Scene):
+    """Scene that records every attribute assignment, like depsgraph tags."""
+    def __setattr__(self, name, value):
+        self.__dict__.setdefault("assigned", []).append(name)
+        object.__setattr__(self, name, value)
+
+
+def test_unchanged_values_are_not_written():
+    node = FNSceneProps()
+    scene = _TrackedScene("Tracked")
+    cam_obj = bpy.data.objects.new("Cam2")
+    manager = _WriteCounter()
+    inputs = {"Scene": scene, "Camera": cam_obj, "Start": 10, "End": 20}
+    node.process(None, inputs, manager)
+    scene.assigned.clear()
+    node.process(None, inputs, manager)
+    assert scene.assigned == []
+    assert manager.writes == [(3, 0), (0, 3)]
+
+
+def test_assign_properties_float_tolerance_and_failures():
+    class Target:
+        lens = 50.0
+        @property
+        def locked(self):
+            return 1
+    target = Target()
+    assert base_mod.assign_properties(target, {"lens": 50.0000001}) == 0
+    assert base_mod.assign_properties(target, {"lens": 35.0, "locked": 2, "missing": 1}) == 1
+    assert target.lens == 35.0
@@ -0,0 +1,225 @@
+import sys
+import os
+import importlib
+import types
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+PKG_NAME = "fn_scheduler"
+
+# ---- fake bpy ----
+class _FakeID:
+    def __init__(self, name=""):
+        self.name = name
+    def as_pointer(self):
+        return id(self)
+
+class _Named(list):
+    def get(self, name):
+        return next((item for item in self if item.name == name), None)
+
+class _Timers:
+    """Stands in for bpy.app.timers; tests fire callbacks by hand."""
+    def __init__(self):
+        self.callbacks = {}
+    def register(self, fn, first_interval=0.0):
+        self.callbacks[fn] = first_interval
+    def unregister(self, fn):
+        del self.callbacks[fn]
+    def is_registered(self, fn):
+        return fn in self.callbacks
+    def fire(self):
+        for fn in list(self.callbacks):
+            interval = fn()
+            if interval is None:
+                self.callbacks.pop(fn, None)
+            else:
+                self.callbacks[fn] = interval
+
+def _make_bpy_module():
+    bpy = types.ModuleType("bpy")
+    bpy.__path__ = []
+    types_mod = types.ModuleType("bpy.types")
+    for name in ("Scene", "Object", "Collection", "World", "Material", "Mesh", "Camera",
+                 "Light", "Image", "Text", "WorkSpace", "NodeTree", "Node"):
+        setattr(types_mod, name, type(name, (_FakeID,), {}))
+    types_mod.Operator = type("Operator", (), {})
+    types_mod.PropertyGroup = type("PropertyGroup", (), {})
+    types_mod.Context = type("Context", (), {})
+    bpy.types = types_mod
+    bpy.data = types.SimpleNamespace(node_groups=_Named())
+    bpy.app = types.SimpleNamespace(timers=_Timers(), handlers=None)
+    bpy.context = types.SimpleNamespace()
+    bpy.props = types.SimpleNamespace(
+        BoolProperty=lambda **k: None,
+        IntProperty=lambda **k: None,
+        FloatProperty=lambda **k: None,
+        FloatVectorProperty=lambda **k: None,
+        StringProperty=lambda **k: None,
+        CollectionProperty=lambda **k: None,
+        PointerProperty=lambda **k: None,
+        EnumProperty=lambda **k: None,
+    )
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None, unregister_class=lambda cls: None)
+    return bpy
+
+bpy = _make_bpy_module()
+sys.modules["bpy"] = bpy
+sys.modules["bpy.types"] = bpy.types
+pkg = types.ModuleType(PKG_NAME)
+pkg.__path__ = [ROOT]
+pkg.ADDON_NAME = PKG_NAME
+sys.modules[PKG_NAME] = pkg
+operators = importlib.import_module(f"{PKG_NAME}.operators")
+scheduler = importlib.import_module(f"{PKG_NAME}.scheduler")
+sys.modules.pop("bpy", None)
+sys.modules.pop("bpy.types", None)
+
+
+def setup_module(module):
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy.types
+
+
+class _Tree:
+    bl_idname = "FileNodesTreeType"
+    fn_enabled = True
+
+    def __init__(self, name, groups=()):
+        self.name = name
+        self.nodes = [types.SimpleNamespace(bl_idname="FNGroupNode", node_tree=g) for g in groups]
+
+
+class _Node:
+    def __init__(self, name, tree):
+        self.name = name
+        self.id_data = tree
+        self.inputs = []
+        self.outputs = []
+
+
+def _context(auto=True, delay=0.25):
+    prefs = types.SimpleNamespace(auto_evaluate=auto, auto_evaluate_delay=delay)
+    addon = types.SimpleNamespace(preferences=prefs)
+    return types.SimpleNamespace(preferences=types.SimpleNamespace(addons={PKG_NAME: addon}))
+
+
+def _install(monkeypatch, *trees):
+    bpy.data.node_groups[:] = list(trees)
+    scheduler.cancel()
+    calls = []
+
+    def fake_evaluate(context, incremental=None, trees=None, dependents=True):
+        calls.append(None if trees is None else [t.name for t in trees])
+        return 0 if trees is None else len(trees), []
+
+    monkeypatch.setattr(operators, "evaluate_tree", fake_evaluate)
+    monkeypatch.setattr(scheduler, "_deadline", 0.0)
+    return calls
+
+
+# ---- tests ----
+def test_burst_of_updates_is_evaluated_once(monkeypatch):
+    a, b = _Tree("A"), _Tree("B")
+    calls = _install(monkeypatch, a, b)
+    context = _context()
+    for i in range(20):
+        operators.auto_evaluate_if_enabled(_Node(f"N{i}", a), context)
+    assert calls == []
+    assert scheduler.is_pending()
+
+    scheduler._deadline = 0.0
+    bpy.app.timers.fire()
+    assert calls == [["A"]]
+    assert not scheduler.is_pending()
+    assert not bpy.app.timers.callbacks
+
+
+def test_timer_waits_for_quiet_period(monkeypatch):
+    a = _Tree("A")
+    calls = _install(monkeypatch, a)
+    operators.auto_evaluate_if_enabled(_Node("N", a), _context(delay=60.0))
+    bpy.app.timers.fire()
+    assert calls == []
+    assert bpy.app.timers.callbacks[scheduler._on_timer] > 0
+
+
+def test_only_touched_trees_are_evaluated(monkeypatch):
+    a, b, c = _Tree("A"), _Tree("B"), _Tree("C")
+    calls = _install(monkeypatch, a, b, c)
+    context = _context()
+    operators.auto_evaluate_if_enabled(_Node("N", c), context)
+    operators.auto_evaluate_if_enabled(_Node("N", a), context)
+    assert scheduler.flush() == 2
+    assert calls == [["A", "C"]]
+
+
+def test_context_only_request_evaluates_everything(monkeypatch):
+    calls = _install(monkeypatch, _Tree("A"))
+    context = bpy.types.Context()
+    context.preferences = _context().preferences
+    operators.auto_evaluate_if_enabled(context)
+    scheduler.flush()
+    assert calls == [None]
+
+
+def test_cancel_drops_pending_requests(monkeypatch):
+    a = _Tree("A")
+    calls = _install(monkeypatch, a)
+    operators.auto_evaluate_if_enabled(_Node("N", a), _context())
+    scheduler.cancel()
+    bpy.app.timers.fire()
+    assert calls == []
+    assert not bpy.app.timers.callbacks
+
+
+def test_zero_delay_evaluates_immediately(monkeypatch):
+    a = _Tree("A")
+    calls = _install(monkeypatch, a)
+    operators.auto_evaluate_if_enabled(_Node("N", a), _context(delay=0.0))
+    assert calls == [["A"]]
+    assert not scheduler.is_pending()
+
+
+def test_cancel_during_flush_stops_evaluation(monkeypatch):
+    a = _Tree("A")
+    _install(monkeypatch, a)
+    seen = []
+
+    def cancelling_evaluate(context, incremental=None, trees=None, dependents=True):
+        scheduler.cancel()
+        seen.append(scheduler.should_stop())
+        return 0, []
+
+    monkeypatch.setattr(operators, "evaluate_tree", cancelling_evaluate)
+    scheduler.request(a)
+    scheduler.flush()
+    assert seen == [True]
+    assert not scheduler.should_stop()
+
+
+def test_affected_trees_follow_group_usage(monkeypatch):
+    leaf = _Tree("Leaf")
+    mid = _Tree("Mid", [leaf])
+    top = _Tree("Top", [mid])
+    other = _Tree("Other", [None])
+    _install(monkeypatch, top, other, mid, leaf)
+    assert operators.tree_dependents() == {"Leaf": {"Mid"}, "Mid": {"Top"}}
+    assert [t.name for t in operators.affected_trees([leaf])] == ["Top", "Mid", "Leaf"]
+    assert [t.name for t in operators.affected_trees([mid])] == ["Top", "Mid"]
+    assert [t.name for t in operators.affected_trees([other])] == ["Other"]
+
+
+def test_group_cycles_terminate(monkeypatch):
+    a = _Tree("A")
+    b = _Tree("B", [a])
+    a.nodes = [types.SimpleNamespace(bl_idname="FNGroupNode", node_tree=b)]
+    _install(monkeypatch, a, b)
+    assert [t.name for t in operators.affected_trees([a])] == ["A", "B"]
+
+
+def teardown_module(module):
+    sys.modules.pop("bpy", None)
+    sys.modules.pop("bpy.types", None)
+    for name in list(sys.modules):
+        if name == PKG_NAME or name.startswith(PKG_NAME + "."):
+            sys.modules.pop(name, None)
@@ -0,0 +1,152 @@
+import sys
+import os
+import importlib.util
+import types
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+# ---- fake bpy ----
+class FakeID(dict):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.reads = 0
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+    def __bool__(self):
+        return True
+    def get(self, key, default=None):
+        self.reads += 1
+        return super().get(key, default)
+
+class FakeCollection(list):
+    def new(self, name):
+        db = FakeID(name)
+        self.append(db)
+        return db
+
+_fake_bpy = types.ModuleType("bpy")
+_saved_bpy = sys.modules.get("bpy")
+sys.modules["bpy"] = _fake_bpy
+_pkg = types.ModuleType("fn_uuid")
+_pkg.__path__ = [ROOT]
+sys.modules["fn_uuid"] = _pkg
+uuid_manager = importlib.import_module("fn_uuid.uuid_manager")
+if _saved_bpy is None:
+    sys.modules.pop("bpy", None)
+else:
+    sys.modules["bpy"] = _saved_bpy
+
+
+def _collection(count):
+    uuid_manager.invalidate_index()
+    coll = FakeCollection()
+    for i in range(count):
+        uuid_manager.get_or_create_uuid(coll.new(f"DB{i}"))
+    return coll
+
+
+# ---- tests ----
+def test_lookup_builds_index_once():
+    coll = _collection(50)
+    target = coll[30]
+    target_uuid = uuid_manager.get_uuid(target)
+    assert uuid_manager.find_datablock_by_uuid(target_uuid, coll) is target
+    reads = sum(db.reads for db in coll)
+    assert uuid_manager.find_datablock_by_uuid(target_uuid, coll) is target
+    # The second lookup only validates the hit.
+    assert sum(db.reads for db in coll) == reads + 1
+
+
+def test_new_uuid_is_indexed_without_rescan():
+    coll = _collection(5)
+    uuid_manager.find_datablock_by_uuid(uuid_manager.get_uuid(coll[0]), coll)
+    fresh = coll.new("Fresh")
+    fresh_uuid = uuid_manager.get_or_create_uuid(fresh)
+    reads = sum(db.reads for db in coll[:5])
+    assert uuid_manager.find_datablock_by_uuid(fresh_uuid, coll) is fresh
+    assert sum(db.reads for db in coll[:5]) == reads
+
+
+def test_removed_datablock_is_not_returned():
+    coll = _collection(3)
+    target = coll[1]
+    target_uuid = uuid_manager.get_uuid(target)
+    assert uuid_manager.find_datablock_by_uuid(target_uuid, coll) is target
+    coll.remove(target)
+    target.clear()
+    assert uuid_manager.find_datablock_by_uuid(target_uuid, coll) is None
+
+
+def test_missing_uuid_rescans_only_when_collection_changes():
+    coll = _collection(3)
+    assert uuid_manager.find_datablock_by_uuid("missing", coll) is None
+    reads = sum(db.reads for db in coll)
+    assert uuid_manager.find_datablock_by_uuid("missing", coll) is None
+    assert sum(db.reads for db in coll) == reads
+
+    # A datablock added outside get_or_create_uuid (e.g. a duplicate that
+    # carries the property) is picked up after the size changes.
+    dup = FakeID("Dup")
+    dup[uuid_manager.UUID_PROP_NAME] = "missing"
+    coll.append(dup)
+    assert uuid_manager.find_datablock_by_uuid("missing", coll) is dup
+
+
+def test_miss_rescans_once_after_same_size_swap():
+    coll = _collection(3)
+    assert uuid_manager.find_datablock_by_uuid(uuid_manager.get_uuid(coll[0]), coll) is coll[0]
+    # Remove plus add keeps the length; the new UUID is still found.
+    swapped = FakeID("Swapped")
+    swapped[uuid_manager.UUID_PROP_NAME] = "swapped"
+    coll[2] = swapped
+    assert uuid_manager.find_datablock_by_uuid("swapped", coll) is swapped
+
+    # A UUID that already missed is found after a depsgraph update.
+    assert uuid_manager.find_datablock_by_uuid("reassigned", coll) is None
+    coll[1][uuid_manager.UUID_PROP_NAME] = "reassigned"
+    assert uuid_manager.find_datablock_by_uuid("reassigned", coll) is None
+    uuid_manager._depsgraph_update(None, None)
+    assert uuid_manager.find_datablock_by_uuid("reassigned", coll) is coll[1]
+
+
+class _StateMap(list):
+    def __init__(self, items=()):
+        super().__init__(items)
+        self.scans = 0
+    def __iter__(self):
+        self.scans += 1
+        return super().__iter__()
+
+
+def _install_trees(*uuid_lists):
+    trees = [
+        types.SimpleNamespace(
+            bl_idname="FileNodesTreeType",
+            fn_state_map=_StateMap(types.SimpleNamespace(datablock_uuid=u) for u in uuids),
+        )
+        for uuids in uuid_lists
+    ]
+    uuid_manager.bpy.data = types.SimpleNamespace(node_groups=list(trees))
+    uuid_manager.invalidate_index()
+    return trees
+
+
+def test_managed_uuids_scan_trees_once():
+    trees = _install_trees(["a", "b"], ["b", "c"])
+    assert set(uuid_manager.managed_uuids()) == {"a", "b", "c"}
+    uuid_manager.add_managed_uuid("d")
+    uuid_manager.release_managed_uuid("b")
+    assert set(uuid_manager.managed_uuids()) == {"a", "b", "c", "d"}
+    uuid_manager.release_managed_uuid("b")
+    assert set(uuid_manager.managed_uuids()) == {"a", "c", "d"}
+    assert [t.fn_state_map.scans for t in trees] == [1, 1]
+
+
+def test_managed_uuids_rescan_when_trees_change():
+    trees = _install_trees(["a"])
+    uuid_manager.managed_uuids()
+    uuid_manager.bpy.data.node_groups.remove(trees[0])
+    assert set(uuid_manager.managed_uuids()) == set()
+    trees = _install_trees(["x"])
+    assert set(uuid_manager.managed_uuids()) == {"x"}
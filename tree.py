@@ -1,6 +1,7 @@
 import bpy
 from bpy.types import NodeTree, PropertyGroup
 from .operators import auto_evaluate_if_enabled
+from . import cow_engine, uuid_manager
 
 class FileNodeTreeInput(PropertyGroup):
     name: bpy.props.StringProperty()
@@ -122,13 +123,27 @@ class FileNodesTree(NodeTree):
     def set_datablock_uuid(self, node_key, datablock_uuid):
         item = self.fn_state_map.get(node_key)
         if item:
+            if item.datablock_uuid == datablock_uuid:
+                return
+            uuid_manager.release_managed_uuid(item.datablock_uuid)
             item.datablock_uuid = datablock_uuid
         else:
             item = self.fn_state_map.add()
             item.name = node_key
             item.datablock_uuid = datablock_uuid
+        uuid_manager.add_managed_uuid(datablock_uuid)
+
+    def remove_datablock_uuids(self, prefix):
+        """Drop the state map entries whose key starts with ``prefix``."""
+        for index in reversed(range(len(self.fn_state_map))):
+            item = self.fn_state_map[index]
+            if item.name.startswith(prefix):
+                uuid_manager.release_managed_uuid(item.datablock_uuid)
+                self.fn_state_map.remove(index)
 
     def clear_state_map(self):
+        for item in self.fn_state_map:
+            uuid_manager.release_managed_uuid(item.datablock_uuid)
         self.fn_state_map.clear()
 
     def interface_update(self, context):
@@ -137,6 +152,7 @@ class FileNodesTree(NodeTree):
 
     def update(self):
         """Keep inputs in sync when the node tree changes."""
+        cow_engine.invalidate_plan(self)
         if getattr(self, "fn_inputs", None):
             self.fn_inputs.sync_inputs(self)
 
@@ -1,6 +1,6 @@
 import bpy
 from bpy.types import Panel
-from . import ADDON_NAME
+from . import ADDON_NAME, profiler
 from .tree import FileNodesTree
 
 
@@ -15,6 +15,10 @@ class FILE_NODES_PT_global(Panel):
         layout.operator("file_nodes.evaluate", icon="FILE_REFRESH")
         prefs = context.preferences.addons[ADDON_NAME].preferences
         layout.prop(prefs, "auto_evaluate")
+        row = layout.row()
+        row.active = prefs.auto_evaluate
+        row.prop(prefs, "auto_evaluate_delay")
+        layout.prop(prefs, "incremental_evaluate")
 
         scene = context.scene
         layout.template_ID(
@@ -44,6 +48,38 @@ class FILE_NODES_PT_global(Panel):
                                 box.prop(inp, prop, text=item.name)
 
 
+class FILE_NODES_PT_profile(Panel):
+    bl_label = "Profile"
+    bl_space_type = "NODE_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "File Nodes"
+
+    @classmethod
+    def poll(cls, context):
+        space = context.space_data
+        return getattr(space, "tree_type", None) == "FileNodesTreeType"
+
+    def draw(self, context):
+        layout = self.layout
+        prefs = context.preferences.addons[ADDON_NAME].preferences
+        layout.prop(prefs, "profile_evaluation")
+
+        profile = profiler.last_profile()
+        if profile is None:
+            layout.label(text="No profiled evaluation yet")
+            return
+        layout.label(text=f"Total: {profile.total_time * 1000:.1f} ms")
+        layout.label(text=f"Copies: {profile.copy_count} (avoided: {profile.avoided_count})")
+        layout.label(text=f"Property writes: {profile.writes} (skipped: {profile.writes_skipped})")
+        box = layout.box()
+        for timing in profile.slowest(10):
+            row = box.row()
+            row.label(text=timing.node)
+            row.label(text=f"{timing.time * 1000:.2f} ms")
+            row.label(text=f"{timing.calls}/{timing.cached}")
+        layout.operator("file_nodes.export_profile", icon="EXPORT")
+
+
 def _tree_prop_update(self, context):
     tree = self.file_nodes_tree
     if tree and getattr(tree, "interface", None) and getattr(tree, "fn_inputs", None):
@@ -58,6 +94,7 @@ def _tree_prop_update(self, context):
 
 def register():
     bpy.utils.register_class(FILE_NODES_PT_global)
+    bpy.utils.register_class(FILE_NODES_PT_profile)
     bpy.types.Scene.file_nodes_tree = bpy.props.PointerProperty(
         type=FileNodesTree,
         update=_tree_prop_update,
@@ -66,4 +103,5 @@ def register():
 
 def unregister():
     del bpy.types.Scene.file_nodes_tree
+    bpy.utils.unregister_class(FILE_NODES_PT_profile)
     bpy.utils.unregister_class(FILE_NODES_PT_global)
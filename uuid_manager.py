@@ -1,9 +1,30 @@
 import bpy
 import uuid
+from .common import add_handler, persistent_handler, remove_handler
 
 # Custom property name to store the UUID
 UUID_PROP_NAME = "_fn_uuid"
 
+# Lazily built UUID -> datablock maps, one per bpy.data collection.
+_uuid_index = {}
+# Collection length at the time each map was built.
+_index_sizes = {}
+# UUIDs a rebuilt map did not contain, per collection. Looking them up again
+# does not rescan until the collection's length changes or a depsgraph
+# update reports edited IDs; any other miss rescans once, so renames, UUID
+# reassignments and remove-plus-add swaps are found.
+_known_missing = {}
+# Python type of indexed datablocks -> collection key, so UUIDs assigned by
+# get_or_create_uuid can be added to the right map without a scan.
+_type_keys = {}
+
+# UUID -> number of File Nodes tree state map entries pointing at it. Built
+# by scanning every tree on first use, then kept current by FileNodesTree.
+_managed_uuids = None
+# len(bpy.data.node_groups) when _managed_uuids was built; deleting a tree
+# bypasses clear_state_map, so a different count forces a rescan.
+_managed_tree_count = None
+
 def get_uuid(datablock):
     """Returns the File Nodes UUID of a datablock, or None if it doesn't have one."""
     if datablock and hasattr(datablock, "get"):
@@ -14,20 +35,125 @@ def get_or_create_uuid(datablock):
     """Returns the File Nodes UUID of a datablock. Creates one if it doesn't exist."""
     if not datablock or not hasattr(datablock, "get") or not hasattr(datablock, "__setitem__"):
         return None
-    
+
     current_uuid = datablock.get(UUID_PROP_NAME)
     if current_uuid is None:
         new_uuid = str(uuid.uuid4())
         datablock[UUID_PROP_NAME] = new_uuid
+        key = _type_keys.get(type(datablock))
+        if key in _uuid_index:
+            _uuid_index[key].setdefault(new_uuid, datablock)
         return new_uuid
     return current_uuid
 
+def _collection_key(data_collection):
+    rna_type = getattr(data_collection, "rna_type", None)
+    identifier = getattr(rna_type, "identifier", None)
+    return identifier or id(data_collection)
+
+def _build_index(key, data_collection):
+    index = {}
+    for db in data_collection:
+        _type_keys[type(db)] = key
+        db_uuid = get_uuid(db)
+        if db_uuid is not None:
+            # Copies inherit the custom property; keep the first match like
+            # the linear search did.
+            index.setdefault(db_uuid, db)
+    _uuid_index[key] = index
+    _index_sizes[key] = len(data_collection)
+    _known_missing[key] = set()
+    return index
+
+def _matches(db, target_uuid):
+    try:
+        return get_uuid(db) == target_uuid
+    except ReferenceError:  # Datablock was removed
+        return False
+
 def find_datablock_by_uuid(target_uuid, data_collection):
-    """Searches a bpy.data collection for a datablock with the given UUID."""
+    """Returns the datablock in a bpy.data collection with the given UUID."""
     if not target_uuid or not data_collection:
         return None
-    
-    for db in data_collection:
-        if get_uuid(db) == target_uuid:
+
+    key = _collection_key(data_collection)
+    index = _uuid_index.get(key)
+    if index is None:
+        index = _build_index(key, data_collection)
+    else:
+        db = index.get(target_uuid)
+        if db is not None and _matches(db, target_uuid):
             return db
+        if (db is None and target_uuid in _known_missing.get(key, ())
+                and _index_sizes.get(key) == len(data_collection)):
+            return None
+        index = _build_index(key, data_collection)
+
+    db = index.get(target_uuid)
+    if db is not None and _matches(db, target_uuid):
+        return db
+    _known_missing[key].add(target_uuid)
     return None
+
+def _build_managed_uuids():
+    global _managed_uuids, _managed_tree_count
+    counts = {}
+    node_groups = bpy.data.node_groups
+    for node_tree in node_groups:
+        if getattr(node_tree, "bl_idname", "") != "FileNodesTreeType":
+            continue
+        for item in node_tree.fn_state_map:
+            counts[item.datablock_uuid] = counts.get(item.datablock_uuid, 0) + 1
+    _managed_uuids = counts
+    _managed_tree_count = len(node_groups)
+    return counts
+
+def managed_uuids():
+    """Returns the UUIDs referenced by any File Nodes tree state map."""
+    if _managed_uuids is None or _managed_tree_count != len(bpy.data.node_groups):
+        return _build_managed_uuids().keys()
+    return _managed_uuids.keys()
+
+def add_managed_uuid(datablock_uuid):
+    """Record a new state map entry pointing at ``datablock_uuid``."""
+    if _managed_uuids is not None and datablock_uuid:
+        _managed_uuids[datablock_uuid] = _managed_uuids.get(datablock_uuid, 0) + 1
+
+def release_managed_uuid(datablock_uuid):
+    """Forget one state map entry pointing at ``datablock_uuid``."""
+    if _managed_uuids is None or not datablock_uuid:
+        return
+    count = _managed_uuids.get(datablock_uuid, 0) - 1
+    if count > 0:
+        _managed_uuids[datablock_uuid] = count
+    else:
+        _managed_uuids.pop(datablock_uuid, None)
+
+def invalidate_index():
+    """Forget every UUID map; they are rebuilt on the next lookup."""
+    global _managed_uuids
+    _uuid_index.clear()
+    _index_sizes.clear()
+    _known_missing.clear()
+    # Undo, redo and file loads replace state maps without going through
+    # FileNodesTree, so the managed set is rebuilt as well.
+    _managed_uuids = None
+
+@persistent_handler
+def _invalidate_handler(*_args):
+    invalidate_index()
+
+@persistent_handler
+def _depsgraph_update(*_args):
+    # Edited IDs may now carry a UUID that missed before.
+    _known_missing.clear()
+
+def register():
+    invalidate_index()
+    add_handler(_invalidate_handler)
+    add_handler(_depsgraph_update, ("depsgraph_update_post",))
+
+def unregister():
+    remove_handler(_depsgraph_update, ("depsgraph_update_post",))
+    remove_handler(_invalidate_handler)
+    invalidate_index()